@@ -1,48 +1,100 @@
 """
 Main application file for Project Management System
 """
-import sys
-import os
-from pathlib import Path
-from datetime import timedelta
-sys.path.insert(0, str(Path(__file__).parent / 'venv' / 'apps'))
-
-from flask import Flask, jsonify, session
-from flask_session import Session
-from apps.utils.db import init_db, get_db
-from apps.models import User, Project, Task, Comment
-from apps.services.email_service import EmailService
-
-sys.path.insert(0, str(Path(__file__).parent / 'venv' / 'apps'))
-from apps.routers import auth_router
-from apps.routers.project_router import project_router
-from apps.routers.task_router import task_router
-from apps.routers.comment_router import comment_router
-
-app = Flask(__name__)
-
-app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'your-secret-key-change-this-in-production')
-app.config['SESSION_TYPE'] = 'filesystem'
-app.config['SESSION_PERMANENT'] = True
-app.config['PERMANENT_SESSION_LIFETIME'] = timedelta(hours=1)
-
-Session(app)
-EmailService.init_mail(app)
-
-app.register_blueprint(auth_router)
-app.register_blueprint(project_router)
-app.register_blueprint(task_router)
-app.register_blueprint(comment_router)
-
-@app.route('/')
-def home():
-    return jsonify({
-        "message": "Welcome to Project Management System API",
-        "version": "1.0.0"
-    })
-    
+from importlib import import_module
+
+from flask import Flask, jsonify
+
+# (module, attribute); imported when the app is built, not when app.py is.
+BLUEPRINTS = (
+    ('apps.routers.auth_router', 'auth_router'),
+    ('apps.routers.project_router', 'project_router'),
+    ('apps.routers.task_router', 'task_router'),
+    ('apps.routers.comment_router', 'comment_router'),
+    ('apps.routers.sync_router', 'sync_router'),
+    ('apps.routers.me_router', 'me_router'),
+    ('apps.routers.batch_router', 'batch_router'),
+    ('apps.routers.job_router', 'job_router'),
+    ('apps.routers.metrics_router', 'metrics_router'),
+)
+
+
+def create_app(config=None) -> Flask:
+    """Build the Flask app.
+
+    ``config`` may be a dict, a config object or an import string; it is
+    applied on top of ``apps.config.Config``. Schema creation is not done
+    here, use ``flask --app app init-db``.
+    """
+    app = Flask(__name__)
+    # First: importing apps.config loads .env for every module after it.
+    app.config.from_object('apps.config.Config')
+
+    from apps.utils.serialization import NegotiatingJSONProvider
+    app.json = NegotiatingJSONProvider(app)
+    if isinstance(config, dict):
+        app.config.update(config)
+    elif config is not None:
+        app.config.from_object(config)
+
+    from flask_session import Session
+    Session(app)
+
+    from apps.services.email_service import EmailService
+    EmailService.init_mail(app)
+
+    from apps.middlewares import init_metrics, init_sql_profiler, init_compression
+    if app.config['METRICS_ENABLED']:
+        init_metrics(app)
+    if app.config['SQL_PROFILER_ENABLED']:
+        init_sql_profiler(app)
+    if app.config['COMPRESS_ENABLED']:
+        init_compression(app)
+
+    for module_name, attr in BLUEPRINTS:
+        app.register_blueprint(getattr(import_module(module_name), attr))
+
+    @app.route('/')
+    def home():
+        return jsonify({
+            "message": "Welcome to Project Management System API",
+            "version": "1.0.0"
+        })
+
+    from apps.cli import register_commands
+    register_commands(app)
+
+    if app.config['START_BACKGROUND_WORKERS']:
+        start_background_workers(app)
+
+    return app
+
+
+def start_background_workers(app) -> None:
+    if app.config['EMAIL_OUTBOX_WORKER']:
+        from apps.services.email_outbox_worker import start_email_worker
+        start_email_worker(app)
+
+    if app.config['NOTIFICATION_DIGEST_WORKER']:
+        from apps.services.notification_digest_worker import start_digest_worker
+        start_digest_worker()
+
+    if app.config['JOB_WORKER']:
+        from apps.services.job_worker import start_job_workers
+        start_job_workers()
+
+
+def stop_background_workers(timeout: float | None = None) -> None:
+    from apps.services.email_outbox_worker import stop_email_worker
+    from apps.services.notification_digest_worker import stop_digest_worker
+    from apps.services.job_worker import stop_job_workers
+    from apps.utils.events import stop_event_listener
+    stop_email_worker(timeout)
+    stop_digest_worker(timeout)
+    stop_job_workers(timeout)
+    stop_event_listener(timeout)
+
+
 if __name__ == '__main__':
-    print("Initializing database...")
-    init_db()
     print("Starting Flask application...")
-    app.run(debug=True, host='0.0.0.0', port=5000)
+    create_app().run(debug=True, host='0.0.0.0', port=5000)
@@ -0,0 +1,121 @@
+import click
+
+
+def register_commands(app):
+
+    @app.cli.command('init-db')
+    def init_db_command():
+        """Create all database tables."""
+        from apps.utils.db import init_db
+        import apps.models  # noqa: F401 - register every table on Base.metadata
+        init_db()
+
+    @app.cli.command('seed')
+    @click.option('--scale', type=click.Choice(['tiny', 'small', 'medium', 'large']),
+                  default='small', show_default=True)
+    @click.option('--users', type=int)
+    @click.option('--projects', type=int)
+    @click.option('--tasks', type=int)
+    @click.option('--comments', type=int)
+    @click.option('--seed', 'seed_value', type=int, default=42, show_default=True)
+    @click.option('--reset', is_flag=True, help='Drop and recreate every table first.')
+    @click.option('--keep-indexes', is_flag=True,
+                  help='Maintain indexes during the load instead of rebuilding them.')
+    def seed_command(scale, users, projects, tasks, comments, seed_value, reset, keep_indexes):
+        """Load synthetic users, projects, tasks and comments."""
+        from apps.utils.seeder import DatasetSpec, seed
+
+        if reset:
+            click.confirm('This drops every table. Continue?', abort=True)
+
+        spec = DatasetSpec.from_scale(scale, seed_value, users=users, projects=projects,
+                                      tasks=tasks, comments=comments)
+        click.echo(f"Seeding {spec.to_dict()}")
+
+        def progress(table, done, total, elapsed):
+            if done >= total:
+                click.echo(f"  {table}: {total} rows ({total / max(elapsed, 1e-9):,.0f}/s)")
+
+        seed(spec, reset=reset, defer_indexes=not keep_indexes, progress=progress)
+        click.echo("Done.")
+
+    @app.cli.group('jobs')
+    def jobs_group():
+        """Background job queue."""
+
+    @jobs_group.command('work')
+    @click.option('--threads', type=int, help='Worker threads (default JOB_WORKER_THREADS).')
+    @click.option('--drain', is_flag=True, help='Run queued jobs until none are due, then exit.')
+    @click.option('--type', 'types', multiple=True, help='Only run jobs of this type.')
+    def jobs_work_command(threads, drain, types):
+        """Run job workers in the foreground."""
+        from apps.utils.db import SessionLocal
+        from apps.services.job_service import JobService
+        from apps.services.job_worker import (
+            JOB_WORKER_THREADS, load_job_handlers, start_job_workers, stop_job_workers,
+        )
+
+        load_job_handlers()
+        if drain:
+            db = SessionLocal()
+            try:
+                done = 0
+                while True:
+                    status = JobService.run_next(db, types=types or None)
+                    if status is None:
+                        break
+                    done += 1
+                    click.echo(f"  {status.value}")
+            finally:
+                db.close()
+            click.echo(f"Ran {done} job(s).")
+            return
+
+        workers = start_job_workers(threads or JOB_WORKER_THREADS, types or None)
+        click.echo(f"{len(workers)} worker(s) running; Ctrl+C to stop.")
+        try:
+            while any(worker.is_alive() for worker in workers):
+                workers[0].join(1)
+        except KeyboardInterrupt:
+            click.echo("Stopping...")
+        finally:
+            stop_job_workers(timeout=30)
+
+    @jobs_group.command('enqueue')
+    @click.argument('job_type')
+    @click.option('--payload', default='{}', show_default=True, help='JSON object.')
+    @click.option('--priority', type=int, default=100, show_default=True,
+                  help='Lower runs first.')
+    def jobs_enqueue_command(job_type, payload, priority):
+        """Queue a job, e.g. `jobs enqueue project.purge`."""
+        import json
+        from apps.utils.db import SessionLocal
+        from apps.services.job_service import JobService
+        from apps.services.job_worker import load_job_handlers
+
+        load_job_handlers()
+        db = SessionLocal()
+        try:
+            job = JobService.enqueue(db, job_type, json.loads(payload), priority=priority)
+            click.echo(str(job.id))
+        except ValueError as e:
+            raise click.ClickException(str(e))
+        finally:
+            db.close()
+
+    @jobs_group.command('status')
+    @click.argument('job_id')
+    def jobs_status_command(job_id):
+        """Show one job."""
+        import json
+        from apps.utils.db import SessionLocal
+        from apps.services.job_service import JobService
+
+        db = SessionLocal()
+        try:
+            job = JobService.get_job(db, job_id)
+            if job is None:
+                raise click.ClickException(f"No job {job_id}")
+            click.echo(json.dumps(job.to_dict(), indent=2))
+        finally:
+            db.close()
@@ -0,0 +1,41 @@
+import os
+from datetime import timedelta
+
+from dotenv import load_dotenv
+
+# Before any getenv below, and before other modules read theirs.
+load_dotenv()
+
+
+def _flag(name: str, default: str = 'True') -> bool:
+    return os.getenv(name, default) == 'True'
+
+
+class Config:
+    APP_ENV = os.getenv('APP_ENV', 'development')
+    SECRET_KEY = os.getenv('SECRET_KEY', 'your-secret-key-change-this-in-production')
+    SESSION_TYPE = 'filesystem'
+    SESSION_PERMANENT = True
+    PERMANENT_SESSION_LIFETIME = timedelta(hours=1)
+
+    METRICS_ENABLED = _flag('METRICS_ENABLED')
+    SQL_PROFILER_ENABLED = _flag('SQL_PROFILER_ENABLED')
+    # /metrics and /metrics/sql: bearer token for the scraper; unset, they
+    # answer internal addresses only.
+    METRICS_TOKEN = os.getenv('METRICS_TOKEN', '')
+    COMPRESS_ENABLED = _flag('COMPRESS_ENABLED')
+
+    # Background threads; the production server starts them after fork.
+    START_BACKGROUND_WORKERS = _flag('BACKGROUND_WORKERS')
+    EMAIL_OUTBOX_WORKER = _flag('EMAIL_OUTBOX_WORKER')
+    NOTIFICATION_DIGEST_WORKER = _flag('NOTIFICATION_DIGEST_WORKER')
+    JOB_WORKER = _flag('JOB_WORKER')
+
+
+class TestingConfig(Config):
+    APP_ENV = 'test'
+    TESTING = True
+    START_BACKGROUND_WORKERS = False
+
+
+__all__ = ['Config', 'TestingConfig']
@@ -0,0 +1,219 @@
+from apps.utils import events
+from apps.utils.permissions import permission_index
+from apps.models.project_member import Permission
+from apps.utils.async_db import AsyncSessionLocal
+from apps.services.async_read_service import AsyncTaskService, AsyncCommentService
+from apps.services.task_service import TaskService
+from apps.models.projections import TASK_ROW, COMMENT_WITH_AUTHOR_ROW
+
+
+def _int_arg(args: dict, name: str, default: int) -> int:
+    # Same as request.args.get(name, default, type=int).
+    try:
+        return int(args.get(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+class AsyncReadController:
+    """Async versions of the hot read endpoints.
+
+    Each method takes the authenticated payload and the parsed query string
+    and returns ``(body, status)``; bodies match the Flask controllers.
+    """
+
+    @staticmethod
+    async def get_task(current_user, args, task_id):
+        try:
+            async with AsyncSessionLocal() as db:
+                task = await AsyncTaskService.get_task_by_id(db, task_id)
+
+                if not task:
+                    return {
+                        'success': False,
+                        'message': 'Task không tồn tại'
+                    }, 404
+
+                if not await permission_index.aallows(current_user['user_id'], task.project_id,
+                                                      Permission.READ, db):
+                    return {
+                        'success': False,
+                        'message': 'Bạn không có quyền truy cập dự án này'
+                    }, 403
+
+                return {
+                    'success': True,
+                    'data': TaskService.task_to_dict(task)
+                }, 200
+
+        except Exception as e:
+            return {
+                'success': False,
+                'message': 'Đã xảy ra lỗi',
+                'error': str(e)
+            }, 500
+
+    @staticmethod
+    async def get_tasks_by_project(current_user, args, project_id):
+        projection, unknown = TASK_ROW.from_query(args.get('fields'))
+        if unknown:
+            return {
+                'success': False,
+                'message': f"Trường không hợp lệ: {', '.join(unknown)}"
+            }, 400
+
+        try:
+            skip = int(args.get('skip', 0))
+            limit = int(args.get('limit', 100))
+
+            async with AsyncSessionLocal() as db:
+                project = await AsyncTaskService.get_project_by_id(db, project_id)
+                if not project:
+                    return {
+                        'success': False,
+                        'message': 'Dự án không tồn tại'
+                    }, 404
+
+                if not await permission_index.aallows(current_user['user_id'], project.id,
+                                                      Permission.READ, db):
+                    return {
+                        'success': False,
+                        'message': 'Bạn không có quyền truy cập dự án này'
+                    }, 403
+
+                tasks = await AsyncTaskService.get_task_rows_by_project(
+                    db, project_id, skip, limit, projection
+                )
+
+                return {
+                    'success': True,
+                    'data': tasks,
+                    'count': len(tasks)
+                }, 200
+
+        except Exception as e:
+            return {
+                'success': False,
+                'message': 'Đã xảy ra lỗi',
+                'error': str(e)
+            }, 500
+
+    @staticmethod
+    async def get_my_tasks(current_user, args):
+        projection, unknown = TASK_ROW.from_query(args.get('fields'))
+        if unknown:
+            return {
+                'success': False,
+                'message': f"Trường không hợp lệ: {', '.join(unknown)}"
+            }, 400
+
+        try:
+            skip = int(args.get('skip', 0))
+            limit = int(args.get('limit', 100))
+
+            async with AsyncSessionLocal() as db:
+                tasks = await AsyncTaskService.get_task_rows_by_assignee(
+                    db, current_user['user_id'], skip, limit, projection
+                )
+
+                return {
+                    'success': True,
+                    'data': tasks,
+                    'count': len(tasks)
+                }, 200
+
+        except Exception as e:
+            return {
+                'success': False,
+                'message': 'Đã xảy ra lỗi',
+                'error': str(e)
+            }, 500
+
+    @staticmethod
+    async def get_comments_by_task(current_user, args, task_id):
+        projection, unknown = COMMENT_WITH_AUTHOR_ROW.from_query(args.get('fields'))
+        if unknown:
+            return {
+                'success': False,
+                'message': f"Trường không hợp lệ: {', '.join(unknown)}"
+            }, 400
+
+        try:
+            async with AsyncSessionLocal() as db:
+                task = await AsyncTaskService.get_task_by_id(db, task_id)
+                if not task:
+                    return {
+                        'success': False,
+                        'message': 'Task không tồn tại'
+                    }, 404
+
+                if not await permission_index.aallows(current_user['user_id'], task.project_id,
+                                                      Permission.READ, db):
+                    return {
+                        'success': False,
+                        'message': 'Bạn không có quyền truy cập dự án này'
+                    }, 403
+
+                page = _int_arg(args, 'page', 1)
+                limit = _int_arg(args, 'limit', 20)
+                skip = (page - 1) * limit
+
+                comments = await AsyncCommentService.get_comment_rows_by_task(
+                    db, task_id, skip, limit, projection
+                )
+                total = await AsyncCommentService.count_comments_by_task(db, task_id)
+
+                return {
+                    'success': True,
+                    'data': {
+                        'comments': comments,
+                        'pagination': {
+                            'page': page,
+                            'limit': limit,
+                            'total': total,
+                            'pages': (total + limit - 1) // limit
+                        }
+                    }
+                }, 200
+
+        except Exception as e:
+            return {
+                'success': False,
+                'message': 'Đã xảy ra lỗi',
+                'error': str(e)
+            }, 500
+
+    @staticmethod
+    async def get_project_events(current_user, args, project_id):
+        """SSE stream; the body is an async iterator of messages."""
+        try:
+            async with AsyncSessionLocal() as db:
+                project = await AsyncTaskService.get_project_by_id(db, project_id)
+
+                if not project:
+                    return {
+                        'success': False,
+                        'message': 'Dự án không tồn tại'
+                    }, 404
+
+                if not await permission_index.aallows(current_user['user_id'], project.id,
+                                                      Permission.READ, db):
+                    return {
+                        'success': False,
+                        'message': 'Bạn không có quyền truy cập dự án này'
+                    }, 403
+
+        except Exception as e:
+            return {
+                'success': False,
+                'message': 'Đã xảy ra lỗi',
+                'error': str(e)
+            }, 500
+
+        subscription = events.broker.subscribe(
+            events.AsyncSubscription(str(project.id)), args.get('last_event_id')
+        )
+        return events.astream(subscription), 200
+
+
+__all__ = ['AsyncReadController']
@@ -1,31 +1,32 @@
 from flask import request, jsonify
-import sys
-from pathlib import Path
-
-sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from apps.utils.db import SessionLocal
+from apps.utils.serialization import respond
+from apps.utils.multi_get import parse_ids
 from apps.services import AuthService
-from apps.services.email_service import EmailService
-from apps.validations.auth_validation import validate_register_data, validate_login_data, validate_reset_password_data, validate_request_reset_password
+from apps.validations.auth_validation import (
+    REGISTER_SCHEMA,
+    LOGIN_SCHEMA,
+    RESET_PASSWORD_SCHEMA,
+    REQUEST_RESET_PASSWORD_SCHEMA
+)
 
 
 class AuthController:
     
     @staticmethod
     def register():
-        data = request.get_json()
-        
-        is_valid, error_msg = validate_register_data(data)
-        if not is_valid:
+        data, errors = REGISTER_SCHEMA.load()
+        if errors:
             return jsonify({
                 'success': False,
-                'message': error_msg
+                'message': next(iter(errors.values())),
+                'errors': errors
             }), 400
         
-        username = data['username'].strip()
-        email = data['email'].strip()
-        full_name = data['full_name'].strip()
+        username = data['username']
+        email = data['email']
+        full_name = data['full_name']
         password = data['password']
         
         db = SessionLocal()
@@ -61,16 +62,15 @@ class AuthController:
     
     @staticmethod
     def login():
-        data = request.get_json()
-        
-        is_valid, error_msg = validate_login_data(data)
-        if not is_valid:
+        data, errors = LOGIN_SCHEMA.load()
+        if errors:
             return jsonify({
                 'success': False,
-                'message': error_msg
+                'message': next(iter(errors.values())),
+                'errors': errors
             }), 400
         
-        username = data['username'].strip()
+        username = data['username']
         password = data['password']
         
         db = SessionLocal()
@@ -128,15 +128,45 @@ class AuthController:
         finally:
             db.close()
     
+    @staticmethod
+    def get_users_by_ids(current_user):
+        ids, error = parse_ids(request.args.get('ids'))
+        if error:
+            return jsonify({
+                'success': False,
+                'message': error
+            }), 400
+        
+        db = SessionLocal()
+        try:
+            users, missing = AuthService.get_user_rows_by_ids(db, ids)
+            
+            return respond({
+                'success': True,
+                'data': users,
+                'count': len(users),
+                'missing': missing
+            }), 200
+            
+        except Exception as e:
+            return jsonify({
+                'success': False,
+                'message': 'Đã xảy ra lỗi',
+                'error': str(e)
+            }), 500
+        finally:
+            db.close()
+    
     @staticmethod
     def logout(current_user):
+        db = SessionLocal()
         try:
-            success, message = AuthService.logout_user()
+            success, message = AuthService.logout_user(db, current_user)
             
             return jsonify({
                 'success': success,
                 'message': message
-            }), 200
+            }), 200 if success else 500
             
         except Exception as e:
             return jsonify({
@@ -144,19 +174,20 @@ class AuthController:
                 'message': 'Đã xảy ra lỗi',
                 'error': str(e)
             }), 500
+        finally:
+            db.close()
     
     @staticmethod
     def request_reset_password():
-        data = request.get_json()
-        
-        is_valid, error_msg = validate_request_reset_password(data)
-        if not is_valid:
+        data, errors = REQUEST_RESET_PASSWORD_SCHEMA.load()
+        if errors:
             return jsonify({
                 'success': False,
-                'message': error_msg
+                'message': next(iter(errors.values())),
+                'errors': errors
             }), 400
         
-        email = data['email'].strip()
+        email = data['email']
         
         db = SessionLocal()
         try:
@@ -169,9 +200,10 @@ class AuthController:
                     'message': message
                 }), status_code
             
-            email_sent = EmailService.send_reset_password_email(email, reset_token, username)
+            from apps.services.email_service import EmailService
+            email_queued = EmailService.queue_reset_password_email(db, email, reset_token, username)
             
-            if not email_sent:
+            if not email_queued:
                 return jsonify({
                     'success': False,
                     'message': 'Không thể gửi email. Vui lòng thử lại sau.'
@@ -193,16 +225,15 @@ class AuthController:
     
     @staticmethod
     def reset_password():
-        data = request.get_json()
-        
-        is_valid, error_msg = validate_reset_password_data(data)
-        if not is_valid:
+        data, errors = RESET_PASSWORD_SCHEMA.load()
+        if errors:
             return jsonify({
                 'success': False,
-                'message': error_msg
+                'message': next(iter(errors.values())),
+                'errors': errors
             }), 400
         
-        token = data['token'].strip()
+        token = data['token']
         new_password = data['new_password']
         
         db = SessionLocal()
@@ -0,0 +1,150 @@
+from typing import Tuple
+
+from flask import current_app, request, jsonify
+from werkzeug.test import EnvironBuilder
+
+from apps.utils.db import shared_connection
+from apps.utils.serialization import respond
+from apps.middlewares.auth_middleware import shared_identity
+from apps.middlewares.compression_middleware import disable_compression
+from apps.utils.compression import DEFAULT_POLICY
+from apps.utils.permissions import permission_index
+from apps.validations.batch_validation import BATCH_SCHEMA, BATCH_REQUEST_SCHEMA, BATCH_MAX_REQUESTS
+
+
+def _error(status: int, message: str) -> dict:
+    return {'status': status, 'body': {'success': False, 'message': message}}
+
+
+def _dispatch(app, method: str, path: str, body) -> Tuple[dict, bool]:
+    """Run one sub-request through the app's normal routing and hooks.
+
+    Returns the result and whether the matched route may be compressed.
+    """
+    batch_endpoint = request.endpoint
+    builder = EnvironBuilder(
+        path=path,
+        method=method,
+        json=body,
+        headers={'Accept': 'application/json'},
+        environ_base={'REMOTE_ADDR': request.remote_addr}
+    )
+    try:
+        environ = builder.get_environ()
+    finally:
+        builder.close()
+
+    with app.app_context(), app.request_context(environ):
+        # Matched by the router, so encoded or aliased paths count too.
+        if request.endpoint == batch_endpoint:
+            return _error(400, 'Không thể lồng batch'), True
+        view = app.view_functions.get(request.endpoint)
+        # A stream view subscribes when called; refuse before that happens.
+        if getattr(view, 'streaming', False):
+            return _error(400, 'Không hỗ trợ phản hồi dạng stream trong batch'), True
+        compressible = getattr(view, 'compression_policy', DEFAULT_POLICY).enabled
+        try:
+            response = app.full_dispatch_request()
+        except Exception as e:
+            return {'status': 500, 'body': {
+                'success': False,
+                'message': 'Đã xảy ra lỗi',
+                'error': str(e)
+            }}, compressible
+        try:
+            if response.is_json:
+                body = response.get_json()
+            elif response.status_code >= 400:
+                # Routing errors (404, 405) render as HTML.
+                body = {'success': False, 'message': response.status}
+            else:
+                body = response.get_data(as_text=True)
+            return {'status': response.status_code, 'body': body}, compressible
+        finally:
+            response.close()
+
+
+class BatchController:
+
+    @staticmethod
+    def execute(current_user):
+        """Run ``requests`` in order on one connection as the caller.
+
+        With ``atomic`` they share one transaction: the first sub-request
+        answering 4xx/5xx stops the batch and rolls back every write.
+        """
+        payload = request.get_json(silent=True)
+        data, errors = BATCH_SCHEMA.validate(payload)
+        if errors:
+            return jsonify({
+                'success': False,
+                'message': next(iter(errors.values())),
+                'errors': errors
+            }), 400
+
+        items = payload.get('requests')
+        if not isinstance(items, list) or not items:
+            return jsonify({
+                'success': False,
+                'message': 'Danh sách yêu cầu không được để trống'
+            }), 400
+        if len(items) > BATCH_MAX_REQUESTS:
+            return jsonify({
+                'success': False,
+                'message': f'Tối đa {BATCH_MAX_REQUESTS} yêu cầu mỗi batch'
+            }), 400
+
+        sub_requests, errors = BATCH_REQUEST_SCHEMA.validate_many(items)
+        if errors:
+            index, item_errors = next(iter(errors.items()))
+            return jsonify({
+                'success': False,
+                'message': f"Yêu cầu {index}: {next(iter(item_errors.values()))}",
+                'errors': {str(i): e for i, e in errors.items()}
+            }), 400
+
+        atomic = data['atomic']
+        app = current_app._get_current_object()
+        responses = []
+        committed = False
+        try:
+            with shared_connection(atomic) as connection, shared_identity(current_user):
+                for sub in sub_requests:
+                    result, compressible = _dispatch(app, sub['method'].upper(), sub['path'], sub.get('body'))
+                    responses.append(result)
+                    if not compressible:
+                        # e.g. a login: its token must not be compressed (BREACH).
+                        disable_compression()
+                    if atomic and result['status'] >= 400:
+                        break
+                succeeded = not atomic or responses[-1]['status'] < 400
+                if atomic and succeeded:
+                    connection.commit()
+                committed = succeeded
+        except Exception as e:
+            return jsonify({
+                'success': False,
+                'message': 'Đã xảy ra lỗi',
+                'error': str(e)
+            }), 500
+        finally:
+            if atomic and not committed:
+                # Permissions loaded inside the rolled-back transaction may
+                # be cached, and a rollback publishes no member.* event.
+                permission_index.invalidate()
+
+        for _ in range(len(responses), len(sub_requests)):
+            responses.append(_error(424, 'Không thực hiện do yêu cầu trước thất bại'))
+
+        return respond({
+            'success': committed,
+            'message': 'OK' if committed else 'Batch đã được hoàn tác',
+            'data': {
+                'atomic': atomic,
+                'committed': committed,
+                'responses': responses
+            }
+        }), 200
+
+
+__all__ = ['BatchController']
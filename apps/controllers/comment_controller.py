@@ -1,10 +1,15 @@
 from flask import request, jsonify
 from apps.utils.db import SessionLocal
+from apps.utils.serialization import respond
+from apps.models.projections import COMMENT_WITH_AUTHOR_ROW
 from apps.services.comment_service import CommentService
 from apps.services.task_service import TaskService
+from apps.models.project_member import Permission
+from apps.utils.permissions import permission_index
 from apps.validations.comment_validation import (
-    validate_create_comment, 
-    validate_update_comment,
+    COMMENT_CREATE_SCHEMA,
+    COMMENT_UPDATE_SCHEMA,
+    validation_error,
     validate_comment_id
 )
 
@@ -14,13 +19,12 @@ class CommentController:
     @staticmethod
     def create_comment(current_user):
         """Create a new comment on a task."""
-        validation_error = validate_create_comment()
-        if validation_error:
-            return validation_error
+        result = COMMENT_CREATE_SCHEMA.load()
+        if result.errors:
+            return validation_error(result)
         
-        data = request.get_json()
-        content = data['content'].strip()
-        task_id = data['task_id']
+        content = result.data['content']
+        task_id = result.data['task_id']
         
         db = SessionLocal()
         try:
@@ -31,6 +35,12 @@ class CommentController:
                     'message': 'Task không tồn tại'
                 }), 404
             
+            if not permission_index.allows(current_user['user_id'], task.project_id, Permission.WRITE, db):
+                return jsonify({
+                    'success': False,
+                    'message': 'Bạn không có quyền bình luận trong dự án này'
+                }), 403
+            
             success, message, comment = CommentService.create_comment(
                 db, content, task_id, current_user['user_id']
             )
@@ -59,9 +69,9 @@ class CommentController:
     @staticmethod
     def get_comment(current_user, comment_id):
         """Get a specific comment by ID."""
-        validation_error = validate_comment_id(comment_id)
-        if validation_error:
-            return validation_error
+        id_error = validate_comment_id(comment_id)
+        if id_error:
+            return id_error
         
         db = SessionLocal()
         try:
@@ -73,6 +83,12 @@ class CommentController:
                     'message': 'Comment không tồn tại'
                 }), 404
             
+            if not permission_index.allows(current_user['user_id'], comment.task.project_id, Permission.READ, db):
+                return jsonify({
+                    'success': False,
+                    'message': 'Bạn không có quyền truy cập dự án này'
+                }), 403
+            
             return jsonify({
                 'success': True,
                 'data': CommentService.comment_to_dict(comment, include_author=True)
@@ -90,6 +106,13 @@ class CommentController:
     @staticmethod
     def get_comments_by_task(current_user, task_id):
         """Get all comments for a specific task."""
+        projection, unknown = COMMENT_WITH_AUTHOR_ROW.from_query(request.args.get('fields'))
+        if unknown:
+            return jsonify({
+                'success': False,
+                'message': f"Trường không hợp lệ: {', '.join(unknown)}"
+            }), 400
+        
         db = SessionLocal()
         try:
             task = TaskService.get_task_by_id(db, task_id)
@@ -99,17 +122,23 @@ class CommentController:
                     'message': 'Task không tồn tại'
                 }), 404
             
+            if not permission_index.allows(current_user['user_id'], task.project_id, Permission.READ, db):
+                return jsonify({
+                    'success': False,
+                    'message': 'Bạn không có quyền truy cập dự án này'
+                }), 403
+            
             page = request.args.get('page', 1, type=int)
             limit = request.args.get('limit', 20, type=int)
             skip = (page - 1) * limit
             
-            comments = CommentService.get_comments_by_task(db, task_id, skip, limit)
+            comments = CommentService.get_comment_rows_by_task(db, task_id, skip, limit, projection)
             total = CommentService.count_comments_by_task(db, task_id)
             
-            return jsonify({
+            return respond({
                 'success': True,
                 'data': {
-                    'comments': [CommentService.comment_to_dict(c, include_author=True) for c in comments],
+                    'comments': comments,
                     'pagination': {
                         'page': page,
                         'limit': limit,
@@ -131,20 +160,27 @@ class CommentController:
     @staticmethod
     def get_my_comments(current_user):
         """Get all comments by the current user."""
+        projection, unknown = COMMENT_WITH_AUTHOR_ROW.from_query(request.args.get('fields'))
+        if unknown:
+            return jsonify({
+                'success': False,
+                'message': f"Trường không hợp lệ: {', '.join(unknown)}"
+            }), 400
+        
         db = SessionLocal()
         try:
             page = request.args.get('page', 1, type=int)
             limit = request.args.get('limit', 20, type=int)
             skip = (page - 1) * limit
             
-            comments = CommentService.get_comments_by_author(
-                db, current_user['user_id'], skip, limit
+            comments = CommentService.get_comment_rows_by_author(
+                db, current_user['user_id'], skip, limit, projection
             )
             
-            return jsonify({
+            return respond({
                 'success': True,
                 'data': {
-                    'comments': [CommentService.comment_to_dict(c, include_author=True) for c in comments],
+                    'comments': comments,
                     'pagination': {
                         'page': page,
                         'limit': limit
@@ -164,16 +200,15 @@ class CommentController:
     @staticmethod
     def update_comment(current_user, comment_id):
         """Update a comment (only by author)."""
-        validation_error = validate_comment_id(comment_id)
-        if validation_error:
-            return validation_error
+        id_error = validate_comment_id(comment_id)
+        if id_error:
+            return id_error
         
-        validation_error = validate_update_comment()
-        if validation_error:
-            return validation_error
+        result = COMMENT_UPDATE_SCHEMA.load()
+        if result.errors:
+            return validation_error(result)
         
-        data = request.get_json()
-        content = data['content'].strip()
+        content = result.data['content']
         
         db = SessionLocal()
         try:
@@ -185,7 +220,9 @@ class CommentController:
                     'message': 'Comment không tồn tại'
                 }), 404
             
-            if not CommentService.is_comment_author(comment, current_user['user_id']):
+            permissions = permission_index.mask(current_user['user_id'], comment.task.project_id, db)
+            if not (CommentService.is_comment_author(comment, current_user['user_id'])
+                    and Permission.WRITE in permissions):
                 return jsonify({
                     'success': False,
                     'message': 'Bạn không có quyền sửa comment này'
@@ -218,10 +255,10 @@ class CommentController:
     
     @staticmethod
     def delete_comment(current_user, comment_id):
-        """Delete a comment (only by author)."""
-        validation_error = validate_comment_id(comment_id)
-        if validation_error:
-            return validation_error
+        """Delete a comment (by its author or a project manager)."""
+        id_error = validate_comment_id(comment_id)
+        if id_error:
+            return id_error
         
         db = SessionLocal()
         try:
@@ -233,7 +270,11 @@ class CommentController:
                     'message': 'Comment không tồn tại'
                 }), 404
             
-            if not CommentService.is_comment_author(comment, current_user['user_id']):
+            # Authors can delete their own comments; managers any comment.
+            permissions = permission_index.mask(current_user['user_id'], comment.task.project_id, db)
+            is_author = CommentService.is_comment_author(comment, current_user['user_id'])
+            if not (Permission.MANAGE in permissions or
+                    (is_author and Permission.WRITE in permissions)):
                 return jsonify({
                     'success': False,
                     'message': 'Bạn không có quyền xóa comment này'
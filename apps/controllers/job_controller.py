@@ -0,0 +1,33 @@
+from flask import jsonify
+from apps.utils.db import SessionLocal
+from apps.services.job_service import JobService
+
+
+class JobController:
+    
+    @staticmethod
+    def get_job(current_user, job_id):
+        db = SessionLocal()
+        try:
+            job = JobService.get_job(db, job_id)
+            
+            # Other users' jobs are reported as missing, not forbidden.
+            if not job or str(job.created_by) != current_user['user_id']:
+                return jsonify({
+                    'success': False,
+                    'message': 'Job không tồn tại'
+                }), 404
+            
+            return jsonify({
+                'success': True,
+                'data': job.to_dict()
+            }), 200
+            
+        except Exception as e:
+            return jsonify({
+                'success': False,
+                'message': 'Đã xảy ra lỗi',
+                'error': str(e)
+            }), 500
+        finally:
+            db.close()
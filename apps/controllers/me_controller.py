@@ -0,0 +1,47 @@
+from flask import request, jsonify
+from apps.utils.db import SessionLocal
+from apps.utils.serialization import respond
+from apps.services.overview_service import OverviewService, OVERVIEW_SECTIONS, OVERVIEW_MAX_LIMIT
+
+
+class MeController:
+    
+    @staticmethod
+    def get_overview(current_user):
+        """Assigned tasks by due window, owned projects and recent comments.
+        
+        ``?sections=tasks,comments`` returns only those sections;
+        ``?limit=`` caps the rows per section (per window for tasks).
+        """
+        sections = OVERVIEW_SECTIONS
+        if request.args.get('sections'):
+            sections = [name.strip() for name in request.args['sections'].split(',') if name.strip()]
+            unknown = [name for name in sections if name not in OVERVIEW_SECTIONS]
+            if unknown:
+                return jsonify({
+                    'success': False,
+                    'message': f"Phần không hợp lệ: {', '.join(unknown)}"
+                }), 400
+        
+        limit = request.args.get('limit', 10, type=int)
+        limit = max(1, min(limit, OVERVIEW_MAX_LIMIT))
+        
+        db = SessionLocal()
+        try:
+            overview = OverviewService.get_overview(
+                db, current_user['user_id'], sections, limit
+            )
+            
+            return respond({
+                'success': True,
+                'data': overview
+            }), 200
+            
+        except Exception as e:
+            return jsonify({
+                'success': False,
+                'message': 'Đã xảy ra lỗi',
+                'error': str(e)
+            }), 500
+        finally:
+            db.close()
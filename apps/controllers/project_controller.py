@@ -1,47 +1,44 @@
-from flask import request, jsonify
+from flask import Response, request, jsonify
+from apps.utils import events
 from apps.utils.db import SessionLocal
+from apps.utils.serialization import respond
+from apps.models.projections import PROJECT_ROW, TASK_ROW
+from apps.models.task import TaskStatus
+from apps.models.project_member import Permission, ProjectRole
+from apps.utils.permissions import permission_index
+from apps.utils.multi_get import parse_ids
+from apps.services.task_service import TaskService
 from apps.services.project_service import ProjectService
-from apps.models.project import ProjectStatus
-from apps.validations.project_validation import validate_project_creation, validate_project_update
-from datetime import datetime
+from apps.services.member_service import MemberService
+from apps.services.auth_service import AuthService, STREAM_TOKEN_EXPIRATION_SECONDS
+from apps.validations.project_validation import (
+    PROJECT_CREATE_SCHEMA,
+    PROJECT_UPDATE_SCHEMA,
+    PROJECT_MEMBER_CREATE_SCHEMA,
+    PROJECT_MEMBER_UPDATE_SCHEMA
+)
+
+
+BOARD_MAX_COLUMN_LIMIT = 100
 
 
 class ProjectController:
     
     @staticmethod
     def create_project(current_user):
-        data = request.get_json()
-        
-        is_valid, message = validate_project_creation(data)
-        if not is_valid:
+        data, errors = PROJECT_CREATE_SCHEMA.load()
+        if errors:
             return jsonify({
                 'success': False,
-                'message': message
+                'message': next(iter(errors.values())),
+                'errors': errors
             }), 400
         
-        name = data['name'].strip()
-        description = data.get('description', '').strip()
+        name = data['name']
+        description = data['description'] or ''
         start_date = data.get('start_date')
         end_date = data.get('end_date')
         
-        if start_date:
-            try:
-                start_date = datetime.fromisoformat(start_date)
-            except:
-                return jsonify({
-                    'success': False,
-                    'message': 'Format ngày bắt đầu không hợp lệ'
-                }), 400
-        
-        if end_date:
-            try:
-                end_date = datetime.fromisoformat(end_date)
-            except:
-                return jsonify({
-                    'success': False,
-                    'message': 'Format ngày kết thúc không hợp lệ'
-                }), 400
-        
         db = SessionLocal()
         try:
             success, message, project = ProjectService.create_project(
@@ -82,6 +79,12 @@ class ProjectController:
                     'message': 'Dự án không tồn tại'
                 }), 404
             
+            if not permission_index.allows(current_user['user_id'], project.id, Permission.READ, db):
+                return jsonify({
+                    'success': False,
+                    'message': 'Bạn không có quyền truy cập dự án này'
+                }), 403
+            
             return jsonify({
                 'success': True,
                 'data': ProjectService.project_to_dict(project)
@@ -96,21 +99,211 @@ class ProjectController:
         finally:
             db.close()
     
+    @staticmethod
+    def get_board(current_user, project_id):
+        """Tasks grouped by status. With ``status`` (and ``cursor``) returns the
+        next page of that one column instead."""
+        projection, unknown = TASK_ROW.from_query(request.args.get('fields'))
+        if unknown:
+            return jsonify({
+                'success': False,
+                'message': f"Trường không hợp lệ: {', '.join(unknown)}"
+            }), 400
+        
+        status = request.args.get('status')
+        if status is not None:
+            status = next((s for s in TaskStatus if s.value == status), None)
+            if status is None:
+                return jsonify({
+                    'success': False,
+                    'message': 'Trạng thái không hợp lệ'
+                }), 400
+        
+        db = SessionLocal()
+        try:
+            limit = request.args.get('limit', 20, type=int)
+            limit = max(1, min(limit, BOARD_MAX_COLUMN_LIMIT))
+            
+            project = ProjectService.get_project_by_id(db, project_id)
+            if not project:
+                return jsonify({
+                    'success': False,
+                    'message': 'Dự án không tồn tại'
+                }), 404
+            
+            if not permission_index.allows(current_user['user_id'], project.id, Permission.READ, db):
+                return jsonify({
+                    'success': False,
+                    'message': 'Bạn không có quyền truy cập dự án này'
+                }), 403
+            
+            if status is None:
+                return respond({
+                    'success': True,
+                    'data': {
+                        'columns': TaskService.get_board(db, project_id, limit, projection),
+                        'limit': limit
+                    }
+                }), 200
+            
+            success, message, column = TaskService.get_board_column(
+                db, project_id, status, request.args.get('cursor'), limit, projection
+            )
+            if not success:
+                return jsonify({
+                    'success': False,
+                    'message': message
+                }), 400
+            
+            return respond({
+                'success': True,
+                'data': dict(column, limit=limit)
+            }), 200
+            
+        except Exception as e:
+            return jsonify({
+                'success': False,
+                'message': 'Đã xảy ra lỗi',
+                'error': str(e)
+            }), 500
+        finally:
+            db.close()
+    
+    @staticmethod
+    def create_stream_token(current_user, project_id):
+        """Short-lived ``?stream_token=`` for this project's event stream"""
+        db = SessionLocal()
+        try:
+            project = ProjectService.get_project_by_id(db, project_id)
+            if not project:
+                return jsonify({
+                    'success': False,
+                    'message': 'Dự án không tồn tại'
+                }), 404
+            if not permission_index.allows(current_user['user_id'], project.id, Permission.READ, db):
+                return jsonify({
+                    'success': False,
+                    'message': 'Bạn không có quyền truy cập dự án này'
+                }), 403
+            
+            return jsonify({
+                'success': True,
+                'data': {
+                    'token': AuthService.create_stream_token(current_user, project.id),
+                    'expires_in': STREAM_TOKEN_EXPIRATION_SECONDS
+                }
+            }), 201
+            
+        except Exception as e:
+            return jsonify({
+                'success': False,
+                'message': 'Đã xảy ra lỗi',
+                'error': str(e)
+            }), 500
+        finally:
+            db.close()
+    
+    @staticmethod
+    def stream_events(current_user, project_id):
+        """Server-Sent Events for changes to the project's tasks and comments."""
+        db = SessionLocal()
+        try:
+            project = ProjectService.get_project_by_id(db, project_id)
+            if not project:
+                return jsonify({
+                    'success': False,
+                    'message': 'Dự án không tồn tại'
+                }), 404
+            if not permission_index.allows(current_user['user_id'], project.id, Permission.READ, db):
+                return jsonify({
+                    'success': False,
+                    'message': 'Bạn không có quyền truy cập dự án này'
+                }), 403
+            project_key = str(project.id)
+        except Exception as e:
+            return jsonify({
+                'success': False,
+                'message': 'Đã xảy ra lỗi',
+                'error': str(e)
+            }), 500
+        finally:
+            # Don't hold a pooled connection for the life of the stream.
+            db.close()
+        
+        last_event_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+        subscription = events.broker.subscribe(events.Subscription(project_key), last_event_id)
+        return Response(
+            events.stream(subscription),
+            mimetype='text/event-stream',
+            headers=events.SSE_HEADERS
+        )
+    
+    @staticmethod
+    def get_projects_by_ids(current_user):
+        projection, unknown = PROJECT_ROW.from_query(request.args.get('fields'))
+        if unknown:
+            return jsonify({
+                'success': False,
+                'message': f"Trường không hợp lệ: {', '.join(unknown)}"
+            }), 400
+        
+        ids, error = parse_ids(request.args.get('ids'))
+        if error:
+            return jsonify({
+                'success': False,
+                'message': error
+            }), 400
+        
+        db = SessionLocal()
+        try:
+            projects, missing = ProjectService.get_project_rows_by_ids(
+                db, current_user['user_id'], ids, projection
+            )
+            
+            return respond({
+                'success': True,
+                'data': projects,
+                'count': len(projects),
+                'missing': missing
+            }), 200
+            
+        except Exception as e:
+            return jsonify({
+                'success': False,
+                'message': 'Đã xảy ra lỗi',
+                'error': str(e)
+            }), 500
+        finally:
+            db.close()
+    
     @staticmethod
     def get_all_projects(current_user):
-        """Get all projects (with pagination)"""
+        """Projects the user is a member of (with pagination), or those
+        named in ``?ids=``"""
+        if 'ids' in request.args:
+            return ProjectController.get_projects_by_ids(current_user)
+        
+        projection, unknown = PROJECT_ROW.from_query(request.args.get('fields'))
+        if unknown:
+            return jsonify({
+                'success': False,
+                'message': f"Trường không hợp lệ: {', '.join(unknown)}"
+            }), 400
+        
         db = SessionLocal()
         try:
             page = int(request.args.get('page', 1))
             limit = int(request.args.get('limit', 20))
             skip = (page - 1) * limit
             
-            projects = ProjectService.get_all_projects(db, skip, limit)
+            projects = ProjectService.get_all_project_rows(
+                db, current_user['user_id'], skip, limit, projection
+            )
             
-            return jsonify({
+            return respond({
                 'success': True,
                 'data': {
-                    'projects': [ProjectService.project_to_dict(p) for p in projects],
+                    'projects': projects,
                     'pagination': {
                         'page': page,
                         'limit': limit,
@@ -130,18 +323,25 @@ class ProjectController:
     
     @staticmethod
     def get_my_projects(current_user):
+        projection, unknown = PROJECT_ROW.from_query(request.args.get('fields'))
+        if unknown:
+            return jsonify({
+                'success': False,
+                'message': f"Trường không hợp lệ: {', '.join(unknown)}"
+            }), 400
+        
         db = SessionLocal()
         try:
             skip = int(request.args.get('skip', 0))
             limit = int(request.args.get('limit', 100))
             
-            projects = ProjectService.get_projects_by_owner(
-                db, current_user['user_id'], skip, limit
+            projects = ProjectService.get_project_rows_by_owner(
+                db, current_user['user_id'], skip, limit, projection
             )
             
-            return jsonify({
+            return respond({
                 'success': True,
-                'data': [ProjectService.project_to_dict(p) for p in projects],
+                'data': projects,
                 'count': len(projects)
             }), 200
             
@@ -156,13 +356,12 @@ class ProjectController:
     
     @staticmethod
     def update_project(current_user, project_id):
-        data = request.get_json()
-        
-        is_valid, message = validate_project_update(data)
-        if not is_valid:
+        data, errors = PROJECT_UPDATE_SCHEMA.load()
+        if errors:
             return jsonify({
                 'success': False,
-                'message': message
+                'message': next(iter(errors.values())),
+                'errors': errors
             }), 400
         
         db = SessionLocal()
@@ -174,28 +373,14 @@ class ProjectController:
                     'message': 'Dự án không tồn tại'
                 }), 404
             
-            if str(project.owner_id) != current_user['user_id']:
+            if not permission_index.allows(current_user['user_id'], project.id, Permission.MANAGE, db):
                 return jsonify({
                     'success': False,
                     'message': 'Bạn không có quyền sửa dự án này'
                 }), 403
             
-            update_data = {}
-            if 'name' in data:
-                update_data['name'] = data['name'].strip()
-            if 'description' in data:
-                update_data['description'] = data['description'].strip()
-            if 'status' in data:
-                try:
-                    update_data['status'] = ProjectStatus(data['status'])
-                except ValueError:
-                    return jsonify({
-                        'success': False,
-                        'message': 'Trạng thái không hợp lệ'
-                    }), 400
-            
             success, message, updated_project = ProjectService.update_project(
-                db, project_id, **update_data
+                db, project_id, **data
             )
             
             if not success:
@@ -230,13 +415,207 @@ class ProjectController:
                     'message': 'Dự án không tồn tại'
                 }), 404
             
-            if str(project.owner_id) != current_user['user_id']:
+            if not permission_index.allows(current_user['user_id'], project.id, Permission.DELETE, db):
                 return jsonify({
                     'success': False,
                     'message': 'Bạn không có quyền xóa dự án này'
                 }), 403
             
-            success, message = ProjectService.delete_project(db, project_id)
+            success, message, job = ProjectService.delete_project(
+                db, project_id, current_user['user_id']
+            )
+            
+            if not success:
+                return jsonify({
+                    'success': False,
+                    'message': message
+                }), 400
+            
+            return jsonify({
+                'success': True,
+                'message': message,
+                'data': {
+                    'job_id': str(job.id)
+                }
+            }), 200
+            
+        except Exception as e:
+            return jsonify({
+                'success': False,
+                'message': 'Đã xảy ra lỗi',
+                'error': str(e)
+            }), 500
+        finally:
+            db.close()
+    
+    @staticmethod
+    def get_members(current_user, project_id):
+        db = SessionLocal()
+        try:
+            project = ProjectService.get_project_by_id(db, project_id)
+            if not project:
+                return jsonify({
+                    'success': False,
+                    'message': 'Dự án không tồn tại'
+                }), 404
+            
+            if not permission_index.allows(current_user['user_id'], project.id, Permission.READ, db):
+                return jsonify({
+                    'success': False,
+                    'message': 'Bạn không có quyền truy cập dự án này'
+                }), 403
+            
+            members = MemberService.get_members(db, project.id)
+            
+            return jsonify({
+                'success': True,
+                'data': [MemberService.member_to_dict(member) for member in members],
+                'count': len(members)
+            }), 200
+            
+        except Exception as e:
+            return jsonify({
+                'success': False,
+                'message': 'Đã xảy ra lỗi',
+                'error': str(e)
+            }), 500
+        finally:
+            db.close()
+    
+    @staticmethod
+    def add_member(current_user, project_id):
+        data, errors = PROJECT_MEMBER_CREATE_SCHEMA.load()
+        if errors:
+            return jsonify({
+                'success': False,
+                'message': next(iter(errors.values())),
+                'errors': errors
+            }), 400
+        
+        db = SessionLocal()
+        try:
+            project = ProjectService.get_project_by_id(db, project_id)
+            if not project:
+                return jsonify({
+                    'success': False,
+                    'message': 'Dự án không tồn tại'
+                }), 404
+            
+            permissions = permission_index.mask(current_user['user_id'], project.id, db)
+            if not MemberService.can_assign(permissions, data['role']):
+                return jsonify({
+                    'success': False,
+                    'message': 'Bạn không có quyền thêm thành viên với vai trò này'
+                }), 403
+            
+            success, message, member = MemberService.add_member(
+                db, project.id, data['user_id'], data['role']
+            )
+            
+            if not success:
+                return jsonify({
+                    'success': False,
+                    'message': message
+                }), 400
+            
+            return jsonify({
+                'success': True,
+                'message': message,
+                'data': MemberService.member_to_dict(member)
+            }), 201
+            
+        except Exception as e:
+            return jsonify({
+                'success': False,
+                'message': 'Đã xảy ra lỗi',
+                'error': str(e)
+            }), 500
+        finally:
+            db.close()
+    
+    @staticmethod
+    def update_member(current_user, project_id, user_id):
+        data, errors = PROJECT_MEMBER_UPDATE_SCHEMA.load()
+        if errors:
+            return jsonify({
+                'success': False,
+                'message': next(iter(errors.values())),
+                'errors': errors
+            }), 400
+        
+        db = SessionLocal()
+        try:
+            project = ProjectService.get_project_by_id(db, project_id)
+            member = project and MemberService.get_member(db, project.id, user_id)
+            if not member:
+                return jsonify({
+                    'success': False,
+                    'message': 'Thành viên không tồn tại'
+                }), 404
+            
+            # Both the member's current role and the new one must be below
+            # the caller's, so the owner can never be demoted.
+            permissions = permission_index.mask(current_user['user_id'], project.id, db)
+            if not (MemberService.can_assign(permissions, member.role)
+                    and MemberService.can_assign(permissions, data['role'])):
+                return jsonify({
+                    'success': False,
+                    'message': 'Bạn không có quyền đổi vai trò thành viên này'
+                }), 403
+            
+            success, message, member = MemberService.update_role(
+                db, project.id, user_id, data['role']
+            )
+            
+            if not success:
+                return jsonify({
+                    'success': False,
+                    'message': message
+                }), 400
+            
+            return jsonify({
+                'success': True,
+                'message': message,
+                'data': MemberService.member_to_dict(member)
+            }), 200
+            
+        except Exception as e:
+            return jsonify({
+                'success': False,
+                'message': 'Đã xảy ra lỗi',
+                'error': str(e)
+            }), 500
+        finally:
+            db.close()
+    
+    @staticmethod
+    def remove_member(current_user, project_id, user_id):
+        """Remove a member, or leave the project when ``user_id`` is the caller."""
+        db = SessionLocal()
+        try:
+            project = ProjectService.get_project_by_id(db, project_id)
+            member = project and MemberService.get_member(db, project.id, user_id)
+            if not member:
+                return jsonify({
+                    'success': False,
+                    'message': 'Thành viên không tồn tại'
+                }), 404
+            
+            if member.role == ProjectRole.OWNER:
+                return jsonify({
+                    'success': False,
+                    'message': 'Không thể xóa chủ dự án'
+                }), 400
+            
+            leaving = str(member.user_id) == current_user['user_id']
+            permissions = permission_index.mask(current_user['user_id'], project.id, db)
+            if not (leaving or MemberService.can_assign(permissions, member.role)):
+                return jsonify({
+                    'success': False,
+                    'message': 'Bạn không có quyền xóa thành viên này'
+                }), 403
+            
+            success, message = MemberService.remove_member(db, project.id, member.user_id)
             
             if not success:
                 return jsonify({
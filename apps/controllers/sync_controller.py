@@ -0,0 +1,41 @@
+from flask import request, jsonify
+from apps.utils.db import SessionLocal
+from apps.utils.serialization import respond
+from apps.services.sync_service import SyncService, SYNC_MAX_CHANGES
+
+
+class SyncController:
+    
+    @staticmethod
+    def get_changes(current_user):
+        """Changed projects, tasks and comments plus tombstones since ``?since=``.
+        
+        Without ``since`` everything visible is returned (a first sync).
+        """
+        since = request.args.get('since', '0')
+        if not since.isdigit():
+            return jsonify({
+                'success': False,
+                'message': 'Cursor không hợp lệ'
+            }), 400
+        
+        limit = request.args.get('limit', SYNC_MAX_CHANGES, type=int)
+        limit = max(1, min(limit, SYNC_MAX_CHANGES))
+        
+        db = SessionLocal()
+        try:
+            changes = SyncService.get_changes(db, current_user['user_id'], int(since), limit)
+            
+            return respond({
+                'success': True,
+                'data': changes
+            }), 200
+            
+        except Exception as e:
+            return jsonify({
+                'success': False,
+                'message': 'Đã xảy ra lỗi',
+                'error': str(e)
+            }), 500
+        finally:
+            db.close()
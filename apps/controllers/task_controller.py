@@ -1,48 +1,33 @@
 from flask import request, jsonify
 from apps.utils.db import SessionLocal
+from apps.utils.serialization import respond
+from apps.models.projections import TASK_ROW
 from apps.services.task_service import TaskService
 from apps.services.project_service import ProjectService
-from apps.models.task import TaskStatus, TaskPriority
-from apps.validations.task_validation import validate_task_creation, validate_task_update
-from datetime import datetime
+from apps.models.project_member import Permission
+from apps.utils.permissions import permission_index
+from apps.utils.multi_get import parse_ids
+from apps.validations.task_validation import TASK_CREATE_SCHEMA, TASK_UPDATE_SCHEMA
 
 
 class TaskController:
     
     @staticmethod
     def create_task(current_user):
-        data = request.get_json()
-        
-        is_valid, message = validate_task_creation(data)
-        if not is_valid:
+        data, errors = TASK_CREATE_SCHEMA.load()
+        if errors:
             return jsonify({
                 'success': False,
-                'message': message
+                'message': next(iter(errors.values())),
+                'errors': errors
             }), 400
         
-        title = data['title'].strip()
-        description = data.get('description', '').strip()
+        title = data['title']
+        description = data['description'] or ''
         project_id = data['project_id']
         assignee_id = data.get('assignee_id')
         due_date = data.get('due_date')
-        priority = data.get('priority', 'medium')
-        
-        try:
-            priority = TaskPriority(priority)
-        except ValueError:
-            return jsonify({
-                'success': False,
-                'message': 'Priority không hợp lệ'
-            }), 400
-        
-        if due_date:
-            try:
-                due_date = datetime.fromisoformat(due_date)
-            except:
-                return jsonify({
-                    'success': False,
-                    'message': 'Format ngày không hợp lệ'
-                }), 400
+        priority = data['priority']
         
         db = SessionLocal()
         try:
@@ -53,6 +38,18 @@ class TaskController:
                     'message': 'Dự án không tồn tại'
                 }), 404
             
+            if not permission_index.allows(current_user['user_id'], project.id, Permission.WRITE, db):
+                return jsonify({
+                    'success': False,
+                    'message': 'Bạn không có quyền tạo task trong dự án này'
+                }), 403
+            
+            if assignee_id and not permission_index.allows(assignee_id, project.id, Permission.READ, db):
+                return jsonify({
+                    'success': False,
+                    'message': 'Người được giao không phải thành viên dự án'
+                }), 400
+            
             success, message, task = TaskService.create_task(
                 db, title, description, project_id,
                 current_user['user_id'], assignee_id, priority, due_date
@@ -91,6 +88,12 @@ class TaskController:
                     'message': 'Task không tồn tại'
                 }), 404
             
+            if not permission_index.allows(current_user['user_id'], task.project_id, Permission.READ, db):
+                return jsonify({
+                    'success': False,
+                    'message': 'Bạn không có quyền truy cập dự án này'
+                }), 403
+            
             return jsonify({
                 'success': True,
                 'data': TaskService.task_to_dict(task)
@@ -105,8 +108,53 @@ class TaskController:
         finally:
             db.close()
     
+    @staticmethod
+    def get_tasks_by_ids(current_user):
+        projection, unknown = TASK_ROW.from_query(request.args.get('fields'))
+        if unknown:
+            return jsonify({
+                'success': False,
+                'message': f"Trường không hợp lệ: {', '.join(unknown)}"
+            }), 400
+        
+        ids, error = parse_ids(request.args.get('ids'))
+        if error:
+            return jsonify({
+                'success': False,
+                'message': error
+            }), 400
+        
+        db = SessionLocal()
+        try:
+            tasks, missing = TaskService.get_task_rows_by_ids(
+                db, current_user['user_id'], ids, projection
+            )
+            
+            return respond({
+                'success': True,
+                'data': tasks,
+                'count': len(tasks),
+                'missing': missing
+            }), 200
+            
+        except Exception as e:
+            return jsonify({
+                'success': False,
+                'message': 'Đã xảy ra lỗi',
+                'error': str(e)
+            }), 500
+        finally:
+            db.close()
+    
     @staticmethod
     def get_tasks_by_project(current_user, project_id):
+        projection, unknown = TASK_ROW.from_query(request.args.get('fields'))
+        if unknown:
+            return jsonify({
+                'success': False,
+                'message': f"Trường không hợp lệ: {', '.join(unknown)}"
+            }), 400
+        
         db = SessionLocal()
         try:
             skip = int(request.args.get('skip', 0))
@@ -119,11 +167,17 @@ class TaskController:
                     'message': 'Dự án không tồn tại'
                 }), 404
             
-            tasks = TaskService.get_tasks_by_project(db, project_id, skip, limit)
+            if not permission_index.allows(current_user['user_id'], project.id, Permission.READ, db):
+                return jsonify({
+                    'success': False,
+                    'message': 'Bạn không có quyền truy cập dự án này'
+                }), 403
+            
+            tasks = TaskService.get_task_rows_by_project(db, project_id, skip, limit, projection)
             
-            return jsonify({
+            return respond({
                 'success': True,
-                'data': [TaskService.task_to_dict(t) for t in tasks],
+                'data': tasks,
                 'count': len(tasks)
             }), 200
             
@@ -138,18 +192,25 @@ class TaskController:
     
     @staticmethod
     def get_my_tasks(current_user):
+        projection, unknown = TASK_ROW.from_query(request.args.get('fields'))
+        if unknown:
+            return jsonify({
+                'success': False,
+                'message': f"Trường không hợp lệ: {', '.join(unknown)}"
+            }), 400
+        
         db = SessionLocal()
         try:
             skip = int(request.args.get('skip', 0))
             limit = int(request.args.get('limit', 100))
             
-            tasks = TaskService.get_tasks_by_assignee(
-                db, current_user['user_id'], skip, limit
+            tasks = TaskService.get_task_rows_by_assignee(
+                db, current_user['user_id'], skip, limit, projection
             )
             
-            return jsonify({
+            return respond({
                 'success': True,
-                'data': [TaskService.task_to_dict(t) for t in tasks],
+                'data': tasks,
                 'count': len(tasks)
             }), 200
             
@@ -164,13 +225,12 @@ class TaskController:
     
     @staticmethod
     def update_task(current_user, task_id):
-        data = request.get_json()
-        
-        is_valid, message = validate_task_update(data)
-        if not is_valid:
+        data, errors = TASK_UPDATE_SCHEMA.load()
+        if errors:
             return jsonify({
                 'success': False,
-                'message': message
+                'message': next(iter(errors.values())),
+                'errors': errors
             }), 400
         
         db = SessionLocal()
@@ -182,38 +242,21 @@ class TaskController:
                     'message': 'Task không tồn tại'
                 }), 404
             
-            if str(task.creator_id) != current_user['user_id']:
+            if not permission_index.allows(current_user['user_id'], task.project_id, Permission.WRITE, db):
                 return jsonify({
                     'success': False,
                     'message': 'Bạn không có quyền sửa task này'
                 }), 403
             
-            update_data = {}
-            if 'title' in data:
-                update_data['title'] = data['title'].strip()
-            if 'description' in data:
-                update_data['description'] = data['description'].strip()
-            if 'status' in data:
-                try:
-                    update_data['status'] = TaskStatus(data['status'])
-                except ValueError:
-                    return jsonify({
-                        'success': False,
-                        'message': 'Trạng thái không hợp lệ'
-                    }), 400
-            if 'priority' in data:
-                try:
-                    update_data['priority'] = TaskPriority(data['priority'])
-                except ValueError:
-                    return jsonify({
-                        'success': False,
-                        'message': 'Priority không hợp lệ'
-                    }), 400
-            if 'assignee_id' in data:
-                update_data['assignee_id'] = data['assignee_id']
+            assignee_id = data.get('assignee_id')
+            if assignee_id and not permission_index.allows(assignee_id, task.project_id, Permission.READ, db):
+                return jsonify({
+                    'success': False,
+                    'message': 'Người được giao không phải thành viên dự án'
+                }), 400
             
             success, message, updated_task = TaskService.update_task(
-                db, task_id, **update_data
+                db, task_id, actor_id=current_user['user_id'], **data
             )
             
             if not success:
@@ -248,7 +291,11 @@ class TaskController:
                     'message': 'Task không tồn tại'
                 }), 404
             
-            if str(task.creator_id) != current_user['user_id']:
+            # The creator can delete their own task; managers any task.
+            permissions = permission_index.mask(current_user['user_id'], task.project_id, db)
+            is_creator = str(task.creator_id) == current_user['user_id']
+            if not (Permission.MANAGE in permissions or
+                    (is_creator and Permission.WRITE in permissions)):
                 return jsonify({
                     'success': False,
                     'message': 'Bạn không có quyền xóa task này'
@@ -1,6 +1,9 @@
 """
 Middlewares package
 """
-from .auth_middleware import token_required
+from .auth_middleware import token_required, stream_token_required
+from .metrics_middleware import init_metrics
+from .sql_profiler_middleware import init_sql_profiler
+from .compression_middleware import init_compression, compression, disable_compression
 
-__all__ = ['token_required']
+__all__ = ['token_required', 'stream_token_required', 'init_metrics', 'init_sql_profiler', 'init_compression', 'compression', 'disable_compression']
@@ -1,47 +1,131 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
 from functools import wraps
 from flask import request, jsonify
 import jwt
 import os
 
+from apps.utils.revocation import revocation_cache
+
 SECRET_KEY = os.getenv('JWT_SECRET_KEY', 'your-secret-key-change-this-in-production')
 JWT_ALGORITHM = 'HS256'
 
+# Set while /api/batch runs its sub-requests, which are authenticated once
+# by the outer request and carry no token of their own.
+_shared_identity: ContextVar = ContextVar('shared_identity', default=None)
+
+
+@contextmanager
+def shared_identity(payload: dict):
+    token = _shared_identity.set(payload)
+    try:
+        yield
+    finally:
+        _shared_identity.reset(token)
+
+
+def authenticate(auth_header: str | None, check_revoked: bool = True):
+    """Decode a ``Bearer <token>`` header.
+
+    Returns ``(payload, None)`` or ``(None, message)``; shared by the Flask
+    decorator and the async read routes.
+    """
+    token = None
+    
+    if auth_header:
+        try:
+            token = auth_header.split(' ')[1]
+        except IndexError:
+            return None, 'Token format không hợp lệ. Sử dụng: Bearer <token>'
+    
+    if not token:
+        return None, 'Token không được cung cấp'
+    
+    try:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[JWT_ALGORITHM])
+    except jwt.ExpiredSignatureError:
+        return None, 'Token đã hết hạn'
+    except jwt.InvalidTokenError:
+        return None, 'Token không hợp lệ'
+    
+    # Reset and stream tokens are signed with the same key but only valid
+    # where they are issued for.
+    if payload.get('type'):
+        return None, 'Token không hợp lệ'
+    
+    if check_revoked and revocation_cache.is_revoked(payload.get('jti')):
+        return None, 'Token đã bị thu hồi'
+    
+    return payload, None
+
+
+def authenticate_stream(token: str, project_id, check_revoked: bool = True):
+    """Decode a ``?stream_token=`` issued for ``project_id``'s event stream.
+
+    Returns ``(payload, None)`` or ``(None, message)`` like ``authenticate``;
+    the payload's ``jti`` is that of the login token it was issued under.
+    """
+    try:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[JWT_ALGORITHM])
+    except jwt.ExpiredSignatureError:
+        return None, 'Token đã hết hạn'
+    except jwt.InvalidTokenError:
+        return None, 'Token không hợp lệ'
+    
+    if payload.get('type') != 'project_events' or payload.get('project_id') != str(project_id):
+        return None, 'Token không hợp lệ'
+    
+    current_user = {
+        'user_id': payload['user_id'],
+        'username': payload.get('username'),
+        'jti': payload.get('sid')
+    }
+    if check_revoked and revocation_cache.is_revoked(current_user['jti']):
+        return None, 'Token đã bị thu hồi'
+    
+    return current_user, None
+
 
 def token_required(f):
     @wraps(f)
     def decorated(*args, **kwargs):
-        token = None
-        
-        if 'Authorization' in request.headers:
-            auth_header = request.headers['Authorization']
-            try:
-                token = auth_header.split(' ')[1]
-            except IndexError:
-                return jsonify({
-                    'success': False,
-                    'message': 'Token format không hợp lệ. Sử dụng: Bearer <token>'
-                }), 401
-        
-        if not token:
+        current_user = _shared_identity.get()
+        if current_user is None:
+            current_user, message = authenticate(request.headers.get('Authorization'))
+        if current_user is None:
             return jsonify({
                 'success': False,
-                'message': 'Token không được cung cấp'
+                'message': message
             }), 401
         
-        try:
-            payload = jwt.decode(token, SECRET_KEY, algorithms=[JWT_ALGORITHM])
-            current_user = payload
-        except jwt.ExpiredSignatureError:
-            return jsonify({
-                'success': False,
-                'message': 'Token đã hết hạn'
-            }), 401
-        except jwt.InvalidTokenError:
+        return f(current_user, *args, **kwargs)
+    
+    return decorated
+
+
+def stream_token_required(f):
+    """``token_required`` that also takes ``?stream_token=``, since the
+    browser's EventSource cannot set an Authorization header.
+
+    The login token never goes in the URL: clients get a short-lived token
+    for the one project from ``POST /api/projects/<id>/events/token``.
+    """
+    @wraps(f)
+    def decorated(*args, **kwargs):
+        auth_header = request.headers.get('Authorization')
+        if not auth_header and request.args.get('stream_token'):
+            current_user, message = authenticate_stream(
+                request.args['stream_token'], kwargs.get('project_id')
+            )
+        else:
+            current_user, message = authenticate(auth_header)
+        if current_user is None:
             return jsonify({
                 'success': False,
-                'message': 'Token không hợp lệ'
+                'message': message
             }), 401
         
         return f(current_user, *args, **kwargs)
     
+    decorated.stream_token = True
     return decorated
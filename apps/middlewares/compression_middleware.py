@@ -0,0 +1,67 @@
+from flask import current_app, g, request
+from werkzeug.wsgi import ClosingIterator
+
+from apps.utils.compression import (
+    CompressionPolicy, DEFAULT_POLICY, negotiate, compressible, compress, compress_stream,
+)
+
+
+def compression(enabled: bool = True, min_size: int = None,
+                gzip_level: int = None, brotli_level: int = None):
+    """Per-route compression settings; unset values keep the defaults.
+
+    Put it between ``@router.route`` and ``@token_required``.
+    """
+    policy = CompressionPolicy(
+        enabled,
+        DEFAULT_POLICY.min_size if min_size is None else min_size,
+        DEFAULT_POLICY.gzip_level if gzip_level is None else gzip_level,
+        DEFAULT_POLICY.brotli_level if brotli_level is None else brotli_level,
+    )
+
+    def decorator(view):
+        view.compression_policy = policy
+        return view
+    return decorator
+
+
+def disable_compression() -> None:
+    """Send this request's response uncompressed, whatever its route says;
+    for bodies that embed another route's output."""
+    g.compression_disabled = True
+
+
+def init_compression(app):
+    """gzip/brotli-encode responses the client accepts, above a size threshold."""
+
+    @app.after_request
+    def _compress_response(response):
+        if not compressible(response.mimetype):
+            return response
+        response.vary.add('Accept-Encoding')
+
+        if (request.method == 'HEAD' or response.status_code < 200
+                or response.status_code in (204, 206, 304)
+                or 'Content-Encoding' in response.headers):
+            return response
+
+        view = current_app.view_functions.get(request.endpoint)
+        policy = getattr(view, 'compression_policy', DEFAULT_POLICY)
+        if not policy.enabled or g.get('compression_disabled'):
+            return response
+        encoding = negotiate(request.headers.get('Accept-Encoding'))
+        if encoding is None:
+            return response
+
+        if response.is_streamed:
+            original = response.response
+            chunks = compress_stream(response.iter_encoded(), encoding, policy)
+            response.response = ClosingIterator(chunks, getattr(original, 'close', None))
+            response.headers.pop('Content-Length', None)
+        else:
+            data = response.get_data()
+            if len(data) < policy.min_size:
+                return response
+            response.set_data(compress(data, encoding, policy))
+        response.headers['Content-Encoding'] = encoding
+        return response
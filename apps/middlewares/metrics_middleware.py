@@ -0,0 +1,17 @@
+from flask import request
+
+from apps.utils import metrics
+
+
+def init_metrics(app):
+    """Record latency, status and DB usage for every request."""
+
+    @app.before_request
+    def _begin_request_metrics():
+        metrics.begin_request()
+
+    @app.after_request
+    def _end_request_metrics(response):
+        route = request.url_rule.rule if request.url_rule else 'unmatched'
+        metrics.end_request(request.method, route, response.status_code)
+        return response
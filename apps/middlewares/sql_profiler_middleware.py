@@ -0,0 +1,16 @@
+from flask import request
+
+from apps.utils.sql_profiler import profiler
+
+
+def init_sql_profiler(app):
+    """Track SQL shapes per request so repeated queries (N+1) get reported."""
+
+    @app.before_request
+    def _begin_sql_profile():
+        profiler.begin_request()
+
+    @app.teardown_request
+    def _end_sql_profile(exc=None):
+        route = request.url_rule.rule if request.url_rule else request.path
+        profiler.end_request(f"{request.method} {route}")
@@ -5,6 +5,12 @@ from .user import User
 from .project import Project, ProjectStatus
 from .task import Task, TaskStatus, TaskPriority
 from .comment import Comment
+from .revoked_token import RevokedToken
+from .email_outbox import EmailOutbox, EmailStatus
+from .notification import Notification, NotificationType
+from .tombstone import Tombstone
+from .job import Job, JobStatus
+from .project_member import ProjectMember, ProjectRole, Permission, ROLE_PERMISSIONS
 
 __all__ = [
     'User',
@@ -13,5 +19,17 @@ __all__ = [
     'Task',
     'TaskStatus',
     'TaskPriority',
-    'Comment'
+    'Comment',
+    'RevokedToken',
+    'EmailOutbox',
+    'EmailStatus',
+    'Notification',
+    'NotificationType',
+    'Tombstone',
+    'Job',
+    'JobStatus',
+    'ProjectMember',
+    'ProjectRole',
+    'Permission',
+    'ROLE_PERMISSIONS'
 ]
@@ -1,5 +1,5 @@
-from sqlalchemy import Column, Text, DateTime, ForeignKey
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, Text, DateTime, ForeignKey, BigInteger
+from apps.utils.types import UUID
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import uuid
@@ -11,10 +11,13 @@ class Comment(Base):
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
     content = Column(Text, nullable=False)
-    task_id = Column(UUID(as_uuid=True), ForeignKey("tasks.id"), nullable=False)
+    task_id = Column(UUID(as_uuid=True), ForeignKey("tasks.id", ondelete="CASCADE"), nullable=False, index=True)
     author_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Set on every insert/update by apps.services.sync_service; /api/sync
+    # returns rows past the client's cursor.
+    change_seq = Column(BigInteger, nullable=False, default=0, server_default='0', index=True)
     
     task = relationship("Task", back_populates="comments")
     author = relationship("User", back_populates="comments")
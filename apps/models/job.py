@@ -0,0 +1,60 @@
+from sqlalchemy import Column, String, Text, DateTime, Integer, Enum, JSON, ForeignKey, Index, text
+from apps.utils.types import UUID
+from datetime import datetime
+import uuid
+import enum
+from apps.utils.db import Base
+
+
+class JobStatus(enum.Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class Job(Base):
+    __tablename__ = "jobs"
+    __table_args__ = (
+        # The claim query: runnable jobs, most urgent first.
+        Index(
+            "ix_jobs_claim",
+            "priority", "run_at",
+            postgresql_where=text("status IN ('QUEUED', 'RUNNING')")
+        ),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    type = Column(String(100), nullable=False)
+    payload = Column(JSON, nullable=False, default=dict)
+    status = Column(Enum(JobStatus), default=JobStatus.QUEUED, nullable=False)
+    # Lower runs first.
+    priority = Column(Integer, default=100, nullable=False)
+    attempts = Column(Integer, default=0, nullable=False)
+    max_attempts = Column(Integer, default=5, nullable=False)
+    run_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    locked_at = Column(DateTime)
+    locked_by = Column(String(100))
+    last_error = Column(Text)
+    result = Column(JSON)
+    created_by = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="SET NULL"))
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    finished_at = Column(DateTime)
+
+    def __repr__(self):
+        return f"<Job {self.type} {self.status}>"
+
+    def to_dict(self):
+        return {
+            'id': str(self.id),
+            'type': self.type,
+            'status': self.status.value if self.status else None,
+            'priority': self.priority,
+            'attempts': self.attempts,
+            'max_attempts': self.max_attempts,
+            'run_at': self.run_at.isoformat() if self.run_at else None,
+            'last_error': self.last_error,
+            'result': self.result,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None
+        }
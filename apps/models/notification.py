@@ -0,0 +1,34 @@
+from sqlalchemy import Column, String, DateTime, ForeignKey, Enum, Index, text
+from apps.utils.types import UUID
+from datetime import datetime
+import uuid
+import enum
+from apps.utils.db import Base
+
+
+class NotificationType(enum.Enum):
+    TASK_ASSIGNED = "task_assigned"
+    COMMENT_CREATED = "comment_created"
+
+
+class Notification(Base):
+    __tablename__ = "notifications"
+    __table_args__ = (
+        Index(
+            "ix_notifications_pending",
+            "recipient_id", "created_at",
+            postgresql_where=text("digested_at IS NULL")
+        ),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    type = Column(Enum(NotificationType), nullable=False)
+    recipient_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    actor_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="SET NULL"))
+    task_id = Column(UUID(as_uuid=True), ForeignKey("tasks.id", ondelete="CASCADE"), nullable=False, index=True)
+    excerpt = Column(String(200))
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    digested_at = Column(DateTime)
+
+    def __repr__(self):
+        return f"<Notification {self.type} for {self.recipient_id}>"
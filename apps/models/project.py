@@ -1,5 +1,5 @@
-from sqlalchemy import Column, String, Text, DateTime, ForeignKey, Enum
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, Text, DateTime, ForeignKey, Enum, BigInteger, Index, text
+from apps.utils.types import UUID
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import uuid
@@ -17,6 +17,10 @@ class ProjectStatus(enum.Enum):
 
 class Project(Base):
     __tablename__ = "projects"
+    __table_args__ = (
+        # Soft-deleted projects waiting for the purge worker.
+        Index("ix_projects_deleted_at", "deleted_at", postgresql_where=text("deleted_at IS NOT NULL")),
+    )
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
     name = Column(String(200), nullable=False)
@@ -27,9 +31,17 @@ class Project(Base):
     end_date = Column(DateTime)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Set on every insert/update by apps.services.sync_service; /api/sync
+    # returns rows past the client's cursor.
+    change_seq = Column(BigInteger, nullable=False, default=0, server_default='0', index=True)
+    # Set by ProjectService.delete_project; the rows are removed later, in
+    # batches, by the purge worker.
+    deleted_at = Column(DateTime)
     
     owner = relationship("User", back_populates="owned_projects", foreign_keys=[owner_id])
-    tasks = relationship("Task", back_populates="project", cascade="all, delete-orphan")
+    # Deleting is left to ON DELETE CASCADE instead of loading every task.
+    tasks = relationship("Task", back_populates="project", cascade="all, delete-orphan",
+                         passive_deletes=True)
 
     def __repr__(self):
         return f"<Project {self.name}>"
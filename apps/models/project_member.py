@@ -0,0 +1,59 @@
+from sqlalchemy import Column, DateTime, ForeignKey, Enum
+from apps.utils.types import UUID
+from sqlalchemy.orm import relationship
+from datetime import datetime
+import enum
+from apps.utils.db import Base
+
+
+class ProjectRole(enum.Enum):
+    OWNER = "owner"
+    ADMIN = "admin"
+    MEMBER = "member"
+    VIEWER = "viewer"
+
+
+class Permission(enum.IntFlag):
+    READ = 1
+    WRITE = 2
+    MANAGE = 4
+    DELETE = 8
+
+
+# Each role's mask includes every lower role's, so a larger mask always
+# outranks a smaller one.
+ROLE_PERMISSIONS = {
+    ProjectRole.VIEWER: Permission.READ,
+    ProjectRole.MEMBER: Permission.READ | Permission.WRITE,
+    ProjectRole.ADMIN: Permission.READ | Permission.WRITE | Permission.MANAGE,
+    ProjectRole.OWNER: Permission.READ | Permission.WRITE | Permission.MANAGE | Permission.DELETE,
+}
+
+
+class ProjectMember(Base):
+    __tablename__ = "project_members"
+
+    project_id = Column(UUID(as_uuid=True), ForeignKey("projects.id", ondelete="CASCADE"),
+                        primary_key=True)
+    # The permission index loads one user's rows at a time.
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"),
+                     primary_key=True, index=True)
+    role = Column(Enum(ProjectRole), nullable=False, default=ProjectRole.MEMBER)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    user = relationship("User")
+
+    def __repr__(self):
+        return f"<ProjectMember {self.user_id} {self.role.value} in {self.project_id}>"
+
+    @property
+    def permissions(self) -> Permission:
+        return ROLE_PERMISSIONS[self.role]
+
+    def to_dict(self):
+        return {
+            'project_id': str(self.project_id),
+            'user_id': str(self.user_id),
+            'role': self.role.value,
+            'created_at': self.created_at.isoformat() if self.created_at else None
+        }
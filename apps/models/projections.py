@@ -0,0 +1,111 @@
+"""
+Column projections matching each model's ``to_dict`` key for key.
+
+List endpoints select these columns as plain tuples instead of loading
+mapped objects; see ``apps.utils.serialization.Projection``. Deferred
+columns are large text left out of list responses unless named in
+``?fields=``. Comment content stays in by default: a thread without it
+renders nothing.
+"""
+from apps.models.user import User
+from apps.models.project import Project
+from apps.models.task import Task, TaskStatus
+from apps.models.comment import Comment
+from apps.models.project_member import ProjectMember
+from apps.utils.serialization import Projection
+from sqlalchemy import func, select
+
+# AuthService.user_to_dict
+USER_ROW = Projection({
+    'id': User.id,
+    'username': User.username,
+    'email': User.email,
+    'full_name': User.full_name,
+    'is_active': User.is_active,
+    'created_at': User.created_at,
+    'updated_at': User.updated_at,
+})
+
+TASK_ROW = Projection({
+    'id': Task.id,
+    'title': Task.title,
+    'description': Task.description,
+    'status': Task.status,
+    'priority': Task.priority,
+    'project_id': Task.project_id,
+    'assignee_id': Task.assignee_id,
+    'creator_id': Task.creator_id,
+    'due_date': Task.due_date,
+    'position': Task.position,
+    'created_at': Task.created_at,
+    'updated_at': Task.updated_at,
+}, deferred=('description',))
+
+PROJECT_ROW = Projection({
+    'id': Project.id,
+    'name': Project.name,
+    'description': Project.description,
+    'status': Project.status,
+    'owner_id': Project.owner_id,
+    'start_date': Project.start_date,
+    'end_date': Project.end_date,
+    'created_at': Project.created_at,
+    'updated_at': Project.updated_at,
+}, deferred=('description',))
+
+COMMENT_FIELDS = {
+    'id': Comment.id,
+    'content': Comment.content,
+    'task_id': Comment.task_id,
+    'author_id': Comment.author_id,
+    'created_at': Comment.created_at,
+    'updated_at': Comment.updated_at,
+}
+
+COMMENT_ROW = Projection(COMMENT_FIELDS)
+
+# CommentService.comment_to_dict(comment, include_author=True); the caller
+# joins User on Comment.author_id.
+COMMENT_WITH_AUTHOR_ROW = Projection(COMMENT_FIELDS, nested={
+    'author': Projection({
+        'id': User.id,
+        'username': User.username,
+        'full_name': User.full_name,
+    }),
+})
+
+
+def _count(*criteria):
+    # Correlated per project row; each is an index-only count.
+    return select(func.count()).where(*criteria).correlate(Project).scalar_subquery()
+
+
+# /api/me/overview: owned projects with their counts.
+PROJECT_SUMMARY_ROW = Projection(dict(
+    PROJECT_ROW.fields,
+    task_count=_count(Task.project_id == Project.id),
+    open_task_count=_count(Task.project_id == Project.id, Task.status != TaskStatus.DONE),
+    member_count=_count(ProjectMember.project_id == Project.id),
+), deferred=('description',))
+
+# /api/me/overview: recent comments with their author and task; the
+# caller joins User on the author and Task on the task.
+COMMENT_ACTIVITY_ROW = Projection(COMMENT_FIELDS, nested={
+    'author': COMMENT_WITH_AUTHOR_ROW.nested['author'],
+    'task': Projection({
+        'id': Task.id,
+        'title': Task.title,
+        'project_id': Task.project_id,
+    }),
+})
+
+
+__all__ = [
+    'USER_ROW',
+    'TASK_ROW',
+    'PROJECT_ROW',
+    'COMMENT_ROW',
+    'COMMENT_WITH_AUTHOR_ROW',
+    'PROJECT_SUMMARY_ROW',
+    'COMMENT_ACTIVITY_ROW',
+]
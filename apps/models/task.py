@@ -1,5 +1,5 @@
-from sqlalchemy import Column, String, Text, DateTime, ForeignKey, Enum
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, Text, DateTime, ForeignKey, Enum, Float, Index, BigInteger
+from apps.utils.types import UUID
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import uuid
@@ -23,18 +23,29 @@ class TaskPriority(enum.Enum):
 
 class Task(Base):
     __tablename__ = "tasks"
+    __table_args__ = (
+        # Board columns: one range scan per (project, status), already in order.
+        Index("ix_tasks_project_status_position", "project_id", "status", "position"),
+        Index("ix_tasks_project_change_seq", "project_id", "change_seq"),
+    )
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
     title = Column(String(200), nullable=False)
     description = Column(Text)
     status = Column(Enum(TaskStatus), default=TaskStatus.TODO)
     priority = Column(Enum(TaskPriority), default=TaskPriority.MEDIUM)
-    project_id = Column(UUID(as_uuid=True), ForeignKey("projects.id"), nullable=False)
+    project_id = Column(UUID(as_uuid=True), ForeignKey("projects.id", ondelete="CASCADE"), nullable=False)
     assignee_id = Column(UUID(as_uuid=True), ForeignKey("users.id"))
     creator_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
     due_date = Column(DateTime)
+    # Order within the board column; fractional so a card can be dropped
+    # between two others without renumbering.
+    position = Column(Float, nullable=False, default=0, server_default='0')
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Set on every insert/update by apps.services.sync_service; /api/sync
+    # returns rows past the client's cursor.
+    change_seq = Column(BigInteger, nullable=False, default=0, server_default='0')
     
     project = relationship("Project", back_populates="tasks")
     assignee = relationship(
@@ -47,7 +58,8 @@ class Task(Base):
         back_populates="created_tasks", 
         foreign_keys=[creator_id]
     )
-    comments = relationship("Comment", back_populates="task", cascade="all, delete-orphan")
+    comments = relationship("Comment", back_populates="task", cascade="all, delete-orphan",
+                            passive_deletes=True)
 
     def __repr__(self):
         return f"<Task {self.title}>"
@@ -63,6 +75,7 @@ class Task(Base):
             'assignee_id': str(self.assignee_id) if self.assignee_id else None,
             'creator_id': str(self.creator_id),
             'due_date': self.due_date.isoformat() if self.due_date else None,
+            'position': self.position,
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
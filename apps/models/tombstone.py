@@ -0,0 +1,39 @@
+from sqlalchemy import Column, String, DateTime, BigInteger, Index
+from apps.utils.types import UUID
+from datetime import datetime
+import uuid
+from apps.utils.db import Base
+
+
+class Tombstone(Base):
+    """A deleted project, task or comment, for /api/sync.
+
+    No foreign keys: the rows it points at are gone. Tombstones are sent to
+    users who can still see ``project_id``, and to ``user_id``: someone
+    who saw the row only through it, e.g. the assignee of a deleted task,
+    each member of a deleted project or a member removed from a project.
+    Project tombstones go only to their ``user_id``.
+    """
+    __tablename__ = "tombstones"
+    __table_args__ = (
+        Index("ix_tombstones_project_change_seq", "project_id", "change_seq"),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    entity_type = Column(String(20), nullable=False)
+    entity_id = Column(UUID(as_uuid=True), nullable=False)
+    project_id = Column(UUID(as_uuid=True), nullable=False)
+    user_id = Column(UUID(as_uuid=True), index=True)
+    change_seq = Column(BigInteger, nullable=False, index=True)
+    deleted_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<Tombstone {self.entity_type} {self.entity_id}>"
+
+    def to_dict(self):
+        return {
+            'type': self.entity_type,
+            'id': str(self.entity_id),
+            'project_id': str(self.project_id),
+            'deleted_at': self.deleted_at.isoformat() if self.deleted_at else None
+        }
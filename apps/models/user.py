@@ -1,5 +1,5 @@
 from sqlalchemy import Column, String, DateTime, Boolean
-from sqlalchemy.dialects.postgresql import UUID
+from apps.utils.types import UUID
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import uuid
@@ -0,0 +1,183 @@
+import asyncio
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qsl
+
+from apps.controllers.async_read_controller import AsyncReadController
+from apps.middlewares.auth_middleware import authenticate, authenticate_stream
+from apps.utils import metrics
+from apps.utils.compression import DEFAULT_POLICY, negotiate, compress
+from apps.utils.async_db import dispose_async_engine
+from apps.utils.events import SSE_HEADERS
+from apps.utils.revocation import revocation_cache
+from apps.utils.serialization import negotiate_header, encode_body
+from apps.utils.wsgi_to_asgi import WsgiToAsgi
+
+# Threads serving the Flask fallback; the async routes do not use them.
+ASGI_SYNC_THREADS = int(os.getenv('ASGI_SYNC_THREADS', 16))
+
+# (method, Flask rule, handler). Static segments come before <task_id> the
+# same way Werkzeug orders them.
+ASYNC_ROUTES = (
+    ('GET', '/api/tasks/my-tasks', AsyncReadController.get_my_tasks),
+    ('GET', '/api/tasks/project/<project_id>', AsyncReadController.get_tasks_by_project),
+    ('GET', '/api/tasks/<task_id>', AsyncReadController.get_task),
+    ('GET', '/api/comments/task/<task_id>', AsyncReadController.get_comments_by_task),
+    # Held open on the event loop rather than a gthread worker thread.
+    ('GET', '/api/projects/<project_id>/events', AsyncReadController.get_project_events),
+)
+
+
+def _compile(rule: str):
+    return re.compile('^' + re.sub(r'<(\w+)>', r'(?P<\1>[^/]+)', rule) + '$')
+
+
+class AsyncRouter:
+    """ASGI app serving the hot read endpoints on the asyncio engine.
+
+    Every other request is handed to the Flask app unchanged.
+    """
+
+    def __init__(self, flask_app, routes=ASYNC_ROUTES):
+        self.flask_app = flask_app
+        self.fallback = WsgiToAsgi(flask_app)
+        self.routes = [
+            (method, rule, _compile(rule), handler, self._view(method, rule))
+            for method, rule, handler in routes
+        ]
+
+    def _view(self, method, rule):
+        # The Flask view for this rule carries its @compression policy and
+        # whether it accepts ?stream_token=.
+        for url_rule in self.flask_app.url_map.iter_rules():
+            if url_rule.rule == rule and method in url_rule.methods:
+                return self.flask_app.view_functions[url_rule.endpoint]
+        return None
+
+    def _compression_policy(self, view):
+        if not self.flask_app.config.get('COMPRESS_ENABLED'):
+            return None
+        return getattr(view, 'compression_policy', DEFAULT_POLICY)
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            return await self._lifespan(receive, send)
+
+        if scope['type'] == 'http':
+            for method, rule, pattern, handler, view in self.routes:
+                if scope['method'] != method:
+                    continue
+                match = pattern.match(scope['path'])
+                if match:
+                    return await self._dispatch(scope, receive, send, rule, handler, view,
+                                                match.groupdict())
+
+        return await self.fallback(scope, receive, send)
+
+    async def _dispatch(self, scope, receive, send, rule, handler, view, path_args):
+        start = time.perf_counter()
+        headers = dict(scope['headers'])
+        args = dict(parse_qsl(scope.get('query_string', b'').decode('latin-1')))
+        auth_header = headers.get(b'authorization')
+        auth_header = auth_header.decode('latin-1') if auth_header else None
+        if not auth_header and args.get('stream_token') and getattr(view, 'stream_token', False):
+            current_user, message = authenticate_stream(
+                args['stream_token'], path_args.get('project_id'), check_revoked=False
+            )
+        else:
+            current_user, message = authenticate(auth_header, check_revoked=False)
+        if current_user is not None:
+            if revocation_cache.sync_due():
+                await asyncio.to_thread(revocation_cache.maybe_sync)
+            if revocation_cache.is_revoked(current_user.get('jti'), sync=False):
+                current_user, message = None, 'Token đã bị thu hồi'
+
+        if current_user is None:
+            body, status = {'success': False, 'message': message}, 401
+        else:
+            last_event_id = headers.get(b'last-event-id')
+            if last_event_id:
+                args.setdefault('last_event_id', last_event_id.decode('latin-1'))
+            body, status = await handler(current_user, args, **path_args)
+
+        labels = (scope['method'], rule)
+        if hasattr(body, '__aiter__'):
+            metrics.http_requests_total.inc((scope['method'], rule, str(status)))
+            return await self._stream(receive, send, body)
+
+        policy = self._compression_policy(view)
+
+        # Same negotiation, and for JSON the same bytes, as flask.jsonify.
+        accept = headers.get(b'accept')
+        mimetype = negotiate_header(accept.decode('latin-1') if accept else None)
+        payload = encode_body(body, mimetype)
+        vary = b'Accept' if policy is None else b'Accept, Accept-Encoding'
+        response_headers = [(b'content-type', mimetype.encode()), (b'vary', vary)]
+        if policy is not None:
+            encoding = None
+            if policy.enabled and len(payload) >= policy.min_size:
+                accept_encoding = headers.get(b'accept-encoding')
+                encoding = negotiate(accept_encoding.decode('latin-1') if accept_encoding else None)
+            if encoding is not None:
+                payload = compress(payload, encoding, policy)
+                response_headers.append((b'content-encoding', encoding.encode()))
+        response_headers.append((b'content-length', str(len(payload)).encode()))
+        await send({
+            'type': 'http.response.start',
+            'status': status,
+            'headers': response_headers,
+        })
+        await send({'type': 'http.response.body', 'body': payload})
+
+        metrics.http_request_duration_seconds.observe(time.perf_counter() - start, labels)
+        metrics.http_requests_total.inc((scope['method'], rule, str(status)))
+
+    async def _stream(self, receive, send, chunks):
+        """Send an SSE body until it ends or the client disconnects."""
+        await send({
+            'type': 'http.response.start',
+            'status': 200,
+            'headers': [(b'content-type', b'text/event-stream; charset=utf-8')] + [
+                (name.lower().encode(), value.encode()) for name, value in SSE_HEADERS.items()
+            ],
+        })
+
+        async def pump():
+            async for chunk in chunks:
+                await send({'type': 'http.response.body', 'body': chunk.encode(), 'more_body': True})
+            await send({'type': 'http.response.body', 'body': b''})
+
+        async def disconnected():
+            while (await receive())['type'] != 'http.disconnect':
+                pass
+
+        tasks = {asyncio.ensure_future(pump()), asyncio.ensure_future(disconnected())}
+        try:
+            await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await chunks.aclose()
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                asyncio.get_running_loop().set_default_executor(
+                    ThreadPoolExecutor(ASGI_SYNC_THREADS, thread_name_prefix='wsgi')
+                )
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await dispose_async_engine()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+
+def create_asgi_app(flask_app) -> AsyncRouter:
+    return AsyncRouter(flask_app)
+
+
+__all__ = ['AsyncRouter', 'ASYNC_ROUTES', 'create_asgi_app']
@@ -1,22 +1,21 @@
 from flask import Blueprint
-import sys
-from pathlib import Path
-
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
 from apps.controllers import AuthController
-from apps.middlewares import token_required
+from apps.middlewares import token_required, compression
 
 auth_router = Blueprint('auth', __name__, url_prefix='/api/auth')
 
 
 # Routes
+# Never compress bodies carrying tokens (BREACH); the batch endpoint follows
+# these marks for its sub-responses.
 @auth_router.route('/register', methods=['POST'])
+@compression(enabled=False)
 def register():
     return AuthController.register()
 
 
 @auth_router.route('/login', methods=['POST'])
+@compression(enabled=False)
 def login():
     return AuthController.login()
 
@@ -27,6 +26,14 @@ def get_user(current_user, user_id):
     return AuthController.get_current_user(current_user, user_id)
 
 
+# ?ids=a,b,c: assignee avatars for a whole screen in one call.
+@auth_router.route('/users', methods=['GET'])
+@compression(gzip_level=4, brotli_level=4)
+@token_required
+def get_users(current_user):
+    return AuthController.get_users_by_ids(current_user)
+
+
 @auth_router.route('/logout', methods=['POST'])
 @token_required
 def logout(current_user):
@@ -39,5 +46,6 @@ def request_reset_password():
 
 
 @auth_router.route('/reset-password', methods=['POST'])
+@compression(enabled=False)
 def reset_password():
     return AuthController.reset_password()
@@ -0,0 +1,14 @@
+from flask import Blueprint
+from apps.controllers.batch_controller import BatchController
+from apps.middlewares.auth_middleware import token_required
+from apps.middlewares.compression_middleware import compression
+
+batch_router = Blueprint('batch', __name__, url_prefix='/api/batch')
+
+
+# Sub-requests run in-process as the caller; they need no token of their own.
+@batch_router.route('', methods=['POST'])
+@compression(gzip_level=4, brotli_level=4)
+@token_required
+def execute(current_user):
+    return BatchController.execute(current_user)
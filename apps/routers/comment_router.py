@@ -4,6 +4,7 @@ Comment Routes
 from flask import Blueprint
 from apps.controllers.comment_controller import CommentController
 from apps.middlewares.auth_middleware import token_required
+from apps.middlewares.compression_middleware import compression
 
 comment_router = Blueprint('comment', __name__, url_prefix='/api/comments')
 
@@ -23,6 +24,7 @@ def get_comment(current_user, comment_id):
 
 
 @comment_router.route('/task/<task_id>', methods=['GET'])
+@compression(gzip_level=4, brotli_level=4)
 @token_required
 def get_comments_by_task(current_user, task_id):
     """Get all comments for a task with pagination"""
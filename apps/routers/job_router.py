@@ -0,0 +1,12 @@
+from flask import Blueprint
+from apps.controllers.job_controller import JobController
+from apps.middlewares.auth_middleware import token_required
+
+job_router = Blueprint('job', __name__, url_prefix='/api/jobs')
+
+
+@job_router.route('/<job_id>', methods=['GET'])
+@token_required
+def get_job(current_user, job_id):
+    """Status of a background job started by the current user"""
+    return JobController.get_job(current_user, job_id)
@@ -0,0 +1,14 @@
+from flask import Blueprint
+from apps.controllers.me_controller import MeController
+from apps.middlewares.auth_middleware import token_required
+from apps.middlewares.compression_middleware import compression
+
+me_router = Blueprint('me', __name__, url_prefix='/api/me')
+
+
+# Replaces my-tasks, my-projects and my-comments on the home screen.
+@me_router.route('/overview', methods=['GET'])
+@compression(gzip_level=4, brotli_level=4)
+@token_required
+def get_overview(current_user):
+    return MeController.get_overview(current_user)
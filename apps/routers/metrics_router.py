@@ -0,0 +1,59 @@
+import hmac
+import ipaddress
+
+from flask import Blueprint, Response, current_app, jsonify, request
+
+from apps.utils.db import engine
+from apps.utils.metrics import render_prometheus
+from apps.utils.sql_profiler import profiler
+
+metrics_router = Blueprint('metrics', __name__)
+
+
+def _is_internal(address: str | None) -> bool:
+    try:
+        ip = ipaddress.ip_address(address or '')
+    except ValueError:
+        return False
+    return ip.is_loopback or ip.is_private
+
+
+@metrics_router.before_request
+def require_scraper():
+    """Pool state, route timings and SQL shapes are for the scraper only.
+
+    With ``METRICS_TOKEN`` set it must come as ``Authorization: Bearer``;
+    without one, only direct requests from internal addresses get through
+    (a proxied request carries X-Forwarded-For and is refused).
+    """
+    token = current_app.config['METRICS_TOKEN']
+    if token:
+        expected = f'Bearer {token}'.encode()
+        if hmac.compare_digest(request.headers.get('Authorization', '').encode(), expected):
+            return None
+    elif _is_internal(request.remote_addr) and 'X-Forwarded-For' not in request.headers:
+        return None
+    return jsonify({
+        'success': False,
+        'message': 'Không có quyền truy cập'
+    }), 403
+
+
+@metrics_router.route('/metrics', methods=['GET'])
+def get_metrics():
+    """Prometheus text exposition format"""
+    return Response(render_prometheus(engine), mimetype='text/plain; version=0.0.4')
+
+
+
+@metrics_router.route('/metrics/sql', methods=['GET'])
+def get_sql_profile():
+    """Query shapes ordered by total time, with call counts and p50/p99"""
+    limit = request.args.get('limit', 50, type=int)
+    return jsonify({
+        'success': True,
+        'data': profiler.snapshot(limit)
+    }), 200
+
+
+__all__ = ['metrics_router']
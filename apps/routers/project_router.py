@@ -1,6 +1,8 @@
 from flask import Blueprint
 from apps.controllers.project_controller import ProjectController
-from apps.middlewares.auth_middleware import token_required
+from apps.middlewares.auth_middleware import token_required, stream_token_required
+from apps.middlewares.compression_middleware import compression
+from apps.utils.events import streaming
 
 project_router = Blueprint('project', __name__, url_prefix='/api/projects')
 
@@ -24,6 +26,30 @@ def get_project(current_user, project_id):
     return ProjectController.get_project(current_user, project_id)
 
 
+@project_router.route('/<project_id>/board', methods=['GET'])
+@compression(gzip_level=4, brotli_level=4)
+@token_required
+def get_board(current_user, project_id):
+    return ProjectController.get_board(current_user, project_id)
+
+
+# EventSource cannot send headers: fetch this first, then open
+# /events?stream_token=... (and fetch a new one to reconnect).
+@project_router.route('/<project_id>/events/token', methods=['POST'])
+@compression(enabled=False)
+@token_required
+def create_stream_token(current_user, project_id):
+    return ProjectController.create_stream_token(current_user, project_id)
+
+
+@project_router.route('/<project_id>/events', methods=['GET'])
+@streaming
+@stream_token_required
+def stream_events(current_user, project_id):
+    """Live task/comment changes as Server-Sent Events"""
+    return ProjectController.stream_events(current_user, project_id)
+
+
 @project_router.route('/my-projects', methods=['GET'])
 @token_required
 def get_my_projects(current_user):
@@ -40,3 +66,27 @@ def update_project(current_user, project_id):
 @token_required
 def delete_project(current_user, project_id):
     return ProjectController.delete_project(current_user, project_id)
+
+
+@project_router.route('/<project_id>/members', methods=['GET'])
+@token_required
+def get_members(current_user, project_id):
+    return ProjectController.get_members(current_user, project_id)
+
+
+@project_router.route('/<project_id>/members', methods=['POST'])
+@token_required
+def add_member(current_user, project_id):
+    return ProjectController.add_member(current_user, project_id)
+
+
+@project_router.route('/<project_id>/members/<user_id>', methods=['PUT'])
+@token_required
+def update_member(current_user, project_id, user_id):
+    return ProjectController.update_member(current_user, project_id, user_id)
+
+
+@project_router.route('/<project_id>/members/<user_id>', methods=['DELETE'])
+@token_required
+def remove_member(current_user, project_id, user_id):
+    return ProjectController.remove_member(current_user, project_id, user_id)
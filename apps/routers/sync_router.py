@@ -0,0 +1,14 @@
+from flask import Blueprint
+from apps.controllers.sync_controller import SyncController
+from apps.middlewares.auth_middleware import token_required
+from apps.middlewares.compression_middleware import compression
+
+sync_router = Blueprint('sync', __name__, url_prefix='/api/sync')
+
+
+@sync_router.route('', methods=['GET'])
+@compression(gzip_level=4, brotli_level=4)
+@token_required
+def get_changes(current_user):
+    """Delta since ``?since=<cursor>``; pass back ``data.cursor`` next time"""
+    return SyncController.get_changes(current_user)
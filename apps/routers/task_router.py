@@ -1,6 +1,7 @@
 from flask import Blueprint
 from apps.controllers.task_controller import TaskController
 from apps.middlewares.auth_middleware import token_required
+from apps.middlewares.compression_middleware import compression
 
 task_router = Blueprint('task', __name__, url_prefix='/api/tasks')
 
@@ -11,19 +12,30 @@ def create_task(current_user):
     return TaskController.create_task(current_user)
 
 
+# ?ids=a,b,c: linked tasks in one call instead of one GET each.
+@task_router.route('', methods=['GET'])
+@compression(gzip_level=4, brotli_level=4)
+@token_required
+def get_tasks_by_ids(current_user):
+    return TaskController.get_tasks_by_ids(current_user)
+
+
 @task_router.route('/<task_id>', methods=['GET'])
 @token_required
 def get_task(current_user, task_id):
     return TaskController.get_task(current_user, task_id)
 
 
+# Polled by every open board; trade a little ratio for CPU.
 @task_router.route('/my-tasks', methods=['GET'])
+@compression(gzip_level=4, brotli_level=4)
 @token_required
 def get_my_tasks(current_user):
     return TaskController.get_my_tasks(current_user)
 
 
 @task_router.route('/project/<project_id>', methods=['GET'])
+@compression(gzip_level=4, brotli_level=4)
 @token_required
 def get_tasks_by_project(current_user, project_id):
     return TaskController.get_tasks_by_project(current_user, project_id)
@@ -0,0 +1,98 @@
+import uuid
+from typing import Optional
+
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from apps.models.task import Task
+from apps.models.project import Project
+from apps.models.comment import Comment
+from apps.models.projections import TASK_ROW, COMMENT_WITH_AUTHOR_ROW
+from apps.utils.serialization import Projection, ProjectedRows
+from apps.services.comment_service import CommentService
+from apps.services.member_service import MemberService
+
+
+def _uuid(value) -> Optional[uuid.UUID]:
+    try:
+        return uuid.UUID(str(value))
+    except ValueError:
+        return None
+
+
+class AsyncTaskService:
+    """Read-only counterparts of TaskService for the asyncio engine."""
+
+    @staticmethod
+    async def get_task_by_id(db: AsyncSession, task_id: str) -> Optional[Task]:
+        task_id = _uuid(task_id)
+        if task_id is None:
+            return None
+        result = await db.execute(
+            select(Task)
+            .join(Project, Project.id == Task.project_id)
+            .where(Task.id == task_id, Project.deleted_at.is_(None))
+        )
+        return result.scalar_one_or_none()
+
+    @staticmethod
+    async def get_project_by_id(db: AsyncSession, project_id: str) -> Optional[Project]:
+        project_id = _uuid(project_id)
+        if project_id is None:
+            return None
+        project = await db.get(Project, project_id)
+        return project if project is not None and project.deleted_at is None else None
+
+    @staticmethod
+    async def get_task_rows_by_project(db: AsyncSession, project_id: str,
+                                       skip: int = 0, limit: int = 100,
+                                       projection: Projection = TASK_ROW.default) -> ProjectedRows:
+        result = await db.execute(
+            projection.select()
+            .where(Task.project_id == _uuid(project_id))
+            .offset(skip)
+            .limit(limit)
+        )
+        return ProjectedRows(projection, result.all())
+
+    @staticmethod
+    async def get_task_rows_by_assignee(db: AsyncSession, assignee_id: str,
+                                        skip: int = 0, limit: int = 100,
+                                        projection: Projection = TASK_ROW.default) -> ProjectedRows:
+        assignee_id = _uuid(assignee_id)
+        result = await db.execute(
+            projection.select()
+            .where(Task.assignee_id == assignee_id,
+                   Task.project_id.in_(MemberService.member_project_ids(assignee_id)))
+            .offset(skip)
+            .limit(limit)
+        )
+        return ProjectedRows(projection, result.all())
+
+
+class AsyncCommentService:
+    """Read-only counterparts of CommentService for the asyncio engine."""
+
+    @staticmethod
+    async def get_comment_rows_by_task(db: AsyncSession, task_id: str,
+                                       skip: int = 0, limit: int = 100,
+                                       projection: Projection = COMMENT_WITH_AUTHOR_ROW.default) -> ProjectedRows:
+        # Authors come from the same query through a join, so nothing is
+        # lazy loaded on the AsyncSession.
+        result = await db.execute(
+            CommentService.select_comment_rows(projection)
+            .where(Comment.task_id == _uuid(task_id))
+            .order_by(Comment.created_at.desc())
+            .offset(skip)
+            .limit(limit)
+        )
+        return ProjectedRows(projection, result.all())
+
+    @staticmethod
+    async def count_comments_by_task(db: AsyncSession, task_id: str) -> int:
+        return await db.scalar(
+            select(func.count(Comment.id)).where(Comment.task_id == _uuid(task_id))
+        )
+
+
+__all__ = ['AsyncTaskService', 'AsyncCommentService']
@@ -1,32 +1,38 @@
 import jwt
-import bcrypt
+import uuid
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any, Tuple
+from typing import Optional, Dict, Any, List, Tuple
 from sqlalchemy.orm import Session
 from flask import session
-import sys
-from pathlib import Path
 import os
 
-sys.path.insert(0, str(Path(__file__).parent.parent))
 from apps.models.user import User
+from apps.models.projections import USER_ROW
+from apps.utils.serialization import ProjectedRows
+from apps.utils.multi_get import fetch_by_ids
+from apps.models.revoked_token import RevokedToken
+from apps.utils.revocation import revocation_cache
 
 SECRET_KEY = os.getenv('JWT_SECRET_KEY', 'your-secret-key-change-this-in-production')
 JWT_ALGORITHM = 'HS256'
 JWT_EXPIRATION_HOURS = 24
 RESET_TOKEN_EXPIRATION_MINUTES = 15
+# Only checked when the stream connects; a reconnect needs a fresh one.
+STREAM_TOKEN_EXPIRATION_SECONDS = 60
 
 
 class AuthService:
     
     @staticmethod
     def hash_password(password: str) -> str:
+        import bcrypt
         salt = bcrypt.gensalt()
         hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
         return hashed.decode('utf-8')
     
     @staticmethod
     def verify_password(plain_password: str, hashed_password: str) -> bool:
+        import bcrypt
         return bcrypt.checkpw(
             plain_password.encode('utf-8'),
             hashed_password.encode('utf-8')
@@ -37,6 +43,7 @@ class AuthService:
         payload = {
             'user_id': str(user_id),
             'username': username,
+            'jti': uuid.uuid4().hex,
             'exp': datetime.utcnow() + timedelta(hours=JWT_EXPIRATION_HOURS),
             'iat': datetime.utcnow()
         }
@@ -49,6 +56,21 @@ class AuthService:
         except jwt.InvalidTokenError:
             return None
     
+    @staticmethod
+    def create_stream_token(current_user: Dict[str, Any], project_id) -> str:
+        """Token for one project's event stream, which EventSource has to
+        pass in the URL; ``sid`` ties it to the login token's revocation."""
+        payload = {
+            'user_id': current_user['user_id'],
+            'username': current_user.get('username'),
+            'sid': current_user.get('jti'),
+            'type': 'project_events',
+            'project_id': str(project_id),
+            'exp': datetime.utcnow() + timedelta(seconds=STREAM_TOKEN_EXPIRATION_SECONDS),
+            'iat': datetime.utcnow()
+        }
+        return jwt.encode(payload, SECRET_KEY, algorithm=JWT_ALGORITHM)
+    
     @staticmethod
     def create_reset_token(email: str) -> str:
         payload = {
@@ -136,7 +158,32 @@ class AuthService:
         return True, "Đăng nhập thành công", user, token
     
     @staticmethod
-    def logout_user() -> Tuple[bool, str]:
+    def revoke_token(db: Session, payload: Dict[str, Any]) -> Tuple[bool, str]:
+        jti = payload.get('jti')
+        if not jti:
+            return True, "Token không có jti"
+        
+        expires_at = datetime.utcfromtimestamp(payload['exp'])
+        try:
+            db.merge(RevokedToken(
+                jti=jti,
+                user_id=payload['user_id'],
+                expires_at=expires_at
+            ))
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            return False, f"Lỗi khi thu hồi token: {str(e)}"
+        
+        revocation_cache.add(jti, expires_at)
+        return True, "Thu hồi token thành công"
+    
+    @staticmethod
+    def logout_user(db: Session, payload: Dict[str, Any]) -> Tuple[bool, str]:
+        success, message = AuthService.revoke_token(db, payload)
+        if not success:
+            return False, message
+        
         AuthService.clear_session()
         return True, "Đăng xuất thành công"
     
@@ -147,6 +194,10 @@ class AuthService:
         except:
             return None
     
+    @staticmethod
+    def get_user_rows_by_ids(db: Session, ids: List[str]) -> Tuple[ProjectedRows, List[str]]:
+        return fetch_by_ids(db, USER_ROW, User.id, ids)
+    
     @staticmethod
     def request_reset_password(db: Session, email: str) -> Tuple[bool, str, Optional[str], Optional[str]]:
         user = db.query(User).filter(User.email == email).first()
@@ -1,8 +1,17 @@
 from typing import Optional, List, Tuple
 from sqlalchemy.orm import Session
 from datetime import datetime
+import uuid
 
 from apps.models.comment import Comment
+from apps.models.task import Task
+from apps.models.project import Project
+from apps.models.user import User
+from apps.models.projections import COMMENT_WITH_AUTHOR_ROW
+from apps.utils.serialization import Projection, ProjectedRows
+from apps.services.notification_service import NotificationService
+from apps.services.member_service import MemberService
+from apps.utils import events
 
 
 class CommentService:
@@ -19,6 +28,16 @@ class CommentService:
             )
             
             db.add(new_comment)
+            
+            # The controller has already loaded the task into this session,
+            # so this is an identity-map hit rather than another query.
+            task = db.get(Task, uuid.UUID(str(task_id)))
+            if task:
+                NotificationService.record_comment_created(db, new_comment, task)
+                db.flush()
+                events.publish(db, task.project_id, 'comment.created',
+                               CommentService.comment_event_data(new_comment))
+            
             db.commit()
             db.refresh(new_comment)
             
@@ -29,9 +48,13 @@ class CommentService:
     
     @staticmethod
     def get_comment_by_id(db: Session, comment_id: str) -> Optional[Comment]:
-        """Get a comment by ID."""
+        """Get a comment by ID, unless its project has been deleted."""
         try:
-            return db.query(Comment).filter(Comment.id == comment_id).first()
+            return db.query(Comment)\
+                .join(Task, Task.id == Comment.task_id)\
+                .join(Project, Project.id == Task.project_id)\
+                .filter(Comment.id == comment_id, Project.deleted_at.is_(None))\
+                .first()
         except:
             return None
     
@@ -57,6 +80,40 @@ class CommentService:
             .limit(limit)\
             .all()
     
+    @staticmethod
+    def select_comment_rows(projection: Projection):
+        """Select for a comment projection, joining users only when the
+        author is part of it."""
+        statement = projection.select()
+        if 'author' in projection.nested:
+            statement = statement.join(User, User.id == Comment.author_id)
+        return statement
+    
+    @staticmethod
+    def get_comment_rows_by_task(db: Session, task_id: str,
+                                 skip: int = 0, limit: int = 100,
+                                 projection: Projection = COMMENT_WITH_AUTHOR_ROW.default) -> ProjectedRows:
+        """Comments on a task with their authors, as column tuples."""
+        return projection.all(db, CommentService.select_comment_rows(projection)
+            .where(Comment.task_id == task_id)
+            .order_by(Comment.created_at.desc())
+            .offset(skip)
+            .limit(limit))
+    
+    @staticmethod
+    def get_comment_rows_by_author(db: Session, author_id: str,
+                                   skip: int = 0, limit: int = 100,
+                                   projection: Projection = COMMENT_WITH_AUTHOR_ROW.default) -> ProjectedRows:
+        """Comments by an author with the author embedded, as column tuples;
+        only in projects the author still belongs to."""
+        return projection.all(db, CommentService.select_comment_rows(projection)
+            .join(Task, Task.id == Comment.task_id)
+            .where(Comment.author_id == author_id,
+                   Task.project_id.in_(MemberService.member_project_ids(author_id)))
+            .order_by(Comment.created_at.desc())
+            .offset(skip)
+            .limit(limit))
+    
     @staticmethod
     def update_comment(db: Session, comment_id: str, 
                       content: str) -> Tuple[bool, str, Optional[Comment]]:
@@ -68,6 +125,8 @@ class CommentService:
             
             comment.content = content
             comment.updated_at = datetime.utcnow()
+            events.publish(db, comment.task.project_id, 'comment.updated',
+                           CommentService.comment_event_data(comment))
             
             db.commit()
             db.refresh(comment)
@@ -85,6 +144,8 @@ class CommentService:
             if not comment:
                 return False, "Comment không tồn tại"
             
+            events.publish(db, comment.task.project_id, 'comment.deleted',
+                           {'id': str(comment.id), 'task_id': str(comment.task_id)})
             db.delete(comment)
             db.commit()
             
@@ -106,6 +167,15 @@ class CommentService:
         """Check if user is the author of the comment."""
         return str(comment.author_id) == str(user_id)
     
+    @staticmethod
+    def comment_event_data(comment: Comment) -> dict:
+        """Compact payload for live events; clients fetch the content."""
+        return {
+            'id': str(comment.id),
+            'task_id': str(comment.task_id),
+            'author_id': str(comment.author_id),
+        }
+    
     @staticmethod
     def comment_to_dict(comment: Comment, include_author: bool = False) -> dict:
         """Convert comment to dictionary."""
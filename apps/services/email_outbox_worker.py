@@ -0,0 +1,245 @@
+import os
+import random
+import smtplib
+import time
+from collections import namedtuple
+from contextlib import ExitStack
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+
+from flask_mail import Message
+from sqlalchemy import or_, and_
+from sqlalchemy.orm import Session
+
+from apps.utils.db import SessionLocal
+from apps.utils.logger import get_logger
+from apps.utils.worker import PeriodicWorker
+from apps.models.email_outbox import EmailOutbox, EmailStatus
+from apps.services.email_service import EmailService
+
+EMAIL_OUTBOX_BATCH_SIZE = int(os.getenv('EMAIL_OUTBOX_BATCH_SIZE', 50))
+EMAIL_OUTBOX_POLL_SECONDS = float(os.getenv('EMAIL_OUTBOX_POLL_SECONDS', 5))
+EMAIL_OUTBOX_MAX_ATTEMPTS = int(os.getenv('EMAIL_OUTBOX_MAX_ATTEMPTS', 5))
+EMAIL_OUTBOX_BACKOFF_SECONDS = float(os.getenv('EMAIL_OUTBOX_BACKOFF_SECONDS', 30))
+EMAIL_OUTBOX_MAX_BACKOFF_SECONDS = float(os.getenv('EMAIL_OUTBOX_MAX_BACKOFF_SECONDS', 3600))
+# A row stuck in "sending" longer than this belonged to a worker that died.
+EMAIL_OUTBOX_LEASE_SECONDS = 300
+# Sent and failed rows are deleted after this long; the body (which may hold
+# a reset link) is blanked as soon as the row is done.
+EMAIL_OUTBOX_RETENTION_DAYS = int(os.getenv('EMAIL_OUTBOX_RETENTION_DAYS', 7))
+EMAIL_OUTBOX_PRUNE_SECONDS = 3600
+EMAIL_OUTBOX_PRUNE_BATCH_SIZE = 1000
+
+logger = get_logger(__name__)
+
+OutboxItem = namedtuple('OutboxItem', ['id', 'recipient', 'subject', 'html', 'attempts'])
+
+
+def backoff_seconds(attempts: int) -> float:
+    delay = min(
+        EMAIL_OUTBOX_BACKOFF_SECONDS * (2 ** (attempts - 1)),
+        EMAIL_OUTBOX_MAX_BACKOFF_SECONDS
+    )
+    return delay * random.uniform(0.8, 1.2)
+
+
+class EmailOutboxWorker(PeriodicWorker):
+    """Delivers queued email_outbox rows over one reused SMTP connection.
+
+    Rows are claimed with ``FOR UPDATE SKIP LOCKED`` so several workers (or
+    processes) can drain the same outbox. The SMTP connection stays open while
+    there is a backlog and is closed once the outbox is empty. While idle
+    it deletes finished rows older than ``EMAIL_OUTBOX_RETENTION_DAYS``.
+    """
+
+    def __init__(self, app, batch_size: int = EMAIL_OUTBOX_BATCH_SIZE,
+                 interval: float = EMAIL_OUTBOX_POLL_SECONDS):
+        super().__init__(name='email-outbox', interval=interval)
+        self.app = app
+        self.batch_size = batch_size
+        self._connection = None
+        self._connection_scope = None
+        self._pruned_at = None
+
+    def run_once(self) -> int:
+        with self.app.app_context():
+            db = SessionLocal()
+            try:
+                batch = self._claim(db)
+                if batch:
+                    sent, failed = self._deliver(batch)
+                    self._record(db, sent, failed)
+                return len(batch)
+            finally:
+                db.close()
+
+    def on_idle(self) -> None:
+        self._close_connection()
+        now = time.monotonic()
+        if self._pruned_at is None or now - self._pruned_at >= EMAIL_OUTBOX_PRUNE_SECONDS:
+            self._pruned_at = now
+            db = SessionLocal()
+            try:
+                self._prune(db)
+            except Exception:
+                db.rollback()
+                logger.exception("Pruning the email outbox failed")
+            finally:
+                db.close()
+
+    def stop(self, timeout: float | None = None) -> None:
+        super().stop(timeout)
+        self._close_connection()
+
+    def _claim(self, db: Session) -> List[OutboxItem]:
+        now = datetime.utcnow()
+        lease_expired = now - timedelta(seconds=EMAIL_OUTBOX_LEASE_SECONDS)
+        rows = db.query(EmailOutbox)\
+            .filter(or_(
+                and_(EmailOutbox.status == EmailStatus.PENDING,
+                     EmailOutbox.next_attempt_at <= now),
+                and_(EmailOutbox.status == EmailStatus.SENDING,
+                     EmailOutbox.locked_at < lease_expired)
+            ))\
+            .order_by(EmailOutbox.next_attempt_at)\
+            .limit(self.batch_size)\
+            .with_for_update(skip_locked=True)\
+            .all()
+
+        batch = []
+        for row in rows:
+            row.status = EmailStatus.SENDING
+            row.locked_at = now
+            batch.append(OutboxItem(row.id, row.recipient, row.subject, row.html, row.attempts))
+        db.commit()
+        return batch
+
+    def _deliver(self, batch: List[OutboxItem]) -> Tuple[list, list]:
+        sent, failed = [], []
+        remaining = list(batch)
+        try:
+            connection = self._open_connection()
+            while remaining:
+                item = remaining[0]
+                try:
+                    connection.send(Message(
+                        subject=item.subject,
+                        recipients=[item.recipient],
+                        html=item.html
+                    ))
+                    sent.append(item.id)
+                except (smtplib.SMTPRecipientsRefused, smtplib.SMTPSenderRefused,
+                        smtplib.SMTPDataError) as e:
+                    # The server turned down this message only; smtplib has
+                    # reset the session, so carry on with the next one.
+                    failed.append((item, str(e)))
+                except (smtplib.SMTPServerDisconnected, OSError):
+                    # Every SMTPException is an OSError: what reaches here
+                    # is the socket or the session, not the message.
+                    raise
+                except Exception as e:
+                    failed.append((item, str(e)))
+                remaining.pop(0)
+        except Exception as e:
+            # The connection itself is gone; everything not yet sent is retried.
+            logger.warning("SMTP connection failed: %s", e)
+            self._close_connection()
+            failed.extend((item, str(e)) for item in remaining)
+        return sent, failed
+
+    def _record(self, db: Session, sent: list, failed: list) -> None:
+        now = datetime.utcnow()
+        if sent:
+            db.query(EmailOutbox)\
+                .filter(EmailOutbox.id.in_(sent))\
+                .update({
+                    EmailOutbox.status: EmailStatus.SENT,
+                    EmailOutbox.sent_at: now,
+                    EmailOutbox.html: '',
+                    EmailOutbox.locked_at: None,
+                    EmailOutbox.last_error: None,
+                    EmailOutbox.attempts: EmailOutbox.attempts + 1
+                }, synchronize_session=False)
+
+        for item, error in failed:
+            attempts = item.attempts + 1
+            values = {
+                EmailOutbox.attempts: attempts,
+                EmailOutbox.locked_at: None,
+                EmailOutbox.last_error: error[:2000]
+            }
+            if attempts >= EMAIL_OUTBOX_MAX_ATTEMPTS:
+                values[EmailOutbox.status] = EmailStatus.FAILED
+                values[EmailOutbox.html] = ''
+                logger.error("Giving up on email %s to %s: %s", item.id, item.recipient, error)
+            else:
+                values[EmailOutbox.status] = EmailStatus.PENDING
+                values[EmailOutbox.next_attempt_at] = now + timedelta(seconds=backoff_seconds(attempts))
+            db.query(EmailOutbox)\
+                .filter(EmailOutbox.id == item.id)\
+                .update(values, synchronize_session=False)
+
+        db.commit()
+
+    def _prune(self, db: Session) -> int:
+        """Delete sent and failed rows past retention, one batch per
+        transaction. Returns the number of rows deleted."""
+        cutoff = datetime.utcnow() - timedelta(days=EMAIL_OUTBOX_RETENTION_DAYS)
+        expired = db.query(EmailOutbox.id)\
+            .filter(EmailOutbox.status.in_([EmailStatus.SENT, EmailStatus.FAILED]),
+                    EmailOutbox.next_attempt_at < cutoff)\
+            .limit(EMAIL_OUTBOX_PRUNE_BATCH_SIZE)
+        removed = 0
+        while True:
+            deleted = db.query(EmailOutbox)\
+                .filter(EmailOutbox.id.in_(expired.subquery().select()))\
+                .delete(synchronize_session=False)
+            db.commit()
+            removed += deleted
+            if deleted < EMAIL_OUTBOX_PRUNE_BATCH_SIZE:
+                return removed
+
+    def _open_connection(self):
+        # Held open across batches, so the ``with`` lives in an ExitStack
+        # that _close_connection unwinds.
+        if self._connection is None:
+            with ExitStack() as scope:
+                self._connection = scope.enter_context(EmailService.get_mail().connect())
+                self._connection_scope = scope.pop_all()
+        return self._connection
+
+    def _close_connection(self) -> None:
+        scope, self._connection_scope = self._connection_scope, None
+        self._connection = None
+        if scope is None:
+            return
+        try:
+            scope.close()
+        except Exception:
+            pass
+
+
+_worker: Optional[EmailOutboxWorker] = None
+
+
+def start_email_worker(app) -> EmailOutboxWorker:
+    global _worker
+    if _worker is None or not _worker.is_alive():
+        _worker = EmailOutboxWorker(app)
+        _worker.start()
+    return _worker
+
+
+def stop_email_worker(timeout: float | None = None) -> None:
+    global _worker
+    if _worker is not None:
+        _worker.stop(timeout)
+        _worker = None
+
+
+def wake_email_worker() -> None:
+    if _worker is not None:
+        _worker.wake()
+
+
+__all__ = ['EmailOutboxWorker', 'start_email_worker', 'stop_email_worker', 'wake_email_worker']
@@ -1,8 +1,14 @@
-from flask_mail import Mail, Message
 from flask import current_app
+from sqlalchemy.orm import Session
+from typing import Optional, Tuple, List
+from html import escape
 import os
 
-mail = Mail()
+from apps.models.email_outbox import EmailOutbox
+from apps.utils.logger import get_logger
+
+logger = get_logger(__name__)
+_mail = None
 
 class EmailService:
     
@@ -15,19 +21,67 @@ class EmailService:
         app.config['MAIL_USERNAME'] = os.getenv('MAIL_USERNAME')
         app.config['MAIL_PASSWORD'] = os.getenv('MAIL_PASSWORD')
         app.config['MAIL_DEFAULT_SENDER'] = os.getenv('MAIL_DEFAULT_SENDER', os.getenv('MAIL_USERNAME'))
-        mail.init_app(app)
+    
+    @staticmethod
+    def get_mail():
+        """Flask-Mail is imported on first use, not at startup."""
+        global _mail
+        if _mail is None:
+            from flask_mail import Mail
+            _mail = Mail()
+        app = current_app._get_current_object()
+        if 'mail' not in app.extensions:
+            _mail.init_app(app)
+        return _mail
+    
+    @staticmethod
+    def queue_email(db: Session, recipient: str, subject: str, html: str,
+                    commit: bool = True) -> Optional[EmailOutbox]:
+        """Store an email in the outbox; the outbox worker delivers it.
+
+        With ``commit=False`` the row joins the caller's transaction and the
+        caller is responsible for committing and waking the worker.
+        """
+        item = EmailOutbox(recipient=recipient, subject=subject, html=html)
+        if not commit:
+            db.add(item)
+            return item
+        
+        try:
+            db.add(item)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.error("Error queueing email to %s: %s", recipient, e)
+            return None
+        
+        from apps.services.email_outbox_worker import wake_email_worker
+        wake_email_worker()
+        return item
+    
+    @staticmethod
+    def queue_reset_password_email(db: Session, email: str, token: str, username: str) -> bool:
+        subject, html = EmailService.render_reset_password_email(token, username)
+        return EmailService.queue_email(db, email, subject, html) is not None
     
     @staticmethod
     def send_reset_password_email(email: str, token: str, username: str) -> bool:
         try:
-            reset_url = f"{os.getenv('FRONTEND_URL', 'http://localhost:3000')}/reset-password?token={token}"
-            
-            msg = Message(
-                subject='Đặt lại mật khẩu - Project Management',
-                recipients=[email]
-            )
+            from flask_mail import Message
+            subject, html = EmailService.render_reset_password_email(token, username)
+            msg = Message(subject=subject, recipients=[email], html=html)
+            EmailService.get_mail().send(msg)
+            return True
             
-            msg.html = f"""
+        except Exception as e:
+            logger.error("Error sending email: %s", e)
+            return False
+    
+    @staticmethod
+    def render_reset_password_email(token: str, username: str) -> Tuple[str, str]:
+        reset_url = f"{os.getenv('FRONTEND_URL', 'http://localhost:3000')}/reset-password?token={token}"
+        
+        html = f"""
             <!DOCTYPE html>
             <html>
             <head>
@@ -70,10 +124,40 @@ class EmailService:
             </body>
             </html>
             """
-            
-            mail.send(msg)
-            return True
-            
-        except Exception as e:
-            print(f"Error sending email: {str(e)}")
-            return False
+        
+        return 'Đặt lại mật khẩu - Project Management', html
+    
+    @staticmethod
+    def render_notification_digest(full_name: str, events: List[dict]) -> Tuple[str, str]:
+        """Render one digest email; ``events`` come from NotificationService."""
+        frontend_url = os.getenv('FRONTEND_URL', 'http://localhost:3000')
+        
+        items = []
+        for event in events:
+            task_url = f"{frontend_url}/tasks/{event['task_id']}"
+            task_link = f'<a href="{task_url}">{escape(event["task_title"] or "")}</a>'
+            actor = escape(event['actor_name'] or 'Ai đó')
+            if event['type'] == 'task_assigned':
+                text = f"<strong>{actor}</strong> đã giao cho bạn task {task_link}"
+            else:
+                excerpt = escape(event['excerpt'] or '')
+                text = f"<strong>{actor}</strong> đã bình luận trong task {task_link}: <em>{excerpt}</em>"
+            items.append(f"<li>{text}</li>")
+        
+        html = f"""
+            <!DOCTYPE html>
+            <html>
+            <body style="font-family: Arial, sans-serif; line-height: 1.6; color: #333;">
+                <div style="max-width: 600px; margin: 0 auto; padding: 20px;">
+                    <p>Xin chào <strong>{escape(full_name)}</strong>,</p>
+                    <p>Bạn có {len(events)} cập nhật mới:</p>
+                    <ul>
+                        {''.join(items)}
+                    </ul>
+                    <p style="color: #666; font-size: 12px;">Email này được gửi tự động, vui lòng không trả lời.</p>
+                </div>
+            </body>
+            </html>
+            """
+        
+        return f'Bạn có {len(events)} cập nhật mới - Project Management', html
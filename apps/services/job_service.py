@@ -0,0 +1,236 @@
+"""
+Durable background jobs.
+
+Work that is too slow for a request is written to the ``jobs`` table, in
+the caller's transaction, and run by ``JobWorker`` threads in any number of
+processes. Workers claim the most urgent runnable job with
+``FOR UPDATE SKIP LOCKED``, so they never block on or double-run each
+other's jobs. While a handler runs, a heartbeat keeps renewing the job's
+lease; a job whose worker died is picked up again once its lease runs
+out, so handlers must be safe to run more than once.
+
+Handlers are registered by type with ``@job_handler('type')`` and take
+``(db, payload)``; whatever they return is stored as the job's result.
+"""
+import os
+import random
+import socket
+import threading
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Optional
+
+from sqlalchemy import and_, or_, select, update
+from sqlalchemy.orm import Session
+
+from apps.models.job import Job, JobStatus
+from apps.utils.db import SessionLocal
+from apps.utils.logger import get_logger
+from apps.utils.worker import PeriodicWorker
+
+JOB_MAX_ATTEMPTS = int(os.getenv('JOB_MAX_ATTEMPTS', 5))
+JOB_BACKOFF_SECONDS = float(os.getenv('JOB_BACKOFF_SECONDS', 30))
+JOB_MAX_BACKOFF_SECONDS = float(os.getenv('JOB_MAX_BACKOFF_SECONDS', 3600))
+# A job stuck in "running" longer than this belonged to a worker that died.
+JOB_LEASE_SECONDS = int(os.getenv('JOB_LEASE_SECONDS', 900))
+# How often a running job renews its lease; well inside JOB_LEASE_SECONDS.
+JOB_HEARTBEAT_SECONDS = float(os.getenv('JOB_HEARTBEAT_SECONDS', JOB_LEASE_SECONDS / 3))
+
+PRIORITY_HIGH = 10
+PRIORITY_NORMAL = 100
+PRIORITY_LOW = 1000
+
+logger = get_logger(__name__)
+
+_handlers: Dict[str, Callable] = {}
+
+
+def job_handler(job_type: str):
+    def decorator(handler):
+        _handlers[job_type] = handler
+        return handler
+    return decorator
+
+
+def backoff_seconds(attempts: int) -> float:
+    delay = min(JOB_BACKOFF_SECONDS * (2 ** (attempts - 1)), JOB_MAX_BACKOFF_SECONDS)
+    return delay * random.uniform(0.8, 1.2)
+
+
+def worker_name() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{threading.current_thread().name}"
+
+
+class JobHeartbeat(PeriodicWorker):
+    """Renews a running job's lease on its own session, so a long handler
+    is not mistaken for a dead worker and run a second time."""
+
+    def __init__(self, job_id, worker: str, interval: float = JOB_HEARTBEAT_SECONDS):
+        super().__init__(name=f'job-heartbeat-{job_id}', interval=interval)
+        self.job_id = job_id
+        self.worker = worker
+
+    def run(self) -> None:
+        # The claim has just set locked_at.
+        self._wake_event.wait(self.interval)
+        super().run()
+
+    def run_once(self) -> int:
+        db = SessionLocal()
+        try:
+            renewed = db.execute(
+                update(Job)
+                .where(Job.id == self.job_id,
+                       Job.status == JobStatus.RUNNING,
+                       Job.locked_by == self.worker)
+                .values(locked_at=datetime.utcnow())
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            db.commit()
+        finally:
+            db.close()
+        if not renewed:
+            logger.warning("Job %s lease lost by %s", self.job_id, self.worker)
+        return 0
+
+
+class JobService:
+
+    @staticmethod
+    def enqueue(db: Session, job_type: str, payload: Optional[dict] = None,
+                priority: int = PRIORITY_NORMAL, max_attempts: int = JOB_MAX_ATTEMPTS,
+                run_at: datetime = None, created_by: str = None,
+                commit: bool = True) -> Job:
+        """Add a job. With ``commit=False`` it is only visible to workers
+        once the caller's transaction commits."""
+        if job_type not in _handlers:
+            raise ValueError(f"Unknown job type: {job_type}")
+        job = Job(
+            type=job_type,
+            payload=payload or {},
+            priority=priority,
+            max_attempts=max_attempts,
+            run_at=run_at or datetime.utcnow(),
+            created_by=created_by
+        )
+        db.add(job)
+        if commit:
+            db.commit()
+        else:
+            db.flush()
+        return job
+
+    @staticmethod
+    def get_job(db: Session, job_id: str) -> Optional[Job]:
+        try:
+            return db.query(Job).filter(Job.id == job_id).first()
+        except:
+            return None
+
+    @staticmethod
+    def claim(db: Session, worker: str, types=None) -> Optional[Job]:
+        """Lock the most urgent runnable job, mark it running and commit."""
+        now = datetime.utcnow()
+        lease_expired = now - timedelta(seconds=JOB_LEASE_SECONDS)
+        statement = select(Job)\
+            .where(or_(
+                and_(Job.status == JobStatus.QUEUED, Job.run_at <= now),
+                and_(Job.status == JobStatus.RUNNING, Job.locked_at < lease_expired)
+            ))\
+            .order_by(Job.priority, Job.run_at)\
+            .limit(1)\
+            .with_for_update(skip_locked=True)
+        if types:
+            statement = statement.where(Job.type.in_(types))
+
+        job = db.execute(statement).scalar()
+        if job is None:
+            db.rollback()
+            return None
+        job.status = JobStatus.RUNNING
+        job.locked_at = now
+        job.locked_by = worker
+        job.attempts += 1
+        db.commit()
+        return job
+
+    @staticmethod
+    def run(db: Session, job: Job) -> JobStatus:
+        """Run a claimed job and record the outcome."""
+        job_id, job_type, payload = job.id, job.type, dict(job.payload or {})
+        worker = job.locked_by
+        handler = _handlers.get(job_type)
+        heartbeat = JobHeartbeat(job_id, worker)
+        try:
+            if handler is None:
+                raise LookupError(f"No handler for job type {job_type}")
+            heartbeat.start()
+            try:
+                result = handler(db, payload)
+            finally:
+                heartbeat.stop()
+        except Exception as e:
+            db.rollback()
+            job = JobService._reload(db, job_id)
+            if job.locked_by != worker:
+                return JobService._lease_lost(db, job, worker)
+            job.last_error = f"{type(e).__name__}: {e}"[:2000]
+            job.locked_at = None
+            job.locked_by = None
+            if job.attempts >= job.max_attempts or handler is None:
+                job.status = JobStatus.FAILED
+                job.finished_at = datetime.utcnow()
+                logger.error("Job %s (%s) failed for good: %s", job_id, job_type, e)
+            else:
+                job.status = JobStatus.QUEUED
+                job.run_at = datetime.utcnow() + timedelta(seconds=backoff_seconds(job.attempts))
+                logger.warning("Job %s (%s) failed, retrying: %s", job_id, job_type, e)
+            db.commit()
+            return job.status
+
+        job = JobService._reload(db, job_id)
+        if job.locked_by != worker:
+            return JobService._lease_lost(db, job, worker)
+        job.status = JobStatus.SUCCEEDED
+        job.result = result
+        job.last_error = None
+        job.locked_at = None
+        job.locked_by = None
+        job.finished_at = datetime.utcnow()
+        db.commit()
+        return job.status
+
+    @staticmethod
+    def _reload(db: Session, job_id) -> Job:
+        # Fresh from the database, not the identity map, and locked until the
+        # outcome is written so a new claim cannot slip in between.
+        return db.query(Job)\
+            .populate_existing()\
+            .filter(Job.id == job_id)\
+            .with_for_update()\
+            .one()
+
+    @staticmethod
+    def _lease_lost(db: Session, job: Job, worker: str) -> JobStatus:
+        # Another worker re-claimed the job after our lease ran out; its run
+        # owns the row now.
+        job_id, job_type, status = job.id, job.type, job.status
+        db.rollback()
+        logger.warning("Job %s (%s) lease lost by %s; outcome not recorded", job_id, job_type, worker)
+        return status
+
+    @staticmethod
+    def run_next(db: Session, worker: str = None, types=None) -> Optional[JobStatus]:
+        """Claim and run one job; None when there was nothing to do."""
+        job = JobService.claim(db, worker or worker_name(), types)
+        if job is None:
+            return None
+        return JobService.run(db, job)
+
+
+__all__ = [
+    'JobService',
+    'job_handler',
+    'PRIORITY_HIGH',
+    'PRIORITY_NORMAL',
+    'PRIORITY_LOW',
+]
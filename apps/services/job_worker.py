@@ -0,0 +1,73 @@
+import os
+from importlib import import_module
+from typing import List
+
+from apps.utils.db import SessionLocal
+from apps.utils.worker import PeriodicWorker
+
+JOB_WORKER_THREADS = int(os.getenv('JOB_WORKER_THREADS', 2))
+JOB_POLL_SECONDS = float(os.getenv('JOB_POLL_SECONDS', 5))
+
+# Modules that register @job_handler functions; a worker imports them all
+# so it can run any job type.
+JOB_HANDLER_MODULES = (
+    'apps.services.project_service',
+)
+
+
+def load_job_handlers() -> None:
+    for module_name in JOB_HANDLER_MODULES:
+        import_module(module_name)
+
+
+class JobWorker(PeriodicWorker):
+    """Runs queued jobs one at a time; see ``apps.services.job_service``."""
+
+    def __init__(self, name: str = 'job-worker', interval: float = JOB_POLL_SECONDS, types=None):
+        super().__init__(name=name, interval=interval)
+        self.types = types
+
+    def run_once(self) -> int:
+        from apps.services.job_service import JobService, worker_name
+        db = SessionLocal()
+        try:
+            return 0 if JobService.run_next(db, worker_name(), self.types) is None else 1
+        finally:
+            db.close()
+
+
+_workers: List[JobWorker] = []
+
+
+def start_job_workers(threads: int = JOB_WORKER_THREADS, types=None) -> List[JobWorker]:
+    load_job_handlers()
+    _workers[:] = [worker for worker in _workers if worker.is_alive()]
+    while len(_workers) < threads:
+        worker = JobWorker(name=f'job-worker-{len(_workers)}', types=types)
+        worker.start()
+        _workers.append(worker)
+    return list(_workers)
+
+
+def stop_job_workers(timeout: float | None = None) -> None:
+    # Signal every thread first so they wind down together.
+    for worker in _workers:
+        worker.stop(0)
+    for worker in _workers:
+        worker.join(timeout)
+    _workers.clear()
+
+
+def wake_job_workers() -> None:
+    for worker in _workers:
+        worker.wake()
+
+
+__all__ = [
+    'JobWorker',
+    'JOB_HANDLER_MODULES',
+    'load_job_handlers',
+    'start_job_workers',
+    'stop_job_workers',
+    'wake_job_workers',
+]
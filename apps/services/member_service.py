@@ -0,0 +1,128 @@
+from typing import Optional, List, Tuple
+from sqlalchemy import select
+from sqlalchemy.orm import Session, joinedload
+import uuid
+
+from apps.models.project import Project
+from apps.models.project_member import ProjectMember, ProjectRole, Permission, ROLE_PERMISSIONS
+from apps.models.user import User
+from apps.utils import events
+from apps.utils.permissions import permission_index
+
+
+class MemberService:
+
+    @staticmethod
+    def member_project_ids(user_id: str):
+        """Subquery of the live projects ``user_id`` belongs to, for
+        filtering listings in SQL."""
+        return select(ProjectMember.project_id)\
+            .join(Project, Project.id == ProjectMember.project_id)\
+            .where(ProjectMember.user_id == user_id,
+                   Project.deleted_at.is_(None))
+
+    @staticmethod
+    def get_member(db: Session, project_id: str, user_id: str) -> Optional[ProjectMember]:
+        try:
+            return db.get(ProjectMember, (uuid.UUID(str(project_id)), uuid.UUID(str(user_id))))
+        except ValueError:
+            return None
+
+    @staticmethod
+    def get_members(db: Session, project_id: str) -> List[ProjectMember]:
+        return db.query(ProjectMember)\
+            .options(joinedload(ProjectMember.user))\
+            .filter(ProjectMember.project_id == project_id)\
+            .order_by(ProjectMember.created_at)\
+            .all()
+
+    @staticmethod
+    def can_assign(actor_permissions: Permission, role: ProjectRole) -> bool:
+        """Whether someone with ``actor_permissions`` may give ``role`` to,
+        or take it from, another member: only roles below their own."""
+        return Permission.MANAGE in actor_permissions \
+            and actor_permissions > ROLE_PERMISSIONS[role]
+
+    @staticmethod
+    def add_member(db: Session, project_id, user_id, role: ProjectRole = ProjectRole.MEMBER,
+                   commit: bool = True) -> Tuple[bool, str, Optional[ProjectMember]]:
+        try:
+            user = db.get(User, uuid.UUID(str(user_id)))
+            if not user or not user.is_active:
+                return False, "Người dùng không tồn tại", None
+            if MemberService.get_member(db, project_id, user_id):
+                return False, "Người dùng đã là thành viên dự án", None
+
+            member = ProjectMember(project_id=project_id, user_id=user.id, role=role)
+            db.add(member)
+            MemberService._publish(db, project_id, 'member.added', member)
+            if not commit:
+                db.flush()
+                return True, "Thêm thành viên thành công", member
+            db.commit()
+            permission_index.invalidate(user.id)
+            db.refresh(member)
+
+            return True, "Thêm thành viên thành công", member
+        except Exception as e:
+            db.rollback()
+            return False, f"Lỗi khi thêm thành viên: {str(e)}", None
+
+    @staticmethod
+    def update_role(db: Session, project_id: str, user_id: str,
+                    role: ProjectRole) -> Tuple[bool, str, Optional[ProjectMember]]:
+        try:
+            member = MemberService.get_member(db, project_id, user_id)
+            if not member:
+                return False, "Thành viên không tồn tại", None
+
+            member.role = role
+            MemberService._publish(db, project_id, 'member.updated', member)
+            db.commit()
+            permission_index.invalidate(member.user_id)
+            db.refresh(member)
+
+            return True, "Cập nhật vai trò thành công", member
+        except Exception as e:
+            db.rollback()
+            return False, f"Lỗi khi cập nhật vai trò: {str(e)}", None
+
+    @staticmethod
+    def remove_member(db: Session, project_id: str, user_id: str) -> Tuple[bool, str]:
+        try:
+            member = MemberService.get_member(db, project_id, user_id)
+            if not member:
+                return False, "Thành viên không tồn tại"
+
+            MemberService._publish(db, project_id, 'member.removed', member)
+            db.delete(member)
+            db.commit()
+            permission_index.invalidate(user_id)
+
+            return True, "Xóa thành viên thành công"
+        except Exception as e:
+            db.rollback()
+            return False, f"Lỗi khi xóa thành viên: {str(e)}"
+
+    @staticmethod
+    def _publish(db: Session, project_id, type: str, member: ProjectMember) -> None:
+        # Every process drops the user's cached permissions when it
+        # sees this (apps.utils.permissions).
+        events.publish(db, project_id, type, {
+            'user_id': str(member.user_id),
+            'role': member.role.value
+        })
+
+    @staticmethod
+    def member_to_dict(member: ProjectMember) -> dict:
+        data = member.to_dict()
+        if member.user:
+            data['user'] = {
+                'id': str(member.user.id),
+                'username': member.user.username,
+                'full_name': member.user.full_name
+            }
+        return data
+
+
+__all__ = ['MemberService']
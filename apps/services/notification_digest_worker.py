@@ -0,0 +1,43 @@
+import os
+from typing import Optional
+
+from apps.utils.db import SessionLocal
+from apps.utils.worker import PeriodicWorker
+from apps.services.notification_service import NotificationService
+
+NOTIFICATION_DIGEST_POLL_SECONDS = float(os.getenv('NOTIFICATION_DIGEST_POLL_SECONDS', 60))
+
+
+class NotificationDigestWorker(PeriodicWorker):
+    """Turns pending notifications into digest emails in the outbox."""
+
+    def __init__(self, interval: float = NOTIFICATION_DIGEST_POLL_SECONDS):
+        super().__init__(name='notification-digest', interval=interval)
+
+    def run_once(self) -> int:
+        db = SessionLocal()
+        try:
+            return NotificationService.send_digests(db)
+        finally:
+            db.close()
+
+
+_worker: Optional[NotificationDigestWorker] = None
+
+
+def start_digest_worker() -> NotificationDigestWorker:
+    global _worker
+    if _worker is None or not _worker.is_alive():
+        _worker = NotificationDigestWorker()
+        _worker.start()
+    return _worker
+
+
+def stop_digest_worker(timeout: float | None = None) -> None:
+    global _worker
+    if _worker is not None:
+        _worker.stop(timeout)
+        _worker = None
+
+
+__all__ = ['NotificationDigestWorker', 'start_digest_worker', 'stop_digest_worker']
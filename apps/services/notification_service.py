@@ -0,0 +1,137 @@
+from typing import Optional, Iterable
+from sqlalchemy import func
+from sqlalchemy.orm import Session, aliased
+from datetime import datetime, timedelta
+import os
+
+from apps.models.notification import Notification, NotificationType
+from apps.models.task import Task
+from apps.models.comment import Comment
+from apps.models.user import User
+from apps.services.email_service import EmailService
+
+NOTIFICATION_DIGEST_WINDOW_SECONDS = int(os.getenv('NOTIFICATION_DIGEST_WINDOW_SECONDS', 900))
+NOTIFICATION_DIGEST_BATCH_SIZE = int(os.getenv('NOTIFICATION_DIGEST_BATCH_SIZE', 100))
+
+
+class NotificationService:
+
+    @staticmethod
+    def record(db: Session, type: NotificationType, recipient_ids: Iterable,
+               task_id, actor_id=None, excerpt: Optional[str] = None) -> None:
+        """Add notification rows to the caller's transaction (no commit)."""
+        actor = str(actor_id) if actor_id else None
+        for recipient_id in {str(r) for r in recipient_ids if r}:
+            if recipient_id == actor:
+                continue
+            db.add(Notification(
+                type=type,
+                recipient_id=recipient_id,
+                actor_id=actor_id,
+                task_id=task_id,
+                excerpt=excerpt
+            ))
+
+    @staticmethod
+    def record_task_assigned(db: Session, task: Task, actor_id=None) -> None:
+        NotificationService.record(
+            db, NotificationType.TASK_ASSIGNED, [task.assignee_id], task.id, actor_id
+        )
+
+    @staticmethod
+    def record_comment_created(db: Session, comment: Comment, task: Task) -> None:
+        excerpt = comment.content[:197] + '...' if len(comment.content) > 200 else comment.content
+        NotificationService.record(
+            db, NotificationType.COMMENT_CREATED,
+            [task.assignee_id, task.creator_id], task.id, comment.author_id, excerpt
+        )
+
+    @staticmethod
+    def send_digests(db: Session, window_seconds: int = NOTIFICATION_DIGEST_WINDOW_SECONDS,
+                     limit: int = NOTIFICATION_DIGEST_BATCH_SIZE) -> int:
+        """Queue one digest email per recipient whose oldest pending event is
+        older than the window. Returns the number of digests queued."""
+        cutoff = datetime.utcnow() - timedelta(seconds=window_seconds)
+        ripe_recipients = db.query(Notification.recipient_id)\
+            .filter(Notification.digested_at.is_(None))\
+            .group_by(Notification.recipient_id)\
+            .having(func.min(Notification.created_at) <= cutoff)\
+            .limit(limit)\
+            .subquery()
+
+        # The pending rows are the claim: another worker's digest holds its
+        # rows locked, so this one only ever builds from rows it locked here.
+        recipient = aliased(User)
+        actor = aliased(User)
+        rows = db.query(
+                Notification.id,
+                Notification.type,
+                Notification.task_id,
+                Notification.excerpt,
+                Notification.created_at,
+                Notification.recipient_id,
+                recipient.email,
+                recipient.full_name,
+                actor.full_name,
+                Task.title
+            )\
+            .join(recipient, recipient.id == Notification.recipient_id)\
+            .join(Task, Task.id == Notification.task_id)\
+            .outerjoin(actor, actor.id == Notification.actor_id)\
+            .filter(Notification.recipient_id.in_(ripe_recipients.select()))\
+            .filter(Notification.digested_at.is_(None))\
+            .order_by(Notification.recipient_id, Notification.created_at)\
+            .with_for_update(skip_locked=True, of=Notification)\
+            .all()
+        if not rows:
+            db.rollback()
+            return 0
+
+        digests = {}
+        for (notification_id, type, task_id, excerpt, created_at, recipient_id,
+             email, full_name, actor_name, task_title) in rows:
+            digest = digests.setdefault(recipient_id, {
+                'email': email,
+                'full_name': full_name,
+                'ripe': False,
+                'notification_ids': [],
+                'events': []
+            })
+            digest['ripe'] = digest['ripe'] or created_at <= cutoff
+            digest['notification_ids'].append(notification_id)
+            digest['events'].append({
+                'type': type.value,
+                'task_id': str(task_id),
+                'task_title': task_title,
+                'actor_name': actor_name,
+                'excerpt': excerpt
+            })
+
+        # Rows that arrived while another worker's digest for the same
+        # recipient is in flight: left for the next window.
+        digests = {key: digest for key, digest in digests.items() if digest['ripe']}
+        notification_ids = [id for digest in digests.values() for id in digest['notification_ids']]
+
+        try:
+            for digest in digests.values():
+                subject, html = EmailService.render_notification_digest(
+                    digest['full_name'], digest['events']
+                )
+                EmailService.queue_email(db, digest['email'], subject, html, commit=False)
+
+            if notification_ids:
+                db.query(Notification)\
+                    .filter(Notification.id.in_(notification_ids))\
+                    .update({Notification.digested_at: datetime.utcnow()}, synchronize_session=False)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+
+        if digests:
+            from apps.services.email_outbox_worker import wake_email_worker
+            wake_email_worker()
+        return len(digests)
+
+
+__all__ = ['NotificationService']
@@ -0,0 +1,105 @@
+import os
+from datetime import datetime, timedelta
+from typing import Iterable
+
+from sqlalchemy import case, func, or_
+from sqlalchemy.orm import Session
+
+from apps.models.project import Project
+from apps.models.task import Task, TaskStatus
+from apps.models.comment import Comment
+from apps.models.user import User
+from apps.models.projections import TASK_ROW, PROJECT_SUMMARY_ROW, COMMENT_ACTIVITY_ROW
+from apps.utils.serialization import ProjectedRows
+from apps.services.member_service import MemberService
+
+OVERVIEW_SECTIONS = ('tasks', 'projects', 'comments')
+OVERVIEW_MAX_LIMIT = int(os.getenv('OVERVIEW_MAX_LIMIT', 50))
+
+# In display order; assigned open tasks fall into exactly one.
+DUE_WINDOWS = ('overdue', 'today', 'this_week', 'later', 'no_due_date')
+
+
+class OverviewService:
+    """The home screen's "my work" sections, one statement each."""
+
+    @staticmethod
+    def get_overview(db: Session, user_id: str, sections: Iterable[str] = OVERVIEW_SECTIONS,
+                     limit: int = 10, now: datetime = None) -> dict:
+        now = now or datetime.utcnow()
+        overview = {}
+        if 'tasks' in sections:
+            overview['tasks'] = OverviewService.get_tasks_by_due_window(db, user_id, now, limit)
+        if 'projects' in sections:
+            overview['projects'] = OverviewService.get_owned_projects(db, user_id, limit)
+        if 'comments' in sections:
+            overview['comments'] = OverviewService.get_recent_comments(db, user_id, limit)
+        return overview
+
+    @staticmethod
+    def get_tasks_by_due_window(db: Session, user_id: str, now: datetime,
+                                limit: int = 10) -> dict:
+        """Open tasks assigned to the user: the first ``limit`` of every due
+        window, soonest first, with the window totals."""
+        today = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        due_window = case(
+            (Task.due_date.is_(None), 'no_due_date'),
+            (Task.due_date < today, 'overdue'),
+            (Task.due_date < today + timedelta(days=1), 'today'),
+            (Task.due_date < today + timedelta(days=7), 'this_week'),
+            else_='later'
+        )
+        projection = TASK_ROW.default
+        window = {'partition_by': due_window}
+        ranked = projection.select().add_columns(
+            due_window.label('due_window'),
+            func.row_number().over(order_by=(Task.due_date, Task.id), **window).label('window_rank'),
+            func.count().over(**window).label('window_total'),
+        ).where(
+            Task.assignee_id == user_id,
+            Task.status != TaskStatus.DONE,
+            Task.project_id.in_(MemberService.member_project_ids(user_id))
+        ).subquery()
+        rows = db.execute(
+            ranked.select()
+            .where(ranked.c.window_rank <= limit)
+            .order_by(ranked.c.due_window, ranked.c.window_rank)
+        ).all()
+
+        width = len(projection.columns)
+        windows = {
+            name: {'tasks': ProjectedRows(projection), 'total': 0}
+            for name in DUE_WINDOWS
+        }
+        for row in rows:
+            windows[row[width]]['tasks'].append(row)
+            windows[row[width]]['total'] = row[width + 2]
+        return windows
+
+    @staticmethod
+    def get_owned_projects(db: Session, user_id: str, limit: int = 10) -> ProjectedRows:
+        """Most recently updated owned projects with task and member counts."""
+        projection = PROJECT_SUMMARY_ROW.default
+        return projection.all(db, projection.select()
+            .where(Project.owner_id == user_id, Project.deleted_at.is_(None))
+            .order_by(Project.updated_at.desc())
+            .limit(limit))
+
+    @staticmethod
+    def get_recent_comments(db: Session, user_id: str, limit: int = 10) -> ProjectedRows:
+        """Newest comments by others on tasks the user is assigned to or
+        created."""
+        projection = COMMENT_ACTIVITY_ROW
+        return projection.all(db, projection.select()
+            .join(Task, Task.id == Comment.task_id)
+            .join(User, User.id == Comment.author_id)
+            .where(
+                or_(Task.assignee_id == user_id, Task.creator_id == user_id),
+                Comment.author_id != user_id,
+                Task.project_id.in_(MemberService.member_project_ids(user_id))
+            )
+            .order_by(Comment.created_at.desc())
+            .limit(limit))
+
+
+__all__ = ['OverviewService', 'OVERVIEW_SECTIONS', 'OVERVIEW_MAX_LIMIT', 'DUE_WINDOWS']
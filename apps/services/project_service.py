@@ -1,9 +1,26 @@
+import os
 from typing import Optional, List, Tuple
+from sqlalchemy import delete, select
 from sqlalchemy.orm import Session
 from datetime import datetime
 
 from apps.models.project import Project, ProjectStatus
+from apps.models.task import Task
+from apps.models.comment import Comment
+from apps.models.notification import Notification
 from apps.models.user import User
+from apps.models.project_member import ProjectMember, ProjectRole
+from apps.models.projections import PROJECT_ROW
+from apps.utils.serialization import Projection, ProjectedRows
+from apps.utils.multi_get import fetch_by_ids
+from apps.utils import events
+from apps.models.job import Job
+from apps.services.job_service import JobService, job_handler, PRIORITY_LOW
+from apps.services.job_worker import wake_job_workers
+from apps.services.member_service import MemberService
+from apps.utils.permissions import permission_index
+
+PROJECT_PURGE_BATCH_SIZE = int(os.getenv('PROJECT_PURGE_BATCH_SIZE', 500))
 
 
 class ProjectService:
@@ -23,7 +40,15 @@ class ProjectService:
             )
             
             db.add(new_project)
+            db.flush()
+            success, message, _ = MemberService.add_member(
+                db, new_project.id, owner_id, ProjectRole.OWNER, commit=False
+            )
+            if not success:
+                db.rollback()
+                return False, message, None
             db.commit()
+            permission_index.invalidate(owner_id)
             db.refresh(new_project)
             
             return True, "Tạo dự án thành công", new_project
@@ -34,7 +59,9 @@ class ProjectService:
     @staticmethod
     def get_project_by_id(db: Session, project_id: str) -> Optional[Project]:
         try:
-            return db.query(Project).filter(Project.id == project_id).first()
+            return db.query(Project)\
+                .filter(Project.id == project_id, Project.deleted_at.is_(None))\
+                .first()
         except:
             return None
     
@@ -42,15 +69,46 @@ class ProjectService:
     def get_projects_by_owner(db: Session, owner_id: str, 
                              skip: int = 0, limit: int = 100) -> List[Project]:
         return db.query(Project)\
-            .filter(Project.owner_id == owner_id)\
+            .filter(Project.owner_id == owner_id, Project.deleted_at.is_(None))\
             .offset(skip)\
             .limit(limit)\
             .all()
     
     @staticmethod
-    def get_all_projects(db: Session, skip: int = 0, 
+    def get_all_projects(db: Session, user_id: str, skip: int = 0, 
                         limit: int = 100) -> List[Project]:
-        return db.query(Project).offset(skip).limit(limit).all()
+        """Projects ``user_id`` is a member of."""
+        return db.query(Project)\
+            .join(ProjectMember, ProjectMember.project_id == Project.id)\
+            .filter(ProjectMember.user_id == user_id, Project.deleted_at.is_(None))\
+            .offset(skip)\
+            .limit(limit)\
+            .all()
+    
+    @staticmethod
+    def get_project_rows_by_owner(db: Session, owner_id: str,
+                                  skip: int = 0, limit: int = 100,
+                                  projection: Projection = PROJECT_ROW.default) -> ProjectedRows:
+        return projection.all(db, projection.select()
+            .where(Project.owner_id == owner_id, Project.deleted_at.is_(None))
+            .offset(skip)
+            .limit(limit))
+    
+    @staticmethod
+    def get_all_project_rows(db: Session, user_id: str, skip: int = 0, limit: int = 100,
+                             projection: Projection = PROJECT_ROW.default) -> ProjectedRows:
+        return projection.all(db, projection.select()
+            .join(ProjectMember, ProjectMember.project_id == Project.id)
+            .where(ProjectMember.user_id == user_id, Project.deleted_at.is_(None))
+            .offset(skip)
+            .limit(limit))
+    
+    @staticmethod
+    def get_project_rows_by_ids(db: Session, user_id: str, ids: List[str],
+                                projection: Projection = PROJECT_ROW.default) -> Tuple[ProjectedRows, List[str]]:
+        """``?ids=`` lookup; projects the user is not a member of count as missing."""
+        return fetch_by_ids(db, projection, Project.id, ids,
+                            Project.id.in_(MemberService.member_project_ids(user_id)))
     
     @staticmethod
     def update_project(db: Session, project_id: str, 
@@ -73,19 +131,92 @@ class ProjectService:
             return False, f"Lỗi khi cập nhật: {str(e)}", None
     
     @staticmethod
-    def delete_project(db: Session, project_id: str) -> Tuple[bool, str]:
+    def delete_project(db: Session, project_id: str,
+                       actor_id: str = None) -> Tuple[bool, str, Optional[Job]]:
+        """Hide the project now and queue a job that purges its rows."""
         try:
             project = ProjectService.get_project_by_id(db, project_id)
             if not project:
-                return False, "Dự án không tồn tại"
+                return False, "Dự án không tồn tại", None
             
-            db.delete(project)
+            project.deleted_at = datetime.utcnow()
+            events.publish(db, project.id, 'project.deleted', {'id': str(project.id)})
+            job = ProjectService.schedule_purge(db, project.id, actor_id)
             db.commit()
+            permission_index.invalidate_project(project.id)
+            
+            wake_job_workers()
             
-            return True, "Xóa dự án thành công"
+            return True, "Xóa dự án thành công", job
         except Exception as e:
             db.rollback()
-            return False, f"Lỗi khi xóa: {str(e)}"
+            return False, f"Lỗi khi xóa: {str(e)}", None
+    
+    @staticmethod
+    def schedule_purge(db: Session, project_id, actor_id: str = None) -> Job:
+        """Arrange for ``purge_deleted_projects`` to run for a soft-deleted
+        project, in the caller's transaction (no commit)."""
+        return JobService.enqueue(db, 'project.purge', {'project_id': str(project_id)},
+                                  priority=PRIORITY_LOW, created_by=actor_id, commit=False)
+    
+    @staticmethod
+    def purge_deleted_projects(db: Session, project_id: str = None,
+                               batch_size: int = PROJECT_PURGE_BATCH_SIZE) -> Optional[int]:
+        """Delete one batch of a soft-deleted project's rows (any such
+        project unless ``project_id`` is given), in one short transaction.
+        Returns the number of rows removed: 0 when there is nothing left,
+        None when what is left is locked by another purge.
+        
+        Notifications, then comments, then tasks, then the project itself,
+        so no single statement has to cascade into a large subtree.
+        """
+        try:
+            statement = select(Project.id)\
+                .where(Project.deleted_at.isnot(None))\
+                .order_by(Project.deleted_at)\
+                .limit(1)\
+                .with_for_update(skip_locked=True)
+            if project_id is not None:
+                statement = statement.where(Project.id == project_id)
+            locked_id = db.execute(statement).scalar()
+            if locked_id is None:
+                # SKIP LOCKED hides rows another purge holds; they still count.
+                pending = select(Project.id).where(Project.deleted_at.isnot(None))
+                if project_id is not None:
+                    pending = pending.where(Project.id == project_id)
+                busy = db.execute(pending.limit(1)).scalar() is not None
+                db.rollback()
+                return None if busy else 0
+            project_id = locked_id
+            
+            project_tasks = select(Task.id).where(Task.project_id == project_id)
+            batches = (
+                (Notification, select(Notification.id)
+                    .where(Notification.task_id.in_(project_tasks))),
+                (Comment, select(Comment.id)
+                    .where(Comment.task_id.in_(project_tasks))),
+                (Task, project_tasks),
+            )
+            for model, ids in batches:
+                deleted = db.execute(
+                    delete(model)
+                    .where(model.id.in_(ids.limit(batch_size)))
+                    .execution_options(synchronize_session=False)
+                ).rowcount
+                if deleted:
+                    db.commit()
+                    return deleted
+            
+            db.execute(
+                delete(Project)
+                .where(Project.id == project_id)
+                .execution_options(synchronize_session=False)
+            )
+            db.commit()
+            return 1
+        except Exception:
+            db.rollback()
+            raise
     
     @staticmethod
     def change_project_status(db: Session, project_id: str, 
@@ -95,3 +226,17 @@ class ProjectService:
     @staticmethod
     def project_to_dict(project: Project) -> dict:
         return project.to_dict()
+
+
+@job_handler('project.purge')
+def purge_project_job(db: Session, payload: dict) -> dict:
+    """Purge one soft-deleted project, or every one without ``project_id``."""
+    removed = 0
+    while True:
+        deleted = ProjectService.purge_deleted_projects(db, payload.get('project_id'))
+        if deleted is None:
+            # Raising puts the job back with a backoff instead of calling it done.
+            raise RuntimeError(f"Project purge is locked by another run after {removed} rows")
+        if not deleted:
+            return {'rows_deleted': removed}
+        removed += deleted
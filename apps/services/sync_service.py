@@ -0,0 +1,231 @@
+"""
+Delta sync for offline clients.
+
+Every insert or update of a project, task or comment stamps the row's
+``change_seq``, and every delete writes a ``Tombstone`` with the same
+stamp. A client keeps the cursor from its last ``/api/sync`` call and gets
+back only what changed after it.
+
+On Postgres the stamp is the writing transaction's id, and a sync only
+returns stamps below the oldest transaction still running
+(``pg_snapshot_xmin``). That makes the cursor safe against commit order: a
+transaction that started earlier but commits later is picked up by the
+next sync instead of falling behind the cursor. Other backends use
+max + 1, which is enough for a single SQLite writer.
+"""
+import os
+from typing import Optional
+
+from sqlalchemy import and_, event, func, inspect, or_, select, text, union_all
+from sqlalchemy.orm import Session
+
+from apps.models.project import Project
+from apps.models.task import Task
+from apps.models.comment import Comment
+from apps.models.tombstone import Tombstone
+from apps.models.project_member import ProjectMember
+from apps.models.projections import PROJECT_ROW, TASK_ROW, COMMENT_ROW
+from apps.utils.serialization import ProjectedRows
+from apps.services.member_service import MemberService
+
+SYNC_MAX_CHANGES = int(os.getenv('SYNC_MAX_CHANGES', 1000))
+
+_SYNCED = (Project, Task, Comment)
+
+
+def _is_postgres(db: Session) -> bool:
+    return db.get_bind().dialect.name == 'postgresql'
+
+
+def _next_local_seq(db: Session) -> int:
+    stamps = union_all(*(
+        select(func.max(model.change_seq).label('seq'))
+        for model in (Project, Task, Comment, Tombstone)
+    )).subquery()
+    return (db.execute(select(func.max(stamps.c.seq))).scalar() or 0) + 1
+
+
+def _current_change_seq(db: Session) -> int:
+    """The stamp for this transaction's writes, fetched once."""
+    seq = db.info.get('change_seq')
+    if seq is None:
+        if _is_postgres(db):
+            seq = db.execute(text("SELECT pg_current_xact_id()::text::bigint")).scalar()
+        else:
+            seq = _next_local_seq(db)
+        db.info['change_seq'] = seq
+    return seq
+
+
+def _project_tombstones(db: Session, project: Project, seq: int) -> list:
+    # One per user who could see it; afterwards nobody can.
+    audience = {project.owner_id} | set(db.execute(
+        select(ProjectMember.user_id).where(ProjectMember.project_id == project.id)
+    ).scalars())
+    return [
+        Tombstone(entity_type='project', entity_id=project.id, project_id=project.id,
+                  user_id=user_id, change_seq=seq)
+        for user_id in audience
+    ]
+
+
+def _tombstones(db: Session, deleted, seq: int) -> list:
+    """Tombstones for objects deleted in this flush.
+
+    Children of a deleted project or task get none: the parent's tombstone
+    covers them (and with DB-level cascades they are never loaded anyway).
+    """
+    projects = {obj.id: obj for obj in deleted if isinstance(obj, Project)}
+    tasks = {obj.id for obj in deleted if isinstance(obj, Task)}
+    stones = []
+    for project in projects.values():
+        stones.extend(_project_tombstones(db, project, seq))
+    for obj in deleted:
+        if isinstance(obj, Task) and obj.project_id not in projects:
+            stones.append(Tombstone(entity_type='task', entity_id=obj.id, project_id=obj.project_id,
+                                    user_id=obj.assignee_id, change_seq=seq))
+        elif isinstance(obj, Comment) and obj.task_id not in tasks:
+            project_id = obj.task.project_id
+            if project_id not in projects:
+                stones.append(Tombstone(entity_type='comment', entity_id=obj.id,
+                                        project_id=project_id, change_seq=seq))
+    return stones
+
+
+def _soft_deleted(obj) -> bool:
+    return isinstance(obj, Project) and bool(inspect(obj).attrs.deleted_at.history.added)
+
+
+@event.listens_for(Session, 'before_flush')
+def _stamp_changes(session, flush_context, instances):
+    seq = None
+    for obj in session.new:
+        if type(obj) in _SYNCED:
+            seq = seq or _current_change_seq(session)
+            obj.change_seq = seq
+    for obj in session.dirty:
+        if type(obj) in _SYNCED and session.is_modified(obj, include_collections=False):
+            seq = seq or _current_change_seq(session)
+            obj.change_seq = seq
+            # Soft delete: the project drops out of every sync right away.
+            if _soft_deleted(obj):
+                session.add_all(_project_tombstones(session, obj, seq))
+    # Session.delete() has already cascaded to loaded children, so they are
+    # in this list too.
+    deleted = [obj for obj in session.deleted if type(obj) in _SYNCED]
+    if deleted:
+        seq = seq or _current_change_seq(session)
+        session.add_all(_tombstones(session, deleted, seq))
+    # A removed member can no longer see the project.
+    for obj in session.deleted:
+        if isinstance(obj, ProjectMember):
+            seq = seq or _current_change_seq(session)
+            session.add(Tombstone(entity_type='project', entity_id=obj.project_id,
+                                  project_id=obj.project_id, user_id=obj.user_id, change_seq=seq))
+
+
+@event.listens_for(Session, 'after_transaction_end')
+def _reset_change_seq(session, transaction):
+    if transaction.parent is None:
+        session.info.pop('change_seq', None)
+
+
+class SyncService:
+
+    @staticmethod
+    def high_water_mark(db: Session) -> int:
+        """Every stamp below this belongs to a finished transaction."""
+        if _is_postgres(db):
+            return db.execute(
+                text("SELECT pg_snapshot_xmin(pg_current_snapshot())::text::bigint")
+            ).scalar()
+        return _next_local_seq(db)
+
+    @staticmethod
+    def visible_project_ids(user_id: str):
+        """Projects the user is a member of."""
+        return MemberService.member_project_ids(user_id)
+
+    @staticmethod
+    def get_changes(db: Session, user_id: str, since: int,
+                    limit: int = SYNC_MAX_CHANGES) -> dict:
+        """Rows changed in ``[since, cursor)`` plus tombstones.
+
+        At most ``limit`` rows per kind; with ``has_more`` the client calls
+        again with the returned cursor. A deleted project or task implies
+        everything under it, which has no tombstones of its own.
+        """
+        high = max(SyncService.high_water_mark(db), since)
+        visible = SyncService.visible_project_ids(user_id)
+
+        queries = {
+            'projects': (PROJECT_ROW, PROJECT_ROW.select()
+                .add_columns(Project.change_seq)
+                .where(Project.id.in_(visible)),
+                Project.change_seq),
+            'tasks': (TASK_ROW, TASK_ROW.select()
+                .add_columns(Task.change_seq)
+                .where(Task.project_id.in_(visible)),
+                Task.change_seq),
+            'comments': (COMMENT_ROW, COMMENT_ROW.select()
+                .add_columns(Comment.change_seq)
+                .join(Task, Task.id == Comment.task_id)
+                .where(Task.project_id.in_(visible)),
+                Comment.change_seq),
+            'tombstones': (None, select(Tombstone)
+                .where(or_(
+                    # Project tombstones are per user (see _project_tombstones).
+                    and_(Tombstone.project_id.in_(visible), Tombstone.entity_type != 'project'),
+                    Tombstone.user_id == user_id
+                )),
+                Tombstone.change_seq),
+        }
+
+        def fetch(statement, seq_column, lower, upper, page: Optional[int]):
+            statement = statement.where(seq_column >= lower, seq_column < upper)\
+                .order_by(seq_column)
+            if page is not None:
+                statement = statement.limit(page)
+            return db.execute(statement).all()
+
+        results = {
+            name: fetch(statement, seq_column, since, high, limit + 1)
+            for name, (_, statement, seq_column) in queries.items()
+        }
+
+        # Stop the page where the first kind ran out of room; rows at or
+        # past that stamp come in the next call.
+        cursor = min(
+            (_seq(rows[limit]) for rows in results.values() if len(rows) > limit),
+            default=None
+        )
+        if cursor is None:
+            cursor = high
+        elif cursor == since:
+            # One transaction wrote more than a page; send all of it.
+            cursor = since + 1
+            results = {
+                name: fetch(statement, seq_column, since, cursor, None)
+                for name, (_, statement, seq_column) in queries.items()
+            }
+        results = {
+            name: [row for row in rows if _seq(row) < cursor]
+            for name, rows in results.items()
+        }
+
+        data = {
+            name: ProjectedRows(projection, results[name])
+            for name, (projection, _, _) in queries.items() if projection is not None
+        }
+        data['tombstones'] = [row[0].to_dict() for row in results['tombstones']]
+        data['cursor'] = cursor
+        data['has_more'] = cursor < high
+        return data
+
+
+def _seq(row) -> int:
+    value = row[-1]
+    return value if isinstance(value, int) else value.change_seq
+
+
+__all__ = ['SyncService', 'SYNC_MAX_CHANGES']
@@ -1,8 +1,32 @@
+import base64
+import uuid
 from typing import Optional, List, Tuple
+from sqlalchemy import func, tuple_
 from sqlalchemy.orm import Session
 from datetime import datetime
 
 from apps.models.task import Task, TaskStatus, TaskPriority
+from apps.models.project import Project
+from apps.models.projections import TASK_ROW
+from apps.utils.serialization import Projection, ProjectedRows
+from apps.utils.multi_get import fetch_by_ids
+from apps.services.notification_service import NotificationService
+from apps.services.member_service import MemberService
+from apps.utils import events
+
+
+def encode_board_cursor(position: float, task_id) -> str:
+    raw = f"{position!r}|{task_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_board_cursor(cursor: str) -> Optional[Tuple[float, uuid.UUID]]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode()
+        position, task_id = raw.split('|')
+        return float(position), uuid.UUID(task_id)
+    except (ValueError, UnicodeDecodeError):
+        return None
 
 
 class TaskService:
@@ -21,10 +45,16 @@ class TaskService:
                 project_id=project_id,
                 assignee_id=assignee_id,
                 creator_id=creator_id,
-                due_date=due_date
+                due_date=due_date,
+                position=TaskService.next_position(db, project_id, TaskStatus.TODO)
             )
             
             db.add(new_task)
+            if assignee_id:
+                db.flush()
+                NotificationService.record_task_assigned(db, new_task, creator_id)
+            db.flush()
+            events.publish(db, project_id, 'task.created', TaskService.task_event_data(new_task))
             db.commit()
             db.refresh(new_task)
             
@@ -35,8 +65,12 @@ class TaskService:
     
     @staticmethod
     def get_task_by_id(db: Session, task_id: str) -> Optional[Task]:
+        """A task whose project has not been deleted."""
         try:
-            return db.query(Task).filter(Task.id == task_id).first()
+            return db.query(Task)\
+                .join(Project, Project.id == Task.project_id)\
+                .filter(Task.id == task_id, Project.deleted_at.is_(None))\
+                .first()
         except:
             return None
     
@@ -68,17 +102,131 @@ class TaskService:
             .all()
     
     @staticmethod
-    def update_task(db: Session, task_id: str,
+    def get_task_rows_by_project(db: Session, project_id: str,
+                                 skip: int = 0, limit: int = 100,
+                                 projection: Projection = TASK_ROW.default) -> ProjectedRows:
+        return projection.all(db, projection.select()
+            .where(Task.project_id == project_id)
+            .offset(skip)
+            .limit(limit))
+    
+    @staticmethod
+    def get_task_rows_by_ids(db: Session, user_id: str, ids: List[str],
+                             projection: Projection = TASK_ROW.default) -> Tuple[ProjectedRows, List[str]]:
+        """``?ids=`` lookup; tasks outside the user's projects count as missing."""
+        return fetch_by_ids(db, projection, Task.id, ids,
+                            Task.project_id.in_(MemberService.member_project_ids(user_id)))
+    
+    @staticmethod
+    def get_task_rows_by_assignee(db: Session, assignee_id: str,
+                                  skip: int = 0, limit: int = 100,
+                                  projection: Projection = TASK_ROW.default) -> ProjectedRows:
+        """Assigned tasks in projects the assignee still belongs to."""
+        return projection.all(db, projection.select()
+            .where(Task.assignee_id == assignee_id,
+                   Task.project_id.in_(MemberService.member_project_ids(assignee_id)))
+            .offset(skip)
+            .limit(limit))
+    
+    @staticmethod
+    def next_position(db: Session, project_id, status: TaskStatus) -> float:
+        last = db.query(func.max(Task.position))\
+            .filter(Task.project_id == project_id, Task.status == status)\
+            .scalar()
+        return (last or 0) + 1
+    
+    @staticmethod
+    def get_board(db: Session, project_id: str, limit: int = 20,
+                  projection: Projection = TASK_ROW.default) -> List[dict]:
+        """First ``limit`` tasks of every status column with the column totals,
+        in one windowed query."""
+        window = {'partition_by': Task.status}
+        ranked = projection.select().add_columns(
+            Task.status.label('board_status'),
+            Task.position.label('board_position'),
+            Task.id.label('board_id'),
+            func.row_number().over(order_by=(Task.position, Task.id), **window).label('board_rank'),
+            func.count().over(**window).label('board_total'),
+        ).where(Task.project_id == project_id).subquery()
+        rows = db.execute(
+            ranked.select()
+            .where(ranked.c.board_rank <= limit)
+            .order_by(ranked.c.board_status, ranked.c.board_rank)
+        ).all()
+        
+        width = len(projection.columns)
+        tasks = {status: ProjectedRows(projection) for status in TaskStatus}
+        totals = dict.fromkeys(TaskStatus, 0)
+        for row in rows:
+            if row[width] in tasks:
+                tasks[row[width]].append(row)
+                totals[row[width]] = row[width + 4]
+        
+        board = []
+        for status in TaskStatus:
+            column, next_cursor = tasks[status], None
+            if totals[status] > len(column):
+                next_cursor = encode_board_cursor(column[-1][width + 1], column[-1][width + 2])
+            board.append({
+                'status': status.value,
+                'tasks': column,
+                'total': totals[status],
+                'next_cursor': next_cursor
+            })
+        return board
+    
+    @staticmethod
+    def get_board_column(db: Session, project_id: str, status: TaskStatus,
+                         cursor: Optional[str] = None, limit: int = 20,
+                         projection: Projection = TASK_ROW.default) -> Tuple[bool, str, Optional[dict]]:
+        """The next page of one column, after ``cursor``."""
+        statement = projection.select().add_columns(Task.position, Task.id)\
+            .where(Task.project_id == project_id, Task.status == status)
+        if cursor:
+            after = decode_board_cursor(cursor)
+            if after is None:
+                return False, "Cursor không hợp lệ", None
+            statement = statement.where(tuple_(Task.position, Task.id) > after)
+        rows = db.execute(statement.order_by(Task.position, Task.id).limit(limit + 1)).all()
+        
+        width = len(projection.columns)
+        tasks = ProjectedRows(projection, rows[:limit])
+        next_cursor = None
+        if len(rows) > limit:
+            last = tasks[-1]
+            next_cursor = encode_board_cursor(last[width], last[width + 1])
+        return True, "OK", {
+            'status': status.value,
+            'tasks': tasks,
+            'next_cursor': next_cursor
+        }
+    
+    @staticmethod
+    def update_task(db: Session, task_id: str, actor_id: str = None,
                    **kwargs) -> Tuple[bool, str, Optional[Task]]:
         try:
             task = TaskService.get_task_by_id(db, task_id)
             if not task:
                 return False, "Task không tồn tại", None
             
+            previous_assignee = str(task.assignee_id) if task.assignee_id else None
+            
+            # A card moved to another column goes to its end unless the
+            # client placed it explicitly.
+            status = kwargs.get('status')
+            if status is not None and status != task.status and kwargs.get('position') is None:
+                kwargs['position'] = TaskService.next_position(db, task.project_id, status)
+            
             for key, value in kwargs.items():
                 if hasattr(task, key) and value is not None:
                     setattr(task, key, value)
             
+            if task.assignee_id and str(task.assignee_id) != previous_assignee:
+                NotificationService.record_task_assigned(db, task, actor_id)
+            
+            changed = [key for key, value in kwargs.items() if hasattr(task, key) and value is not None]
+            events.publish(db, task.project_id, 'task.updated',
+                           TaskService.task_event_data(task, changed))
             db.commit()
             db.refresh(task)
             
@@ -94,6 +242,7 @@ class TaskService:
             if not task:
                 return False, "Task không tồn tại"
             
+            events.publish(db, task.project_id, 'task.deleted', {'id': str(task.id)})
             db.delete(task)
             db.commit()
             
@@ -108,9 +257,31 @@ class TaskService:
         return TaskService.update_task(db, task_id, status=status)
     
     @staticmethod
-    def assign_task(db: Session, task_id: str,
-                   assignee_id: str) -> Tuple[bool, str, Optional[Task]]:
-        return TaskService.update_task(db, task_id, assignee_id=assignee_id)
+    def assign_task(db: Session, task_id: str, assignee_id: str,
+                   actor_id: str = None) -> Tuple[bool, str, Optional[Task]]:
+        return TaskService.update_task(db, task_id, actor_id=actor_id, assignee_id=assignee_id)
+    
+    @staticmethod
+    def task_event_data(task: Task, fields=None) -> dict:
+        """Compact payload for live events: id, board placement and the
+        changed fields (all board fields when ``fields`` is None)."""
+        data = {
+            'id': str(task.id),
+            'status': task.status.value,
+            'position': task.position,
+        }
+        for key in fields if fields is not None else ('title', 'priority', 'assignee_id', 'due_date'):
+            if key == 'description':
+                continue
+            value = getattr(task, key)
+            if hasattr(value, 'value'):
+                value = value.value
+            elif isinstance(value, datetime):
+                value = value.isoformat()
+            elif isinstance(value, uuid.UUID):
+                value = str(value)
+            data[key] = value
+        return data
     
     @staticmethod
     def task_to_dict(task: Task) -> dict:
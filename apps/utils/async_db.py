@@ -0,0 +1,61 @@
+import os
+from typing import Optional
+
+from dotenv import load_dotenv
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+
+load_dotenv()
+
+from apps.utils.metrics import instrument_engine
+from apps.utils import sql_profiler
+
+ASYNC_DATABASE_URL = os.getenv('ASYNC_DATABASE_URL') or (
+    f"postgresql+asyncpg://{os.getenv('DB_USER')}:{os.getenv('DB_PASSWORD')}"
+    f"@{os.getenv('DB_HOST')}:{os.getenv('DB_PORT')}/{os.getenv('DB_NAME')}"
+)
+
+_engine: Optional[AsyncEngine] = None
+_sessionmaker: Optional[async_sessionmaker] = None
+
+
+def get_async_engine() -> AsyncEngine:
+    """Create the asyncio engine on first use.
+
+    Only the ASGI entry point needs it, so the sync app never imports the
+    asyncpg driver.
+    """
+    global _engine, _sessionmaker
+    if _engine is None:
+        pool_options = {}
+        if make_url(ASYNC_DATABASE_URL).get_backend_name() != 'sqlite':
+            pool_options = dict(
+                pool_size=int(os.getenv('ASYNC_DB_POOL_SIZE', 20)),
+                max_overflow=int(os.getenv('ASYNC_DB_MAX_OVERFLOW', 20)),
+                pool_recycle=int(os.getenv('DB_POOL_RECYCLE', 1800))
+            )
+        _engine = create_async_engine(
+            ASYNC_DATABASE_URL,
+            echo=os.getenv('SQL_ECHO', 'False') == 'True',
+            **pool_options
+        )
+        instrument_engine(_engine.sync_engine)
+        sql_profiler.instrument_engine(_engine.sync_engine)
+        _sessionmaker = async_sessionmaker(_engine, expire_on_commit=False, autoflush=False)
+    return _engine
+
+
+def AsyncSessionLocal():
+    get_async_engine()
+    return _sessionmaker()
+
+
+async def dispose_async_engine() -> None:
+    global _engine, _sessionmaker
+    if _engine is not None:
+        await _engine.dispose()
+        _engine = None
+        _sessionmaker = None
+
+
+__all__ = ['get_async_engine', 'AsyncSessionLocal', 'dispose_async_engine']
@@ -0,0 +1,103 @@
+"""
+Response compression shared by the Flask middleware and the ASGI router.
+
+gzip is always available; brotli is used when the ``brotli`` package is
+installed and the client prefers it. Bodies below ``COMPRESS_MIN_SIZE``
+bytes are sent as-is, since the framing costs more than it saves.
+"""
+import os
+import zlib
+from typing import Iterable, Iterator, NamedTuple, Optional
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+COMPRESS_MIN_SIZE = int(os.getenv('COMPRESS_MIN_SIZE', 1024))
+COMPRESS_GZIP_LEVEL = int(os.getenv('COMPRESS_GZIP_LEVEL', 6))
+COMPRESS_BROTLI_LEVEL = int(os.getenv('COMPRESS_BROTLI_LEVEL', 5))
+COMPRESS_MIMETYPES = frozenset(
+    value.strip() for value in os.getenv(
+        'COMPRESS_MIMETYPES',
+        'application/json,application/msgpack,application/x-msgpack,application/vnd.msgpack,'
+        'text/plain,text/html,text/csv'
+    ).split(',') if value.strip()
+)
+
+
+class CompressionPolicy(NamedTuple):
+    enabled: bool = True
+    min_size: int = COMPRESS_MIN_SIZE
+    gzip_level: int = COMPRESS_GZIP_LEVEL
+    brotli_level: int = COMPRESS_BROTLI_LEVEL
+
+
+DEFAULT_POLICY = CompressionPolicy()
+
+# Server preference when the client rates several encodings equally.
+_PREFERENCE = ('br', 'gzip') if brotli is not None else ('gzip',)
+
+
+def negotiate(accept_encoding: Optional[str]) -> Optional[str]:
+    """Pick ``br`` or ``gzip`` from an Accept-Encoding header, or None."""
+    if not accept_encoding:
+        return None
+    weights = {}
+    for item in accept_encoding.split(','):
+        coding, _, params = item.strip().partition(';')
+        quality = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        weights[coding.strip().lower()] = quality
+
+    wildcard = weights.get('*')
+    best, best_quality = None, 0.0
+    for coding in _PREFERENCE:
+        quality = weights.get(coding, wildcard if wildcard is not None else 0.0)
+        if quality > best_quality:
+            best, best_quality = coding, quality
+    return best
+
+
+def compressible(mimetype: Optional[str]) -> bool:
+    return mimetype in COMPRESS_MIMETYPES
+
+
+def compress(data: bytes, encoding: str, policy: CompressionPolicy = DEFAULT_POLICY) -> bytes:
+    if encoding == 'br':
+        return brotli.compress(data, quality=policy.brotli_level)
+    compressor = zlib.compressobj(policy.gzip_level, zlib.DEFLATED, 31)
+    return compressor.compress(data) + compressor.flush()
+
+
+def compress_stream(chunks: Iterable[bytes], encoding: str,
+                    policy: CompressionPolicy = DEFAULT_POLICY) -> Iterator[bytes]:
+    """Compress a streamed body, flushing after every chunk so the client
+    sees each piece as soon as the app yields it."""
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality=policy.brotli_level)
+        for chunk in chunks:
+            if chunk:
+                yield compressor.process(chunk) + compressor.flush()
+        yield compressor.finish()
+    else:
+        compressor = zlib.compressobj(policy.gzip_level, zlib.DEFLATED, 31)
+        for chunk in chunks:
+            if chunk:
+                yield compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        yield compressor.flush()
+
+
+__all__ = [
+    'CompressionPolicy',
+    'DEFAULT_POLICY',
+    'negotiate',
+    'compressible',
+    'compress',
+    'compress_stream',
+]
@@ -1,15 +1,79 @@
 import os
-from sqlalchemy import create_engine
+from contextlib import contextmanager
+from contextvars import ContextVar
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from dotenv import load_dotenv
 load_dotenv()
-DATABASE_URL = (
-    f"postgresql://{os.getenv('DB_USER')}:{os.getenv('DB_PASSWORD')}"
-    f"@{os.getenv('DB_HOST')}:{os.getenv('DB_PORT')}/{os.getenv('DB_NAME')}"
+from apps.utils.metrics import TimedQueuePool, instrument_engine
+from apps.utils import sql_profiler
+# DB_* wins when set; DATABASE_URL lets local runs and benchmarks point at
+# another Postgres or a SQLite file.
+if os.getenv('DB_HOST') or not os.getenv('DATABASE_URL'):
+    DATABASE_URL = (
+        f"postgresql://{os.getenv('DB_USER')}:{os.getenv('DB_PASSWORD')}"
+        f"@{os.getenv('DB_HOST')}:{os.getenv('DB_PORT')}/{os.getenv('DB_NAME')}"
+    )
+else:
+    DATABASE_URL = os.getenv('DATABASE_URL')
+
+if make_url(DATABASE_URL).get_backend_name() == 'sqlite':
+    engine_options = dict(connect_args={'check_same_thread': False})
+else:
+    engine_options = dict(
+        poolclass=TimedQueuePool,
+        pool_size=int(os.getenv('DB_POOL_SIZE', 5)),
+        max_overflow=int(os.getenv('DB_MAX_OVERFLOW', 10)),
+        pool_recycle=int(os.getenv('DB_POOL_RECYCLE', 1800))
+    )
+engine = create_engine(
+    DATABASE_URL,
+    echo=os.getenv('SQL_ECHO', 'False') == 'True',
+    **engine_options
 )
-engine = create_engine(DATABASE_URL, echo=True)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+if engine.dialect.name == 'sqlite':
+    # ON DELETE CASCADE (tasks, comments) is off in SQLite unless asked for.
+    @event.listens_for(engine, 'connect')
+    def _enable_foreign_keys(dbapi_connection, connection_record):
+        dbapi_connection.execute('PRAGMA foreign_keys=ON')
+        # pysqlite's own BEGIN handling breaks SAVEPOINT, which
+        # shared_connection(atomic=True) relies on; issue BEGIN ourselves.
+        dbapi_connection.isolation_level = None
+    @event.listens_for(engine, 'begin')
+    def _begin(connection):
+        connection.exec_driver_sql('BEGIN')
+instrument_engine(engine)
+sql_profiler.instrument_engine(engine)
+# Set by shared_connection(): sessions opened inside it run on that
+# connection instead of checking one out each.
+_shared_connection: ContextVar = ContextVar('shared_connection', default=None)
+class _SessionFactory(sessionmaker):
+    def __call__(self, **local_kw):
+        connection = _shared_connection.get()
+        if connection is not None and 'bind' not in local_kw:
+            # Inside an outer transaction, commit/rollback only touch a
+            # savepoint; the owner of the connection decides the rest.
+            local_kw.update(bind=connection, join_transaction_mode='create_savepoint')
+        return super().__call__(**local_kw)
+SessionLocal = _SessionFactory(autocommit=False, autoflush=False, bind=engine)
+@contextmanager
+def shared_connection(atomic: bool = False):
+    """Run every ``SessionLocal()`` in the block on one pooled connection.
+
+    With ``atomic`` the block is also one transaction: it is rolled back
+    unless the caller calls ``connection.commit()`` before leaving.
+    """
+    connection = engine.connect()
+    token = _shared_connection.set(connection)
+    try:
+        if atomic:
+            connection.begin()
+        yield connection
+    finally:
+        _shared_connection.reset(token)
+        connection.close()
 Base = declarative_base()
 def get_db():
     db = SessionLocal()
@@ -17,6 +81,19 @@ def get_db():
         yield db
     finally:
         db.close()
+def warm_up(connections: int = 1) -> None:
+    """Open pool connections and fill per-process caches before serving."""
+    from apps.utils.revocation import revocation_cache
+    opened = []
+    try:
+        for _ in range(max(connections, 1)):
+            conn = engine.connect()
+            opened.append(conn)
+            conn.execute(text("SELECT 1"))
+    finally:
+        for conn in opened:
+            conn.close()
+    revocation_cache.maybe_sync()
 def init_db():
     Base.metadata.create_all(bind=engine)
     print("Database initialized successfully!")
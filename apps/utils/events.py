@@ -0,0 +1,342 @@
+"""
+Live project events for the SSE endpoints.
+
+Services call ``publish`` inside the transaction that makes the change. On
+Postgres the event is a ``pg_notify`` on ``EVENTS_CHANNEL``, so it goes out
+only if that transaction commits, and reaches every process. Each process
+runs one ``NotifyListener`` thread that hands events to the ``broker``,
+which fans them out to the subscribed connections. Other backends have no
+NOTIFY; the event is delivered in-process from the session's after_commit
+hook, which is enough for a single dev server.
+
+Recent events are kept in a ring so a client reconnecting with
+``Last-Event-ID`` gets what it missed. Each connection has a bounded
+buffer; one that falls behind is closed and resumes the same way. When the
+id is no longer in the ring the client gets a ``reset`` event and should
+refetch what it shows.
+
+Other per-process caches follow the same stream through ``broker.add_hook``.
+"""
+import asyncio
+import json
+import os
+import queue
+import select
+import threading
+import uuid
+from collections import deque
+from typing import AsyncIterator, Iterator, Optional
+
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+
+from apps.utils.logger import get_logger
+from apps.utils.worker import PeriodicWorker
+
+EVENTS_CHANNEL = os.getenv('EVENTS_CHANNEL', 'project_events')
+SSE_CLIENT_BUFFER = int(os.getenv('SSE_CLIENT_BUFFER', 100))
+SSE_REPLAY_BUFFER = int(os.getenv('SSE_REPLAY_BUFFER', 1000))
+SSE_HEARTBEAT_SECONDS = float(os.getenv('SSE_HEARTBEAT_SECONDS', 15))
+SSE_RETRY_MS = int(os.getenv('SSE_RETRY_MS', 3000))
+EVENTS_RECONNECT_SECONDS = 5
+
+HEARTBEAT_MESSAGE = ': heartbeat\n\n'
+SSE_HEADERS = {
+    'Cache-Control': 'no-cache',
+    # Stop nginx from buffering the stream.
+    'X-Accel-Buffering': 'no',
+}
+
+logger = get_logger(__name__)
+
+
+def streaming(view):
+    """Mark a view whose response is an event stream; such views subscribe
+    to the broker as soon as they are called (see the batch endpoint)."""
+    view.streaming = True
+    return view
+
+
+def publish(db: Session, project_id, type: str, data: dict) -> None:
+    """Queue a change event on the caller's transaction (no commit).
+
+    ``data`` should stay small (ids and the changed fields): NOTIFY payloads
+    are capped at 8000 bytes.
+    """
+    payload = json.dumps({
+        'id': uuid.uuid4().hex,
+        'type': type,
+        'project_id': str(uuid.UUID(str(project_id))),
+        'data': data,
+    }, separators=(',', ':'), default=str)
+
+    if db.get_bind().dialect.name == 'postgresql':
+        db.execute(text("SELECT pg_notify(:channel, :payload)"),
+                   {'channel': EVENTS_CHANNEL, 'payload': payload})
+    else:
+        db.info.setdefault('pending_events', []).append(payload)
+
+
+@event.listens_for(Session, 'after_commit')
+def _deliver_pending_events(session):
+    for payload in session.info.pop('pending_events', ()):
+        broker.dispatch(payload)
+
+
+@event.listens_for(Session, 'after_soft_rollback')
+def _drop_pending_events(session, previous_transaction):
+    session.info.pop('pending_events', None)
+
+
+def format_event(event_id: str, type: str, payload: str) -> str:
+    return f'id: {event_id}\nevent: {type}\ndata: {payload}\n\n'
+
+
+def reset_message(last_event_id: str = '') -> str:
+    # Carries the newest id so the client resumes from here next time
+    # instead of being reset again.
+    return format_event(last_event_id, 'reset', '{}')
+
+
+class Subscription:
+    """One SSE connection's buffer of formatted messages."""
+
+    def __init__(self, project_id: str, maxsize: int = SSE_CLIENT_BUFFER):
+        self.project_id = project_id
+        self.overflowed = False
+        self._queue = queue.Queue(maxsize)
+
+    def put(self, message: str) -> None:
+        try:
+            self._queue.put_nowait(message)
+        except queue.Full:
+            self.overflowed = True
+
+    def get(self, timeout: float = SSE_HEARTBEAT_SECONDS) -> Optional[str]:
+        """Next message, or None after ``timeout`` seconds without one."""
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+
+class AsyncSubscription(Subscription):
+    """Subscription read from an event loop; ``put`` is called from the
+    listener thread."""
+
+    def __init__(self, project_id: str, maxsize: int = SSE_CLIENT_BUFFER):
+        super().__init__(project_id, maxsize)
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue(maxsize)
+
+    def _put(self, message: str) -> None:
+        try:
+            self._queue.put_nowait(message)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+    def put(self, message: str) -> None:
+        self._loop.call_soon_threadsafe(self._put, message)
+
+    async def get(self, timeout: float = SSE_HEARTBEAT_SECONDS) -> Optional[str]:
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class EventBroker:
+    """Per-process fan-out from the listener to subscriptions."""
+
+    def __init__(self, replay_size: int = SSE_REPLAY_BUFFER):
+        self._lock = threading.Lock()
+        self._subscribers = {}
+        # (event id, project id, formatted message), oldest first.
+        self._recent = deque(maxlen=replay_size)
+        self._listener = None
+        self._hooks = []
+
+    def add_hook(self, hook) -> None:
+        """Call ``hook(event)`` with every parsed event, and with None
+        when events may have been missed."""
+        self._hooks.append(hook)
+
+    def subscribe(self, subscription: Subscription, last_event_id: Optional[str] = None) -> Subscription:
+        self.start_listener()
+        with self._lock:
+            self._subscribers.setdefault(subscription.project_id, set()).add(subscription)
+            if last_event_id:
+                ids = [event_id for event_id, _, _ in self._recent]
+                if last_event_id not in ids:
+                    subscription.put(reset_message(ids[-1] if ids else ''))
+                else:
+                    for _, project_id, message in list(self._recent)[ids.index(last_event_id) + 1:]:
+                        if project_id == subscription.project_id:
+                            subscription.put(message)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.project_id)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[subscription.project_id]
+
+    def dispatch(self, payload: str) -> None:
+        try:
+            parsed = json.loads(payload)
+            event_id, project_id = parsed['id'], parsed['project_id']
+            message = format_event(event_id, parsed['type'], payload)
+        except (ValueError, KeyError, TypeError):
+            logger.warning("Ignoring malformed event payload: %.200s", payload)
+            return
+        self._run_hooks(parsed)
+        with self._lock:
+            self._recent.append((event_id, project_id, message))
+            subscribers = list(self._subscribers.get(project_id, ()))
+        for subscription in subscribers:
+            subscription.put(message)
+
+    def reset_all(self) -> None:
+        """Events may have been missed (listener reconnected); tell every
+        client to refetch."""
+        self._run_hooks(None)
+        with self._lock:
+            self._recent.clear()
+            subscribers = [s for group in self._subscribers.values() for s in group]
+        for subscription in subscribers:
+            subscription.put(reset_message())
+
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return sum(len(group) for group in self._subscribers.values())
+
+    def _run_hooks(self, parsed: Optional[dict]) -> None:
+        for hook in self._hooks:
+            try:
+                hook(parsed)
+            except Exception:
+                logger.exception("Event hook %r failed", hook)
+
+    def start_listener(self) -> None:
+        """Start this process's listener (Postgres only); idempotent."""
+        if self._listener is not None:
+            return
+        from apps.utils.db import engine
+        if engine.dialect.name != 'postgresql':
+            return
+        with self._lock:
+            if self._listener is None:
+                self._listener = NotifyListener(self, engine)
+                self._listener.start()
+
+    def stop(self, timeout: float | None = None) -> None:
+        listener, self._listener = self._listener, None
+        if listener is not None:
+            listener.stop(timeout)
+
+
+class NotifyListener(PeriodicWorker):
+    """LISTENs on a dedicated connection taken out of the pool."""
+
+    def __init__(self, broker: EventBroker, engine, channel: str = EVENTS_CHANNEL):
+        super().__init__(name='event-listener', interval=0)
+        self.broker = broker
+        self.engine = engine
+        self.channel = channel
+        self._connection = None
+        self._failed = False
+
+    def _connect(self):
+        if self._failed:
+            self._stopping.wait(EVENTS_RECONNECT_SECONDS)
+        self._failed = True
+        proxied = self.engine.raw_connection()
+        proxied.detach()
+        connection = proxied.dbapi_connection
+        connection.autocommit = True
+        with connection.cursor() as cursor:
+            cursor.execute(f'LISTEN "{self.channel}"')
+        self._failed = False
+        return connection
+
+    def _disconnect(self) -> None:
+        if self._connection is not None:
+            try:
+                self._connection.close()
+            except Exception:
+                pass
+            self._connection = None
+
+    def run_once(self) -> int:
+        if self._stopping.is_set():
+            return 0
+        if self._connection is None:
+            reconnected = self._failed
+            self._connection = self._connect()
+            if reconnected:
+                self.broker.reset_all()
+        try:
+            readable, _, _ = select.select([self._connection], [], [], 1.0)
+            if not readable:
+                return 0
+            self._connection.poll()
+        except Exception:
+            self._disconnect()
+            self._failed = True
+            raise
+        handled = 0
+        while self._connection.notifies:
+            self.broker.dispatch(self._connection.notifies.pop(0).payload)
+            handled += 1
+        return handled
+
+    def stop(self, timeout: float | None = None) -> None:
+        super().stop(timeout)
+        self._disconnect()
+
+
+broker = EventBroker()
+
+
+def stream(subscription: Subscription) -> Iterator[str]:
+    """SSE body for a subscription; unsubscribes when the client goes away."""
+    try:
+        yield f'retry: {SSE_RETRY_MS}\n\n'
+        while not subscription.overflowed:
+            message = subscription.get()
+            yield HEARTBEAT_MESSAGE if message is None else message
+    finally:
+        broker.unsubscribe(subscription)
+
+
+async def astream(subscription: AsyncSubscription) -> AsyncIterator[str]:
+    try:
+        yield f'retry: {SSE_RETRY_MS}\n\n'
+        while not subscription.overflowed:
+            message = await subscription.get()
+            yield HEARTBEAT_MESSAGE if message is None else message
+    finally:
+        broker.unsubscribe(subscription)
+
+
+def stop_event_listener(timeout: float | None = None) -> None:
+    broker.stop(timeout)
+
+
+__all__ = [
+    'publish',
+    'streaming',
+    'broker',
+    'EventBroker',
+    'Subscription',
+    'AsyncSubscription',
+    'NotifyListener',
+    'format_event',
+    'reset_message',
+    'stream',
+    'astream',
+    'stop_event_listener',
+    'SSE_HEADERS',
+]
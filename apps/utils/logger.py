@@ -1,10 +1,26 @@
+import atexit
+import copy
+import itertools
+import json
 import logging
-from logging.handlers import RotatingFileHandler
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
 import os
 from pathlib import Path
+import queue
 import sys
 
 
+_CALLER_FMT = "%(asctime)s %(levelname)s [%(name)s] %(module)s.%(funcName)s:%(lineno)d - %(message)s"
+_PLAIN_FMT = "%(asctime)s %(levelname)s [%(name)s] - %(message)s"
+
+# Attributes every LogRecord has; anything else was passed through ``extra``.
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+# (logfile, max_bytes, backup_count, console, json_format, include_caller) -> QueueHandler
+_queue_handlers: dict = {}
+_listeners: list = []
+
+
 def _project_root() -> Path:
     return Path(__file__).resolve().parents[2]
 
@@ -16,6 +32,146 @@ def _ensure_logs_dir(path: Path) -> None:
         pass
 
 
+def _env_flag(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def _sampling_rates() -> dict:
+    """Parse LOG_SAMPLING, e.g. ``apps.middlewares=100,sqlalchemy.engine=10``."""
+    rates = {}
+    for item in os.getenv("LOG_SAMPLING", "").split(","):
+        logger_name, _, rate = item.partition("=")
+        if logger_name.strip() and rate.strip().isdigit():
+            rates[logger_name.strip()] = int(rate)
+    return rates
+
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per line; ``extra={...}`` fields are kept as keys."""
+
+    def __init__(self, include_caller: bool = True):
+        super().__init__()
+        self.include_caller = include_caller
+
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if self.include_caller:
+            data["caller"] = f"{record.module}.{record.funcName}:{record.lineno}"
+        if record.exc_info:
+            data["exc_info"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            data["exc_info"] = record.exc_text
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS and not key.startswith("_"):
+                data[key] = value
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """Keep one in ``rate`` records at or below ``max_level``; always keep the rest."""
+
+    def __init__(self, rate: int, max_level: int = logging.INFO):
+        super().__init__()
+        self.rate = rate
+        self.max_level = max_level
+        self._counter = itertools.count()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > self.max_level:
+            return True
+        return next(self._counter) % self.rate == 0
+
+
+class _ThreadQueueHandler(QueueHandler):
+    """Records never leave the process, so only the message is resolved here;
+    tracebacks are formatted by the listener thread."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+def _unknown_caller(stack_info: bool = False, stacklevel: int = 1) -> tuple:
+    # Stands in for Logger.findCaller, which walks the stack on every record.
+    return "(unknown file)", 0, "(unknown function)", None
+
+
+def _build_formatter(json_format: bool, include_caller: bool) -> logging.Formatter:
+    if json_format:
+        return JSONFormatter(include_caller=include_caller)
+    return logging.Formatter(_CALLER_FMT if include_caller else _PLAIN_FMT)
+
+
+def _build_handlers(level, logfile, max_bytes, backup_count, console, formatter) -> list:
+    handlers = []
+    try:
+        fh = RotatingFileHandler(logfile, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8")
+        fh.setLevel(level)
+        fh.setFormatter(formatter)
+        handlers.append(fh)
+    except Exception:
+        pass
+
+    if console:
+        ch = logging.StreamHandler(stream=sys.stdout)
+        ch.setLevel(level)
+        ch.setFormatter(formatter)
+        handlers.append(ch)
+    return handlers
+
+
+def _shared_queue_handler(key: tuple, handlers_factory) -> QueueHandler:
+    # Loggers writing to the same destinations share one queue and one
+    # listener thread, so a log file is only ever rotated by one handler.
+    handler = _queue_handlers.get(key)
+    if handler is None:
+        log_queue = queue.SimpleQueue()
+        handler = _ThreadQueueHandler(log_queue)
+        listener = QueueListener(log_queue, *handlers_factory(), respect_handler_level=True)
+        listener.start()
+        _queue_handlers[key] = handler
+        _listeners.append((handler, listener))
+    return handler
+
+
+def _restart_listeners_after_fork() -> None:
+    # Listener threads do not survive fork(); give the child fresh queues
+    # and listeners over the same handlers so records keep being written.
+    for index, (handler, listener) in enumerate(_listeners):
+        log_queue = queue.SimpleQueue()
+        handler.queue = log_queue
+        listener = QueueListener(log_queue, *listener.handlers,
+                                 respect_handler_level=listener.respect_handler_level)
+        listener.start()
+        _listeners[index] = (handler, listener)
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and stop the listener threads."""
+    while _listeners:
+        _, listener = _listeners.pop()
+        try:
+            listener.stop()
+        except Exception:
+            pass
+    _queue_handlers.clear()
+
+
+atexit.register(shutdown_logging)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_restart_listeners_after_fork)
+
+
 def configure_logger(
     name: str | None = None,
     level: int | str = logging.INFO,
@@ -23,8 +179,21 @@ def configure_logger(
     max_bytes: int = 5 * 1024 * 1024,
     backup_count: int = 5,
     console: bool = True,
+    use_queue: bool | None = None,
+    json_format: bool | None = None,
+    include_caller: bool | None = None,
+    sample_rate: int | None = None,
 ) -> logging.Logger:
-    """Configure and return a logger with rotating file and console handlers."""
+    """Configure and return a logger with rotating file and console handlers.
+
+    With ``use_queue`` (env ``LOG_QUEUE``, on by default) the logger only puts
+    records on a queue and a listener thread does the formatting and file
+    I/O. ``json_format`` (``LOG_JSON``) switches to one JSON object per line.
+    ``include_caller`` (``LOG_INCLUDE_CALLER``) set to false drops
+    module/function/line from the output and skips the stack walk that finds
+    them (``stack_info=True`` then logs no stack). ``sample_rate`` (``LOG_SAMPLING``) keeps
+    one in N records at INFO and below for this logger.
+    """
 
     if isinstance(level, str):
         level = logging._nameToLevel.get(level.upper(), logging.INFO)
@@ -36,8 +205,14 @@ def configure_logger(
         logger.setLevel(level)
         return logger
 
-    fmt = "%(asctime)s %(levelname)s [%(name)s] %(module)s.%(funcName)s:%(lineno)d - %(message)s"
-    formatter = logging.Formatter(fmt)
+    if use_queue is None:
+        use_queue = _env_flag("LOG_QUEUE", True)
+    if json_format is None:
+        json_format = _env_flag("LOG_JSON", False)
+    if include_caller is None:
+        include_caller = _env_flag("LOG_INCLUDE_CALLER", True)
+    if sample_rate is None:
+        sample_rate = _sampling_rates().get(name or "root")
 
     if logfile is None:
         proj = _project_root()
@@ -45,19 +220,23 @@ def configure_logger(
         _ensure_logs_dir(logs_dir)
         logfile = str(logs_dir / "app.log")
 
-    try:
-        fh = RotatingFileHandler(logfile, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8")
-        fh.setLevel(level)
-        fh.setFormatter(formatter)
-        logger.addHandler(fh)
-    except Exception:
-        pass
+    def handlers_factory():
+        formatter = _build_formatter(json_format, include_caller)
+        return _build_handlers(logging.NOTSET if use_queue else level,
+                               logfile, max_bytes, backup_count, console, formatter)
 
-    if console:
-        ch = logging.StreamHandler(stream=sys.stdout)
-        ch.setLevel(level)
-        ch.setFormatter(formatter)
-        logger.addHandler(ch)
+    if use_queue:
+        key = (logfile, max_bytes, backup_count, console, json_format, include_caller)
+        logger.addHandler(_shared_queue_handler(key, handlers_factory))
+    else:
+        for handler in handlers_factory():
+            logger.addHandler(handler)
+
+    if not include_caller:
+        logger.findCaller = _unknown_caller
+
+    if sample_rate and sample_rate > 1:
+        logger.addFilter(SamplingFilter(sample_rate))
 
     logger.propagate = False
 
@@ -68,4 +247,10 @@ def get_logger(name: str | None = None) -> logging.Logger:
     return configure_logger(name=name)
 
 
-__all__ = ["get_logger", "configure_logger"]
+__all__ = [
+    "get_logger",
+    "configure_logger",
+    "shutdown_logging",
+    "JSONFormatter",
+    "SamplingFilter",
+]
@@ -0,0 +1,196 @@
+import threading
+import time
+from bisect import bisect_left
+
+from sqlalchemy import event
+from sqlalchemy.pool import QueuePool
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 250)
+
+_lock = threading.Lock()
+_request = threading.local()
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(names, values, extra: str = '') -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return '{' + ','.join(parts) + '}' if parts else ''
+
+
+def _format_number(value) -> str:
+    if isinstance(value, float):
+        return repr(value)
+    return str(value)
+
+
+class Counter:
+
+    def __init__(self, name: str, help: str, labelnames: tuple = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self._values = {}
+
+    def inc(self, labels: tuple = (), amount: float = 1) -> None:
+        with _lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self, lines: list) -> None:
+        lines.append(f'# HELP {self.name} {self.help}')
+        lines.append(f'# TYPE {self.name} counter')
+        for labels, value in sorted(self._values.items()):
+            lines.append(f'{self.name}{_format_labels(self.labelnames, labels)} {_format_number(value)}')
+
+
+class Histogram:
+
+    def __init__(self, name: str, help: str, labelnames: tuple = (),
+                 buckets: tuple = LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self.buckets = buckets
+        self._series = {}
+
+    def observe(self, value: float, labels: tuple = ()) -> None:
+        index = bisect_left(self.buckets, value)
+        with _lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def render(self, lines: list) -> None:
+        lines.append(f'# HELP {self.name} {self.help}')
+        lines.append(f'# TYPE {self.name} histogram')
+        for labels, (counts, total) in sorted(self._series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                le = _format_labels(self.labelnames, labels, f'le="{_format_number(float(bound))}"')
+                lines.append(f'{self.name}_bucket{le} {cumulative}')
+            cumulative += counts[-1]
+            inf = _format_labels(self.labelnames, labels, 'le="+Inf"')
+            lines.append(f'{self.name}_bucket{inf} {cumulative}')
+            lines.append(f'{self.name}_sum{_format_labels(self.labelnames, labels)} {_format_number(total)}')
+            lines.append(f'{self.name}_count{_format_labels(self.labelnames, labels)} {cumulative}')
+
+
+http_requests_total = Counter(
+    'http_requests_total', 'HTTP requests by route and status.',
+    ('method', 'route', 'status')
+)
+http_request_duration_seconds = Histogram(
+    'http_request_duration_seconds', 'HTTP request latency.',
+    ('method', 'route')
+)
+http_request_db_statements = Histogram(
+    'http_request_db_statements', 'SQL statements executed per request.',
+    ('method', 'route'), COUNT_BUCKETS
+)
+http_request_db_seconds = Histogram(
+    'http_request_db_seconds', 'Time spent in SQL per request.',
+    ('method', 'route')
+)
+http_request_pool_wait_seconds = Histogram(
+    'http_request_pool_wait_seconds', 'Time spent waiting for pooled connections per request.',
+    ('method', 'route')
+)
+db_statements_total = Counter(
+    'db_statements_total', 'SQL statements executed, including background workers.'
+)
+db_pool_checkout_seconds = Histogram(
+    'db_pool_checkout_seconds', 'Time spent waiting for a pooled connection.'
+)
+
+REGISTRY = [
+    http_requests_total,
+    http_request_duration_seconds,
+    http_request_db_statements,
+    http_request_db_seconds,
+    http_request_pool_wait_seconds,
+    db_statements_total,
+    db_pool_checkout_seconds,
+]
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waited."""
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            elapsed = time.perf_counter() - start
+            db_pool_checkout_seconds.observe(elapsed)
+            stats = getattr(_request, 'stats', None)
+            if stats is not None:
+                stats[2] += elapsed
+
+
+def instrument_engine(engine) -> None:
+    @event.listens_for(engine, 'before_cursor_execute')
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('query_start', []).append(time.perf_counter())
+
+    @event.listens_for(engine, 'after_cursor_execute')
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info['query_start'].pop()
+        db_statements_total.inc()
+        stats = getattr(_request, 'stats', None)
+        if stats is not None:
+            stats[0] += 1
+            stats[1] += elapsed
+
+
+def begin_request() -> None:
+    # [statements, db seconds, pool wait seconds, start]
+    _request.stats = [0, 0.0, 0.0, time.perf_counter()]
+
+
+def end_request(method: str, route: str, status: int) -> None:
+    stats = getattr(_request, 'stats', None)
+    if stats is None:
+        return
+    _request.stats = None
+    labels = (method, route)
+    http_request_duration_seconds.observe(time.perf_counter() - stats[3], labels)
+    http_request_db_statements.observe(stats[0], labels)
+    http_request_db_seconds.observe(stats[1], labels)
+    http_request_pool_wait_seconds.observe(stats[2], labels)
+    http_requests_total.inc((method, route, str(status)))
+
+
+def render_prometheus(engine=None) -> str:
+    lines = []
+    with _lock:
+        for metric in REGISTRY:
+            metric.render(lines)
+    pool = getattr(engine, 'pool', None)
+    if isinstance(pool, QueuePool):
+        for name, help, value in (
+            ('db_pool_size', 'Configured pool size.', pool.size()),
+            ('db_pool_checked_out', 'Connections currently checked out.', pool.checkedout()),
+            ('db_pool_overflow', 'Connections opened beyond pool_size.', pool.overflow()),
+        ):
+            lines.append(f'# HELP {name} {help}')
+            lines.append(f'# TYPE {name} gauge')
+            lines.append(f'{name} {value}')
+    return '\n'.join(lines) + '\n'
+
+
+__all__ = [
+    'TimedQueuePool',
+    'instrument_engine',
+    'begin_request',
+    'end_request',
+    'render_prometheus',
+]
@@ -0,0 +1,66 @@
+"""
+``?ids=a,b,c`` lookups: many rows of one kind in a single statement.
+
+On PostgreSQL the ids go in as one array parameter (``id = ANY(:ids)``),
+so every batch size shares one statement and one plan; other databases
+get an ``IN`` list. Rows come back in request order, and ids that matched
+nothing (unknown, malformed or not visible to the caller) are reported
+as ``missing``.
+"""
+import os
+import uuid
+from typing import List, Optional, Tuple
+
+from sqlalchemy import any_, bindparam
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.orm import Session
+
+from apps.utils.serialization import Projection, ProjectedRows
+
+MULTI_GET_MAX_IDS = int(os.getenv('MULTI_GET_MAX_IDS', 100))
+
+
+def parse_ids(value: Optional[str]) -> Tuple[List[str], Optional[str]]:
+    """Split ``?ids=`` into distinct ids in request order, or an error."""
+    ids = list(dict.fromkeys(part.strip() for part in (value or '').split(',') if part.strip()))
+    if not ids:
+        return [], 'Danh sách ID không được để trống'
+    if len(ids) > MULTI_GET_MAX_IDS:
+        return [], f'Tối đa {MULTI_GET_MAX_IDS} ID mỗi yêu cầu'
+    return ids, None
+
+
+def fetch_by_ids(db: Session, projection: Projection, id_column, ids: List[str],
+                 *criteria) -> Tuple[ProjectedRows, List[str]]:
+    """``(rows in the order of ids, missing ids)``; ``criteria`` narrow the
+    match, e.g. to projects the caller may read."""
+    keys = {}
+    for value in ids:
+        try:
+            keys[value] = uuid.UUID(value)
+        except ValueError:
+            pass
+
+    found = {}
+    if keys:
+        if db.get_bind().dialect.name == 'postgresql':
+            match = id_column == any_(bindparam('ids', list(keys.values()), type_=ARRAY(PG_UUID())))
+        else:
+            match = id_column.in_(list(keys.values()))
+        # Keyed on a trailing id column, past the ones the encoders read.
+        statement = projection.select().add_columns(id_column).where(match, *criteria)
+        width = len(projection.columns)
+        found = {row[width]: row for row in db.execute(statement).all()}
+
+    rows, missing = ProjectedRows(projection), []
+    for value in ids:
+        row = found.get(keys.get(value))
+        if row is None:
+            missing.append(value)
+        else:
+            rows.append(row)
+    return rows, missing
+
+
+__all__ = ['MULTI_GET_MAX_IDS', 'parse_ids', 'fetch_by_ids']
@@ -0,0 +1,163 @@
+"""
+Per-worker index of project permissions.
+
+Each user's memberships are loaded with one query the first time a request
+needs them and kept in memory as ``{project_id: Permission}``, so a check
+is a dict probe. Membership changes publish ``member.*`` events
+(apps.utils.events), which reach every process and drop that user's entry;
+``project.deleted`` drops every entry that includes the project, and a
+listener reconnect drops them all. ``PERMISSION_CACHE_TTL`` bounds how
+long an entry can outlive a lost event.
+"""
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from sqlalchemy import select
+
+from apps.models.project import Project
+from apps.models.project_member import ProjectMember, Permission, ROLE_PERMISSIONS
+from apps.utils import events
+from apps.utils.db import SessionLocal
+
+PERMISSION_CACHE_TTL = float(os.getenv('PERMISSION_CACHE_TTL', 300))
+PERMISSION_CACHE_SIZE = int(os.getenv('PERMISSION_CACHE_SIZE', 10000))
+
+NO_PERMISSION = Permission(0)
+
+
+def _key(value) -> Optional[str]:
+    try:
+        return str(uuid.UUID(str(value)))
+    except ValueError:
+        return None
+
+
+def _memberships(user_id: str):
+    return select(ProjectMember.project_id, ProjectMember.role)\
+        .join(Project, Project.id == ProjectMember.project_id)\
+        .where(ProjectMember.user_id == user_id, Project.deleted_at.is_(None))
+
+
+def _masks(rows) -> Dict[str, Permission]:
+    return {str(project_id): ROLE_PERMISSIONS[role] for project_id, role in rows}
+
+
+class PermissionIndex:
+    """LRU of user id -> ``{project id: Permission}``."""
+
+    def __init__(self, ttl: float = PERMISSION_CACHE_TTL, max_users: int = PERMISSION_CACHE_SIZE):
+        self.ttl = ttl
+        self.max_users = max_users
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        # Bumped by every invalidation; a load that overlapped one is
+        # returned but not kept, since it may predate the change.
+        self._generation = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _cached(self, user_id: str) -> Optional[Dict[str, Permission]]:
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            expires_at, masks = entry
+            if expires_at <= time.monotonic():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return masks
+
+    def _store(self, user_id: str, masks: Dict[str, Permission], generation: int) -> None:
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._entries[user_id] = (time.monotonic() + self.ttl, masks)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_users:
+                self._entries.popitem(last=False)
+
+    def masks(self, user_id, db=None) -> Dict[str, Permission]:
+        """The user's permissions by project id, loaded on first use
+        (through ``db`` when given)."""
+        user_id = _key(user_id)
+        if user_id is None:
+            return {}
+        masks = self._cached(user_id)
+        if masks is not None:
+            return masks
+
+        # Invalidations from other processes arrive through the listener.
+        events.broker.start_listener()
+        generation = self._generation
+        session = db if db is not None else SessionLocal()
+        try:
+            masks = _masks(session.execute(_memberships(user_id)).all())
+        finally:
+            if db is None:
+                session.close()
+        self._store(user_id, masks, generation)
+        return masks
+
+    async def amasks(self, user_id, db) -> Dict[str, Permission]:
+        """``masks`` for the asyncio engine; ``db`` is an AsyncSession."""
+        user_id = _key(user_id)
+        if user_id is None:
+            return {}
+        masks = self._cached(user_id)
+        if masks is not None:
+            return masks
+
+        events.broker.start_listener()
+        generation = self._generation
+        masks = _masks((await db.execute(_memberships(user_id))).all())
+        self._store(user_id, masks, generation)
+        return masks
+
+    def mask(self, user_id, project_id, db=None) -> Permission:
+        return self.masks(user_id, db).get(_key(project_id), NO_PERMISSION)
+
+    def allows(self, user_id, project_id, permission: Permission, db=None) -> bool:
+        return permission in self.mask(user_id, project_id, db)
+
+    async def aallows(self, user_id, project_id, permission: Permission, db) -> bool:
+        masks = await self.amasks(user_id, db)
+        return permission in masks.get(_key(project_id), NO_PERMISSION)
+
+    def invalidate(self, user_id=None) -> None:
+        """Forget one user's permissions, or everyone's."""
+        with self._lock:
+            self._generation += 1
+            if user_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(_key(user_id), None)
+
+    def invalidate_project(self, project_id) -> None:
+        """Forget the permissions of everyone with access to the project."""
+        project_id = _key(project_id)
+        with self._lock:
+            self._generation += 1
+            for user_id, (_, masks) in list(self._entries.items()):
+                if project_id in masks:
+                    del self._entries[user_id]
+
+    def on_event(self, event: Optional[dict]) -> None:
+        if event is None:
+            self.invalidate()
+        elif event['type'].startswith('member.'):
+            self.invalidate((event.get('data') or {}).get('user_id'))
+        elif event['type'] == 'project.deleted':
+            self.invalidate_project(event.get('project_id'))
+
+
+permission_index = PermissionIndex()
+events.broker.add_hook(permission_index.on_event)
+
+
+__all__ = ['PermissionIndex', 'permission_index', 'NO_PERMISSION']
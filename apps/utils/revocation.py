@@ -0,0 +1,116 @@
+import heapq
+import os
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+from apps.utils.db import SessionLocal
+from apps.models.revoked_token import RevokedToken
+
+REVOCATION_SYNC_SECONDS = float(os.getenv('REVOCATION_SYNC_SECONDS', 5))
+# Rows are committed by several workers, so their revoked_at values do not
+# arrive in order; re-reading a short overlap keeps incremental sync lossless.
+REVOCATION_SYNC_OVERLAP_SECONDS = 30
+
+
+def _key(jti: str):
+    # uuid4().hex ids are stored as 16 raw bytes instead of a 32 char str.
+    try:
+        return bytes.fromhex(jti)
+    except ValueError:
+        return jti
+
+
+class RevocationCache:
+    """Per-worker copy of revoked_tokens.
+
+    Lookups are a single dict probe. The table is re-read incrementally at
+    most once every ``sync_interval`` seconds, and entries are dropped as soon
+    as the token they belong to would have expired anyway.
+    """
+
+    def __init__(self, sync_interval: float = REVOCATION_SYNC_SECONDS):
+        self.sync_interval = sync_interval
+        self._expires = {}
+        self._heap = []
+        self._lock = threading.Lock()
+        self._last_revoked_at = None
+        self._next_sync = 0.0
+
+    def __len__(self) -> int:
+        return len(self._expires)
+
+    def add(self, jti: str, expires_at: datetime) -> None:
+        key = _key(jti)
+        if isinstance(expires_at, datetime):
+            exp = expires_at.replace(tzinfo=timezone.utc).timestamp()
+        else:
+            exp = float(expires_at)
+        with self._lock:
+            if self._expires.get(key) != exp:
+                heapq.heappush(self._heap, (exp, jti))
+            self._expires[key] = exp
+
+    def is_revoked(self, jti: str | None, sync: bool = True) -> bool:
+        if not jti:
+            return False
+        if sync:
+            self.maybe_sync()
+        return _key(jti) in self._expires
+
+    def sync_due(self) -> bool:
+        return time.monotonic() >= self._next_sync
+
+    def maybe_sync(self) -> None:
+        if not self.sync_due():
+            return
+        # Only one request thread pays for the refresh; the others keep
+        # answering from the current snapshot.
+        if not self._lock.acquire(blocking=False):
+            return
+        try:
+            if time.monotonic() < self._next_sync:
+                return
+            self._next_sync = time.monotonic() + self.sync_interval
+        finally:
+            self._lock.release()
+        self.sync()
+
+    def sync(self) -> None:
+        now = datetime.utcnow()
+        db = SessionLocal()
+        try:
+            query = db.query(
+                RevokedToken.jti, RevokedToken.expires_at, RevokedToken.revoked_at
+            ).filter(RevokedToken.expires_at > now)
+            if self._last_revoked_at is not None:
+                since = self._last_revoked_at - timedelta(seconds=REVOCATION_SYNC_OVERLAP_SECONDS)
+                query = query.filter(RevokedToken.revoked_at > since)
+
+            latest = self._last_revoked_at
+            for jti, expires_at, revoked_at in query:
+                self.add(jti, expires_at)
+                if latest is None or revoked_at > latest:
+                    latest = revoked_at
+            self._last_revoked_at = latest
+        except Exception:
+            # Keep serving from the last snapshot; the next interval retries.
+            pass
+        finally:
+            db.close()
+        self.prune()
+
+    def prune(self) -> None:
+        now = time.time()
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now:
+                exp, jti = heapq.heappop(self._heap)
+                key = _key(jti)
+                if self._expires.get(key) == exp:
+                    del self._expires[key]
+
+
+revocation_cache = RevocationCache()
+
+
+__all__ = ['RevocationCache', 'revocation_cache']
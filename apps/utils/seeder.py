@@ -0,0 +1,388 @@
+"""
+Synthetic data seeder.
+
+Rows come from generators with skewed, reproducible distributions and are
+streamed into Postgres with ``COPY ... FROM STDIN``; other databases fall
+back to batched executemany. Ids are derived from the row index (see
+``dataset_id``) so callers can address any seeded row without reading it back.
+"""
+import random
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Callable, Optional
+
+from apps.utils.logger import get_logger
+
+BENCH_PASSWORD = 'bench-password'
+SEED_BATCH_SIZE = 5000
+COPY_CHUNK_SIZE = 1 << 16
+
+# users, projects, tasks, comments
+SCALES = {
+    'tiny': (50, 100, 2_000, 8_000),
+    'small': (1_000, 5_000, 100_000, 400_000),
+    'medium': (5_000, 20_000, 1_000_000, 4_000_000),
+    'large': (10_000, 50_000, 5_000_000, 20_000_000),
+}
+
+# Shape of the data; the load test picks hot rows with the same skew.
+PROJECT_OWNER_SKEW = 2.0
+TASK_PROJECT_SKEW = 1.5
+TASK_ASSIGNEE_SKEW = 2.0
+COMMENT_TASK_SKEW = 3.0
+COMMENT_AUTHOR_SKEW = 1.5
+ACTIVE_USER_SKEW = 1.5
+
+TASK_STATUS_WEIGHTS = (('TODO', 35), ('IN_PROGRESS', 25), ('IN_REVIEW', 10), ('DONE', 30))
+TASK_PRIORITY_WEIGHTS = (('LOW', 25), ('MEDIUM', 45), ('HIGH', 22), ('URGENT', 8))
+PROJECT_STATUS_WEIGHTS = (('PLANNING', 20), ('IN_PROGRESS', 50), ('ON_HOLD', 10),
+                          ('COMPLETED', 15), ('CANCELLED', 5))
+UNASSIGNED_RATIO = 0.2
+NO_DUE_DATE_RATIO = 0.3
+
+USER_COLUMNS = ('id', 'username', 'email', 'full_name', 'password_hash', 'is_active',
+                'created_at', 'updated_at')
+PROJECT_COLUMNS = ('id', 'name', 'description', 'status', 'owner_id', 'start_date',
+                   'end_date', 'created_at', 'updated_at')
+TASK_COLUMNS = ('id', 'title', 'description', 'status', 'priority', 'project_id',
+                'assignee_id', 'creator_id', 'due_date', 'position', 'created_at', 'updated_at')
+COMMENT_COLUMNS = ('id', 'content', 'task_id', 'author_id', 'created_at', 'updated_at')
+
+_KINDS = {'user': 1, 'project': 2, 'task': 3, 'comment': 4}
+
+_WORDS = (
+    'api backend frontend bug fix refactor deploy review test design docs login '
+    'board sprint release cache query index migration report export email '
+    'notification search filter dashboard mobile layout performance security'
+).split()
+
+logger = get_logger(__name__)
+
+
+def dataset_id(kind: str, index: int) -> uuid.UUID:
+    return uuid.UUID(int=((0xbe1c0000 | _KINDS[kind]) << 96) | index)
+
+
+def _id_formatter(kind: str) -> Callable[[int], str]:
+    # str(dataset_id(kind, i)) without building UUID objects in the hot loop.
+    prefix = f'{0xbe1c0000 | _KINDS[kind]:08x}-0000-0000-'
+    return lambda index: f'{prefix}{index >> 48:04x}-{index & 0xffffffffffff:012x}'
+
+
+def skewed(rng: random.Random, n: int, power: float) -> int:
+    """Index in ``[0, n)``; ``power`` > 1 concentrates picks on low indexes."""
+    return min(int(n * rng.random() ** power), n - 1)
+
+
+def _text_pool(rng: random.Random, low: int, high: int, size: int = 4096) -> list:
+    # Sampling from a pool is much cheaper than joining random words per row.
+    return [' '.join(rng.choices(_WORDS, k=rng.randint(low, high))) for _ in range(size)]
+
+
+def _weighted(rng: random.Random, weights) -> Callable[[], str]:
+    names = [name for name, _ in weights]
+    cumulative, total = [], 0
+    for _, weight in weights:
+        total += weight
+        cumulative.append(total)
+
+    def pick():
+        x = rng.random() * total
+        for name, bound in zip(names, cumulative):
+            if x < bound:
+                return name
+        return names[-1]
+    return pick
+
+
+class DatasetSpec:
+
+    def __init__(self, users: int, projects: int, tasks: int, comments: int, seed: int = 42):
+        self.users = users
+        self.projects = projects
+        self.tasks = tasks
+        self.comments = comments
+        self.seed = seed
+
+    @classmethod
+    def from_scale(cls, scale: str, seed: int = 42, **overrides) -> 'DatasetSpec':
+        spec = cls(*SCALES[scale], seed=seed)
+        for key, value in overrides.items():
+            if value is not None:
+                setattr(spec, key, value)
+        return spec
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'DatasetSpec':
+        return cls(data['users'], data['projects'], data['tasks'], data['comments'], data['seed'])
+
+    def to_dict(self) -> dict:
+        return {
+            'users': self.users,
+            'projects': self.projects,
+            'tasks': self.tasks,
+            'comments': self.comments,
+            'seed': self.seed,
+        }
+
+
+# Generators yield tuples in *_COLUMNS order with ids as strings and enums
+# as member names, which is what COPY expects; the executemany path turns
+# the names back into members.
+
+def user_rows(spec: DatasetSpec, password_hash: str, now: datetime):
+    rng = random.Random(spec.seed * 10 + 1)
+    user_id = _id_formatter('user')
+    for i in range(spec.users):
+        created = now - timedelta(days=rng.uniform(30, 730))
+        yield (user_id(i), f'bench_user_{i}', f'bench_user_{i}@bench.local',
+               f'Bench User {i}', password_hash, True, created, created)
+
+
+def project_rows(spec: DatasetSpec, now: datetime):
+    rng = random.Random(spec.seed * 10 + 2)
+    status = _weighted(rng, PROJECT_STATUS_WEIGHTS)
+    names = _text_pool(rng, 1, 3)
+    descriptions = _text_pool(rng, 5, 40)
+    project_id, user_id = _id_formatter('project'), _id_formatter('user')
+    pool_size, users = len(names), spec.users
+    random_ = rng.random
+    for i in range(spec.projects):
+        created = now - timedelta(days=random_() * 365)
+        yield (project_id(i),
+               f'Project {i} {names[int(random_() * pool_size)]}',
+               descriptions[int(random_() * pool_size)],
+               status(),
+               user_id(skewed(rng, users, PROJECT_OWNER_SKEW)),
+               created, created + timedelta(days=30 + random_() * 150), created, created)
+
+
+def task_rows(spec: DatasetSpec, now: datetime):
+    rng = random.Random(spec.seed * 10 + 3)
+    status = _weighted(rng, TASK_STATUS_WEIGHTS)
+    priority = _weighted(rng, TASK_PRIORITY_WEIGHTS)
+    titles = _text_pool(rng, 2, 6)
+    descriptions = _text_pool(rng, 0, 60)
+    task_id, project_id, user_id = (
+        _id_formatter('task'), _id_formatter('project'), _id_formatter('user')
+    )
+    pool_size, users, projects = len(titles), spec.users, spec.projects
+    random_ = rng.random
+    for i in range(spec.tasks):
+        created = now - timedelta(days=random_() * 365)
+        assignee = None
+        if random_() >= UNASSIGNED_RATIO:
+            assignee = user_id(skewed(rng, users, TASK_ASSIGNEE_SKEW))
+        due = None
+        if random_() >= NO_DUE_DATE_RATIO:
+            due = now + timedelta(days=random_() * 90 - 30)
+        yield (task_id(i),
+               f'Task {i} {titles[int(random_() * pool_size)]}',
+               descriptions[int(random_() * pool_size)],
+               status(), priority(),
+               project_id(skewed(rng, projects, TASK_PROJECT_SKEW)),
+               assignee,
+               user_id(int(random_() * users)),
+               due, float(i), created, created)
+
+
+def comment_rows(spec: DatasetSpec, now: datetime):
+    rng = random.Random(spec.seed * 10 + 4)
+    contents = _text_pool(rng, 3, 80)
+    comment_id, task_id, user_id = (
+        _id_formatter('comment'), _id_formatter('task'), _id_formatter('user')
+    )
+    pool_size, users, tasks = len(contents), spec.users, spec.tasks
+    random_ = rng.random
+    for i in range(spec.comments):
+        created = now - timedelta(days=random_() * 365)
+        yield (comment_id(i),
+               contents[int(random_() * pool_size)],
+               task_id(skewed(rng, tasks, COMMENT_TASK_SKEW)),
+               user_id(skewed(rng, users, COMMENT_AUTHOR_SKEW)),
+               created, created)
+
+
+_COPY_ESCAPES = str.maketrans({'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r'})
+
+_COPY_FORMATTERS = {
+    str: lambda value: value.translate(_COPY_ESCAPES),
+    datetime: lambda value: value.isoformat(' '),
+    bool: lambda value: 't' if value else 'f',
+    type(None): lambda value: '\\N',
+}
+
+
+def _copy_value(value) -> str:
+    return _COPY_FORMATTERS.get(type(value), str)(value)
+
+
+class CopyStream:
+    """Read-only file object producing COPY text format from row tuples.
+
+    ``copy_expert`` pulls fixed-size chunks, so only one chunk of rows is
+    ever materialized.
+    """
+
+    def __init__(self, rows, on_rows: Optional[Callable[[int], None]] = None):
+        self._rows = iter(rows)
+        self._buffer = b''
+        self._on_rows = on_rows
+
+    def read(self, size: int = -1) -> bytes:
+        if size is None or size < 0:
+            size = COPY_CHUNK_SIZE
+        lines = [self._buffer]
+        length = len(self._buffer)
+        count = 0
+        formatters = _COPY_FORMATTERS
+        while length < size:
+            row = next(self._rows, None)
+            if row is None:
+                break
+            line = ('\t'.join([formatters.get(type(v), str)(v) for v in row]) + '\n').encode('utf-8')
+            lines.append(line)
+            length += len(line)
+            count += 1
+        if count and self._on_rows:
+            self._on_rows(count)
+        data = b''.join(lines)
+        self._buffer = data[size:]
+        return data[:size]
+
+
+def _copy(conn, table, columns, rows, on_rows) -> None:
+    cursor = conn.connection.cursor()
+    try:
+        cursor.copy_expert(
+            f"COPY {table.name} ({', '.join(columns)}) FROM STDIN",
+            CopyStream(rows, on_rows),
+            size=COPY_CHUNK_SIZE
+        )
+    finally:
+        cursor.close()
+
+
+def _executemany(conn, table, columns, rows, on_rows) -> None:
+    enums = {
+        name: table.c[name].type.enum_class
+        for name in columns
+        if getattr(table.c[name].type, 'enum_class', None) is not None
+    }
+    statement = table.insert()
+    batch = []
+
+    def flush():
+        conn.execute(statement, batch)
+        on_rows(len(batch))
+        batch.clear()
+
+    for row in rows:
+        data = dict(zip(columns, row))
+        for name, enum_class in enums.items():
+            data[name] = enum_class[data[name]]
+        batch.append(data)
+        if len(batch) >= SEED_BATCH_SIZE:
+            flush()
+    if batch:
+        flush()
+
+
+def seed(spec: DatasetSpec, reset: bool = False, defer_indexes: bool = True,
+         progress: Optional[Callable[[str, int, int, float], None]] = None) -> dict:
+    """Load ``spec`` into the configured database; returns rows/s per table.
+
+    With ``defer_indexes`` secondary indexes are dropped before a table is
+    loaded and rebuilt afterwards, which is much faster than maintaining
+    them row by row.
+    """
+    from apps.utils.db import engine, Base
+    from apps.services.auth_service import AuthService
+    import apps.models as models
+
+    if reset:
+        Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    # One bcrypt hash for every user; hashing per row would dominate the run.
+    password_hash = AuthService.hash_password(BENCH_PASSWORD)
+    now = datetime.utcnow()
+    use_copy = engine.dialect.name == 'postgresql'
+    load = _copy if use_copy else _executemany
+
+    rates = {}
+    for table, columns, rows, total in (
+        (models.User.__table__, USER_COLUMNS, user_rows(spec, password_hash, now), spec.users),
+        (models.Project.__table__, PROJECT_COLUMNS, project_rows(spec, now), spec.projects),
+        (models.Task.__table__, TASK_COLUMNS, task_rows(spec, now), spec.tasks),
+        (models.Comment.__table__, COMMENT_COLUMNS, comment_rows(spec, now), spec.comments),
+    ):
+        start = time.perf_counter()
+        done = 0
+
+        def on_rows(count, table=table, total=total, start=start):
+            nonlocal done
+            done += count
+            if progress:
+                progress(table.name, done, total, time.perf_counter() - start)
+
+        indexes = list(table.indexes) if defer_indexes else []
+        with engine.begin() as conn:
+            for index in indexes:
+                index.drop(bind=conn, checkfirst=True)
+            load(conn, table, columns, rows, on_rows)
+            for index in indexes:
+                index.create(bind=conn)
+            if use_copy:
+                conn.exec_driver_sql(f"ANALYZE {table.name}")
+
+        elapsed = time.perf_counter() - start
+        rates[table.name] = round(total / elapsed) if elapsed else None
+        logger.info("Seeded %d %s in %.1fs", total, table.name, elapsed)
+
+    start = time.perf_counter()
+    with engine.begin() as conn:
+        total = sum(conn.execute(statement).rowcount for statement in member_backfill(now))
+    elapsed = time.perf_counter() - start
+    rates[models.ProjectMember.__tablename__] = round(total / elapsed) if elapsed else None
+    logger.info("Seeded %d project_members in %.1fs", total, elapsed)
+    return rates
+
+
+def member_backfill(now: datetime):
+    """INSERT ... SELECTs giving every project its owner, plus everyone
+    assigned to or creating one of its tasks as a member."""
+    from sqlalchemy import DateTime, literal, select, union
+    from apps.models import Project, Task, ProjectMember, ProjectRole
+
+    table = ProjectMember.__table__
+    columns = ('project_id', 'user_id', 'role', 'created_at')
+    role = ProjectMember.__table__.c.role.type
+
+    owners = select(Project.id, Project.owner_id,
+                    literal(ProjectRole.OWNER, role), literal(now, DateTime()))
+    people = union(
+        select(Task.project_id, Task.assignee_id.label('user_id'))
+        .where(Task.assignee_id.isnot(None)),
+        select(Task.project_id, Task.creator_id.label('user_id'))
+    ).subquery()
+    members = select(people.c.project_id, people.c.user_id,
+                     literal(ProjectRole.MEMBER, role), literal(now, DateTime()))\
+        .join(Project, Project.id == people.c.project_id)\
+        .where(people.c.user_id != Project.owner_id)
+
+    return (table.insert().from_select(columns, owners),
+            table.insert().from_select(columns, members))
+
+
+__all__ = [
+    'BENCH_PASSWORD',
+    'SCALES',
+    'DatasetSpec',
+    'CopyStream',
+    'dataset_id',
+    'skewed',
+    'seed',
+    'member_backfill',
+]
@@ -0,0 +1,375 @@
+"""
+Column projections and a JSON encoder for list endpoints.
+
+A ``Projection`` names the columns a response needs and knows how to turn
+the plain result tuples into the same dicts (and the same JSON bytes) that
+the models' ``to_dict`` produce, so list queries can skip ORM hydration and
+the identity map entirely. ``?fields=`` narrows a projection, and with it
+the SQL select list.
+
+Responses are negotiated on ``Accept``: JSON by default, MessagePack for
+clients that ask for it. JSON bodies are exactly what ``flask.jsonify``
+writes outside debug mode (sorted keys, compact separators, ASCII escapes,
+trailing newline). Both formats take UUID, datetime and enum values from
+the one ``ENCODERS`` registry; in MessagePack a UUID is ext type 1 holding
+its 16 bytes and a datetime is the standard timestamp extension (naive
+values are UTC).
+"""
+import enum
+import json
+import uuid
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from json.encoder import encode_basestring_ascii
+from operator import itemgetter
+from typing import Callable, Dict, List, Optional, Tuple
+
+from flask import Response, has_request_context, request
+from flask.json.provider import DefaultJSONProvider
+from sqlalchemy import Boolean, DateTime, Enum, Integer, Uuid, select
+from werkzeug.datastructures import MIMEAccept
+from werkzeug.http import parse_accept_header
+
+try:
+    import msgpack
+except ImportError:  # optional dependency; JSON only without it
+    msgpack = None
+
+JSON_MIMETYPE = 'application/json'
+MSGPACK_MIMETYPES = ('application/msgpack', 'application/x-msgpack', 'application/vnd.msgpack')
+MSGPACK_EXT_UUID = 1
+
+
+class EncoderRegistry:
+    """Type -> (JSON encoder, MessagePack encoder), looked up along the MRO."""
+
+    def __init__(self):
+        self._encoders = {}
+        self._resolved = {}
+
+    def register(self, cls: type, to_json: Callable, to_msgpack: Optional[Callable] = None) -> None:
+        self._encoders[cls] = (to_json, to_msgpack or to_json)
+        self._resolved.clear()
+
+    def lookup(self, cls: type):
+        encoders = self._resolved.get(cls)
+        if encoders is None:
+            encoders = next(
+                (self._encoders[base] for base in cls.__mro__ if base in self._encoders), False
+            )
+            self._resolved[cls] = encoders
+        return encoders or None
+
+    def json_default(self, value):
+        encoders = self.lookup(type(value))
+        if encoders is None:
+            return DefaultJSONProvider.default(value)
+        return encoders[0](value)
+
+    def msgpack_default(self, value):
+        encoders = self.lookup(type(value))
+        if encoders is None:
+            raise TypeError(f"Object of type {type(value).__name__} is not MessagePack serializable")
+        return encoders[1](value)
+
+
+def _timestamp(value: datetime):
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return msgpack.Timestamp.from_datetime(value)
+
+
+ENCODERS = EncoderRegistry()
+ENCODERS.register(uuid.UUID, str, lambda value: msgpack.ExtType(MSGPACK_EXT_UUID, value.bytes))
+ENCODERS.register(datetime, lambda value: value.isoformat(), _timestamp)
+ENCODERS.register(date, lambda value: value.isoformat())
+ENCODERS.register(enum.Enum, lambda value: value.value)
+ENCODERS.register(Decimal, str)
+# msgpack packs with strict_types, so containers that are subclasses (and
+# tuples) come back through the registry.
+ENCODERS.register(tuple, list)
+ENCODERS.register(list, list)
+ENCODERS.register(dict, dict)
+
+# Anything the fast JSON path does not special-case goes through the same
+# encoder settings as Flask's provider.
+_fallback = json.JSONEncoder(
+    ensure_ascii=True, sort_keys=True, separators=(',', ':'), default=ENCODERS.json_default
+)
+
+
+def _uuid_json(value) -> str:
+    return '"%s"' % value
+
+
+def _datetime_json(value) -> str:
+    return '"%s"' % value.isoformat()
+
+
+def _enum_json(value) -> str:
+    return encode_basestring_ascii(value.value)
+
+
+def _bool_json(value) -> str:
+    return 'true' if value else 'false'
+
+
+def _column_kind(column) -> str:
+    column_type = column.type
+    if isinstance(column_type, Enum):
+        return 'enum'
+    if isinstance(column_type, DateTime):
+        return 'datetime'
+    if isinstance(column_type, Uuid) or isinstance(getattr(column_type, 'impl_instance', None), Uuid):
+        return 'uuid'
+    if isinstance(column_type, Boolean):
+        return 'bool'
+    if isinstance(column_type, Integer):
+        return 'int'
+    if column_type.python_type is str:
+        return 'str'
+    return 'other'
+
+
+_TO_PYTHON = {
+    'uuid': str,
+    'datetime': lambda value: value.isoformat(),
+    'enum': lambda value: value.value,
+}
+
+_TO_JSON = {
+    'uuid': _uuid_json,
+    'datetime': _datetime_json,
+    'enum': _enum_json,
+    'str': encode_basestring_ascii,
+    'bool': _bool_json,
+    'int': int.__repr__,
+    'other': _fallback.encode,
+}
+
+
+def _encoder(entries):
+    """Generate ``row -> JSON object`` as a single concatenation in sorted
+    key order, with the per-column formatters bound as globals."""
+    if not entries:
+        return lambda row: '{}'
+    namespace, parts = {}, []
+    for position, (key, index, _, to_json, _) in enumerate(sorted(entries, key=itemgetter(0))):
+        prefix = repr(('{' if position == 0 else ',') + encode_basestring_ascii(key) + ':')
+        name = f'f{position}'
+        namespace[name] = to_json
+        if index is None:
+            parts.append(f"{prefix} + {name}(row)")
+        else:
+            parts.append(f"{prefix} + ('null' if row[{index}] is None else {name}(row[{index}]))")
+    exec('def encode(row):\n    return ' + ' + '.join(parts) + " + '}'\n", namespace)
+    return namespace['encode']
+
+
+class Projection:
+    """Output key -> column, plus optional nested projections.
+
+    Nested projections are selected after the parent's own columns and
+    rendered as a sub-object, e.g. a comment's ``author``.
+    """
+
+    # Distinct ?fields= combinations kept compiled per projection.
+    max_cached_subsets = 256
+
+    def __init__(self, fields: Dict[str, object], nested: Optional[Dict[str, 'Projection']] = None,
+                 deferred: Tuple[str, ...] = ()):
+        self.fields = dict(fields)
+        self.nested = dict(nested or {})
+        self.deferred = tuple(deferred)
+        self.columns = list(self.fields.values())
+        for child in self.nested.values():
+            self.columns.extend(child.columns)
+        self.to_dict, self.encode, self.to_record = self._compile(0)
+        self._subsets = {}
+        self.default = self.subset(key for key in self.keys() if key not in self.deferred)
+
+    def keys(self) -> Tuple[str, ...]:
+        return tuple(self.fields) + tuple(self.nested)
+
+    def subset(self, keys) -> 'Projection':
+        """The same projection restricted to ``keys``, always keeping ``id``."""
+        wanted = set(keys) | {'id'}
+        selected = tuple(key for key in self.keys() if key in wanted)
+        if selected == self.keys():
+            return self
+        projection = self._subsets.get(selected)
+        if projection is None:
+            projection = Projection(
+                {key: column for key, column in self.fields.items() if key in wanted},
+                {key: child for key, child in self.nested.items() if key in wanted},
+            )
+            if len(self._subsets) < self.max_cached_subsets:
+                self._subsets[selected] = projection
+        return projection
+
+    def from_query(self, value: Optional[str]) -> Tuple[Optional['Projection'], List[str]]:
+        """Resolve a ``?fields=a,b`` value to ``(projection, unknown_fields)``.
+
+        Without a value the deferred (large) columns are left out.
+        """
+        if not value:
+            return self.default, []
+        names = [name.strip() for name in value.split(',') if name.strip()]
+        known = set(self.keys())
+        unknown = [name for name in names if name not in known]
+        if unknown:
+            return None, unknown
+        return self.subset(names), []
+
+    def _compile(self, offset: int):
+        # (key, column index or None for a nested projection, to-python,
+        # to-JSON, to-record)
+        entries = []
+        index = offset
+        for key, column in self.fields.items():
+            kind = _column_kind(column)
+            entries.append((key, index, _TO_PYTHON.get(kind), _TO_JSON[kind], None))
+            index += 1
+        for key, child in self.nested.items():
+            entries.append((key, None) + child._compile(index))
+            index += len(child.columns)
+
+        plan = tuple(entries)
+
+        def to_dict(row) -> dict:
+            data = {}
+            for key, index, convert, _, _ in plan:
+                if index is None:
+                    data[key] = convert(row)
+                    continue
+                value = row[index]
+                data[key] = convert(value) if convert is not None and value is not None else value
+            return data
+
+        def to_record(row) -> dict:
+            # Unconverted values, for MessagePack to encode through ENCODERS.
+            return {
+                key: to_child(row) if index is None else row[index]
+                for key, index, _, _, to_child in plan
+            }
+
+        return to_dict, _encoder(entries), to_record
+
+    def select(self):
+        return select(*self.columns)
+
+    def all(self, db, statement) -> 'ProjectedRows':
+        return ProjectedRows(self, db.execute(statement).all())
+
+
+class ProjectedRows(list):
+    """Result tuples of one projection; serializes like a list of dicts."""
+
+    __slots__ = ('projection',)
+
+    def __init__(self, projection: Projection, rows=()):
+        super().__init__(rows)
+        self.projection = projection
+
+    def to_dicts(self) -> list:
+        to_dict = self.projection.to_dict
+        return [to_dict(row) for row in self]
+
+    def to_records(self) -> list:
+        to_record = self.projection.to_record
+        return [to_record(row) for row in self]
+
+    def __json__(self) -> str:
+        encode = self.projection.encode
+        return '[' + ','.join([encode(row) for row in self]) + ']'
+
+
+ENCODERS.register(ProjectedRows, ProjectedRows.to_dicts, ProjectedRows.to_records)
+
+
+def dumps(obj) -> str:
+    if isinstance(obj, str):
+        return encode_basestring_ascii(obj)
+    if obj is None:
+        return 'null'
+    if obj is True:
+        return 'true'
+    if obj is False:
+        return 'false'
+    if isinstance(obj, ProjectedRows):
+        return obj.__json__()
+    if isinstance(obj, dict):
+        return '{' + ','.join(
+            encode_basestring_ascii(str(key)) + ':' + dumps(obj[key]) for key in sorted(obj)
+        ) + '}'
+    if isinstance(obj, (list, tuple)):
+        return '[' + ','.join([dumps(item) for item in obj]) + ']'
+    if isinstance(obj, int):
+        return int.__repr__(obj)
+    return _fallback.encode(obj)
+
+
+def packb(obj) -> bytes:
+    return msgpack.packb(obj, default=ENCODERS.msgpack_default, use_bin_type=True,
+                         strict_types=True)
+
+
+_OFFERED = (JSON_MIMETYPE,) + (MSGPACK_MIMETYPES if msgpack is not None else ())
+
+
+def negotiate(accept: Optional[MIMEAccept] = None) -> str:
+    """Response mimetype for an Accept header; JSON unless MessagePack is
+    strictly preferred. Defaults to the current request's header."""
+    if accept is None:
+        accept = request.accept_mimetypes if has_request_context() else MIMEAccept()
+    return accept.best_match(_OFFERED, default=JSON_MIMETYPE) or JSON_MIMETYPE
+
+
+def negotiate_header(value: Optional[str]) -> str:
+    return negotiate(parse_accept_header(value, MIMEAccept))
+
+
+def encode_body(obj, mimetype: str) -> bytes:
+    if mimetype == JSON_MIMETYPE:
+        return (dumps(obj) + '\n').encode()
+    return packb(obj)
+
+
+def respond(obj) -> Response:
+    """``jsonify`` with content negotiation; ``obj`` may contain ``ProjectedRows``."""
+    mimetype = negotiate()
+    response = Response(encode_body(obj, mimetype), mimetype=mimetype)
+    response.vary.add('Accept')
+    return response
+
+
+class NegotiatingJSONProvider(DefaultJSONProvider):
+    """Makes every ``jsonify`` in the controllers honour ``Accept``."""
+
+    default = staticmethod(ENCODERS.json_default)
+
+    def response(self, *args, **kwargs) -> Response:
+        mimetype = negotiate() if has_request_context() else JSON_MIMETYPE
+        if mimetype == JSON_MIMETYPE:
+            response = super().response(*args, **kwargs)
+        else:
+            obj = self._prepare_response_obj(args, kwargs)
+            response = self._app.response_class(packb(obj), mimetype=mimetype)
+        if has_request_context():
+            response.vary.add('Accept')
+        return response
+
+
+__all__ = [
+    'ENCODERS',
+    'EncoderRegistry',
+    'Projection',
+    'ProjectedRows',
+    'NegotiatingJSONProvider',
+    'dumps',
+    'packb',
+    'negotiate',
+    'negotiate_header',
+    'encode_body',
+    'respond',
+]
@@ -0,0 +1,210 @@
+import os
+import re
+import threading
+import time
+from collections import deque, Counter
+
+from sqlalchemy import event
+
+from apps.utils.logger import get_logger
+
+APP_ENV = os.getenv('APP_ENV', 'development')
+SQL_SLOW_QUERY_MS = float(os.getenv('SQL_SLOW_QUERY_MS', 200))
+# EXPLAIN ANALYZE runs the statement again, so it is a development aid:
+# elsewhere slow queries get a plain EXPLAIN unless this is switched on.
+SQL_EXPLAIN_ANALYZE = os.getenv(
+    'SQL_EXPLAIN_ANALYZE', str(APP_ENV == 'development')
+) == 'True'
+# Each shape is explained at most once per interval.
+SQL_EXPLAIN_INTERVAL_SECONDS = float(os.getenv('SQL_EXPLAIN_INTERVAL_SECONDS', 300))
+SQL_DETECT_N_PLUS_ONE = os.getenv(
+    'SQL_DETECT_N_PLUS_ONE', str(APP_ENV in ('development', 'test'))
+) == 'True'
+SQL_N_PLUS_ONE_THRESHOLD = int(os.getenv('SQL_N_PLUS_ONE_THRESHOLD', 5))
+SQL_PROFILE_SAMPLES = 1024
+SQL_PROFILE_MAX_SHAPES = 2000
+
+logger = get_logger(__name__)
+
+_WHITESPACE = re.compile(r'\s+')
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r'\b\d+(?:\.\d+)?\b')
+_PARAM = re.compile(r'%\([^)]+\)s|%s|\?|:\w+|\$\d+|__\[POSTCOMPILE_\w+\]')
+_IN_LIST = re.compile(r'\bIN \((?:\?(?:, )?)+\)', re.IGNORECASE)
+_VALUES_LIST = re.compile(r'\bVALUES (\([^()]*\))(?:, \([^()]*\))+', re.IGNORECASE)
+# Reads that must not be run twice: row locks (job and outbox claims) and
+# functions with effects beyond the result set.
+_NOT_REPEATABLE = re.compile(
+    r'\bFOR (?:NO KEY )?UPDATE\b|\bFOR (?:KEY )?SHARE\b'
+    r'|\b(?:pg_notify|nextval|setval|set_config|pg_current_xact_id|txid_current'
+    r'|pg_(?:try_)?advisory\w*|pg_sleep\w*|pg_(?:cancel|terminate)_backend|lo_\w+|dblink\w*)\s*\(',
+    re.IGNORECASE
+)
+
+
+def normalize(statement: str) -> str:
+    """Reduce a statement to its shape: literals and parameters become ``?``
+    and IN/VALUES lists collapse to one element."""
+    shape = _WHITESPACE.sub(' ', statement).strip()
+    shape = _STRING.sub('?', shape)
+    shape = _PARAM.sub('?', shape)
+    shape = _NUMBER.sub('?', shape)
+    shape = _IN_LIST.sub('IN (?)', shape)
+    shape = _VALUES_LIST.sub(r'VALUES \1', shape)
+    return shape
+
+
+class ShapeStats:
+    __slots__ = ('count', 'total', 'samples', 'last_explained')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.samples = deque(maxlen=SQL_PROFILE_SAMPLES)
+        self.last_explained = 0.0
+
+    def to_dict(self, shape: str) -> dict:
+        samples = sorted(self.samples)
+
+        def percentile(p):
+            if not samples:
+                return None
+            return round(samples[min(len(samples) - 1, int(p * len(samples)))] * 1000, 3)
+
+        return {
+            'shape': shape,
+            'count': self.count,
+            'total_ms': round(self.total * 1000, 3),
+            'p50_ms': percentile(0.50),
+            'p99_ms': percentile(0.99)
+        }
+
+
+class SQLProfiler:
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._shapes = {}
+        self._normalized = {}
+        self._request = threading.local()
+
+    def shape_of(self, statement: str) -> str:
+        # SQLAlchemy caches compiled statements, so the same strings repeat.
+        shape = self._normalized.get(statement)
+        if shape is None:
+            shape = normalize(statement)
+            if len(self._normalized) < SQL_PROFILE_MAX_SHAPES * 4:
+                self._normalized[statement] = shape
+        return shape
+
+    def record(self, statement: str, elapsed: float) -> str:
+        shape = self.shape_of(statement)
+        with self._lock:
+            stats = self._shapes.get(shape)
+            if stats is None:
+                if len(self._shapes) >= SQL_PROFILE_MAX_SHAPES:
+                    return shape
+                stats = self._shapes[shape] = ShapeStats()
+            stats.count += 1
+            stats.total += elapsed
+            stats.samples.append(elapsed)
+
+        shapes = getattr(self._request, 'shapes', None)
+        if shapes is not None:
+            shapes[shape] += 1
+        return shape
+
+    def should_explain(self, shape: str) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            stats = self._shapes.get(shape)
+            if stats is None or now - stats.last_explained < SQL_EXPLAIN_INTERVAL_SECONDS:
+                return False
+            stats.last_explained = now
+            return True
+
+    def snapshot(self, limit: int = 50) -> list:
+        with self._lock:
+            items = [stats.to_dict(shape) for shape, stats in self._shapes.items()]
+        items.sort(key=lambda item: item['total_ms'], reverse=True)
+        return items[:limit]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._shapes.clear()
+
+    def begin_request(self) -> None:
+        if SQL_DETECT_N_PLUS_ONE:
+            self._request.shapes = Counter()
+
+    def end_request(self, route: str) -> None:
+        shapes = getattr(self._request, 'shapes', None)
+        if shapes is None:
+            return
+        self._request.shapes = None
+        for shape, count in shapes.items():
+            if count >= SQL_N_PLUS_ONE_THRESHOLD and shape.upper().startswith('SELECT'):
+                logger.warning(
+                    "Possible N+1 on %s: %d executions of %s", route, count, shape
+                )
+
+
+profiler = SQLProfiler()
+
+
+def can_analyze(statement: str) -> bool:
+    """Whether EXPLAIN ANALYZE may execute ``statement`` a second time."""
+    return statement.lstrip().upper().startswith('SELECT') \
+        and not _NOT_REPEATABLE.search(statement)
+
+
+def _explain(cursor, statement, parameters, analyze: bool) -> str:
+    explain_cursor = cursor.connection.cursor()
+    try:
+        # A failing EXPLAIN must not abort the caller's transaction.
+        explain_cursor.execute("SAVEPOINT sql_profiler_explain")
+        try:
+            options = "(ANALYZE, BUFFERS) " if analyze else ""
+            explain_cursor.execute("EXPLAIN " + options + statement, parameters)
+            plan = "\n".join(row[0] for row in explain_cursor.fetchall())
+            explain_cursor.execute("RELEASE SAVEPOINT sql_profiler_explain")
+            return plan
+        except Exception:
+            explain_cursor.execute("ROLLBACK TO SAVEPOINT sql_profiler_explain")
+            raise
+    finally:
+        explain_cursor.close()
+
+
+def instrument_engine(engine) -> None:
+    @event.listens_for(engine, 'before_cursor_execute')
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('profiler_start', []).append(time.perf_counter())
+
+    @event.listens_for(engine, 'after_cursor_execute')
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info['profiler_start'].pop()
+        shape = profiler.record(statement, elapsed)
+
+        if elapsed * 1000 < SQL_SLOW_QUERY_MS:
+            return
+
+        plan = None
+        if (not executemany
+                and conn.dialect.name == 'postgresql'
+                and statement.lstrip().upper().startswith(('SELECT', 'WITH', 'INSERT', 'UPDATE', 'DELETE'))
+                and profiler.should_explain(shape)):
+            try:
+                # Plain EXPLAIN only plans; it never runs the statement.
+                analyze = SQL_EXPLAIN_ANALYZE and can_analyze(statement)
+                plan = _explain(cursor, statement, parameters, analyze)
+            except Exception as e:
+                plan = f"EXPLAIN failed: {e}"
+
+        if plan:
+            logger.warning("Slow query (%.1f ms): %s\n%s", elapsed * 1000, shape, plan)
+        else:
+            logger.warning("Slow query (%.1f ms): %s", elapsed * 1000, shape)
+
+
+__all__ = ['SQLProfiler', 'profiler', 'normalize', 'can_analyze', 'instrument_engine']
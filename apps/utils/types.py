@@ -0,0 +1,25 @@
+import uuid
+
+from sqlalchemy.types import TypeDecorator, Uuid
+
+
+class UUID(TypeDecorator):
+    """UUID column that also accepts ids passed around as strings.
+
+    Native ``UUID`` on PostgreSQL and ``CHAR(32)`` elsewhere, so the schema
+    can be created on SQLite for local runs and benchmarks.
+    """
+
+    impl = Uuid
+    cache_ok = True
+
+    def __init__(self, as_uuid: bool = True):
+        super().__init__(as_uuid=as_uuid)
+
+    def process_bind_param(self, value, dialect):
+        if value is None or isinstance(value, uuid.UUID):
+            return value
+        return uuid.UUID(str(value))
+
+
+__all__ = ['UUID']
@@ -0,0 +1,53 @@
+import threading
+
+from apps.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class PeriodicWorker(threading.Thread):
+    """Daemon thread that calls ``run_once`` until told to stop.
+
+    ``run_once`` returns how many items it handled; while there is a backlog
+    the loop runs again immediately, otherwise it sleeps for ``interval``
+    seconds or until ``wake()`` is called.
+    """
+
+    def __init__(self, name: str, interval: float):
+        super().__init__(name=name, daemon=True)
+        self.interval = interval
+        self._wake_event = threading.Event()
+        self._stopping = threading.Event()
+
+    def run_once(self) -> int:
+        raise NotImplementedError
+
+    def on_idle(self) -> None:
+        pass
+
+    def wake(self) -> None:
+        self._wake_event.set()
+
+    def stop(self, timeout: float | None = None) -> None:
+        self._stopping.set()
+        self._wake_event.set()
+        if self.is_alive():
+            self.join(timeout)
+
+    def run(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                handled = self.run_once()
+            except Exception:
+                logger.exception("%s failed", self.name)
+                handled = 0
+
+            if handled:
+                continue
+
+            self.on_idle()
+            self._wake_event.wait(self.interval)
+            self._wake_event.clear()
+
+
+__all__ = ['PeriodicWorker']
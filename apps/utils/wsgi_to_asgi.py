@@ -0,0 +1,120 @@
+"""
+Minimal WSGI-to-ASGI adapter for the Flask fallback in AsyncRouter.
+
+Each request runs the WSGI app on the event loop's default executor (a
+thread pool sized by ASGI_SYNC_THREADS), so Flask requests run in
+parallel. The response is sent as the app yields it, which keeps
+streamed bodies streaming.
+"""
+import asyncio
+import sys
+from tempfile import SpooledTemporaryFile
+
+# Request bodies above this go to a temporary file instead of memory.
+MAX_MEMORY_BODY = 64 * 1024
+
+
+def build_environ(scope: dict, body) -> dict:
+    """PEP 3333 environ for an ASGI ``http`` scope."""
+    root_path = scope.get('root_path', '')
+    path = scope['path']
+    if root_path and path.startswith(root_path):
+        path = path[len(root_path):]
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        # WSGI strings are bytes decoded as latin-1.
+        'SCRIPT_NAME': root_path.encode('utf-8').decode('latin-1'),
+        'PATH_INFO': path.encode('utf-8').decode('latin-1'),
+        'QUERY_STRING': scope.get('query_string', b'').decode('latin-1'),
+        'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': body,
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': True,
+        'wsgi.run_once': False,
+    }
+    server = scope.get('server') or ('localhost', 80)
+    environ['SERVER_NAME'] = server[0]
+    environ['SERVER_PORT'] = str(server[1] or 80)
+    client = scope.get('client')
+    if client:
+        environ['REMOTE_ADDR'] = client[0]
+        environ['REMOTE_PORT'] = str(client[1])
+
+    for name, value in scope.get('headers', ()):
+        name = name.decode('latin-1').upper().replace('-', '_')
+        value = value.decode('latin-1')
+        if name == 'CONTENT_LENGTH' or name == 'CONTENT_TYPE':
+            key = name
+        else:
+            key = f'HTTP_{name}'
+        if key in environ:
+            # HTTP/2 clients may split cookies over several headers, and a
+            # cookie list is separated by "; ", not ",".
+            value = f"{environ[key]}{'; ' if key == 'HTTP_COOKIE' else ','}{value}"
+        environ[key] = value
+    return environ
+
+
+class WsgiToAsgi:
+    """Serve a WSGI app as an ASGI ``http`` app."""
+
+    def __init__(self, wsgi_application):
+        self.wsgi_application = wsgi_application
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            raise ValueError(f"WSGI apps only serve http, not {scope['type']!r}")
+
+        with SpooledTemporaryFile(max_size=MAX_MEMORY_BODY) as body:
+            while True:
+                message = await receive()
+                if message['type'] == 'http.disconnect':
+                    return
+                body.write(message.get('body', b''))
+                if not message.get('more_body'):
+                    break
+            body.seek(0)
+
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, self._run, build_environ(scope, body), send, loop)
+
+    def _run(self, environ: dict, send, loop) -> None:
+        def emit(message):
+            asyncio.run_coroutine_threadsafe(send(message), loop).result()
+
+        response = {}
+
+        def start_response(status, headers, exc_info=None):
+            if exc_info and response.get('sent'):
+                raise exc_info[1].with_traceback(exc_info[2])
+            response['start'] = {
+                'type': 'http.response.start',
+                'status': int(status.split(' ', 1)[0]),
+                'headers': [(name.lower().encode('latin-1'), value.encode('latin-1'))
+                            for name, value in headers],
+            }
+            return send_body
+
+        def send_body(data):
+            if not response.get('sent'):
+                emit(response['start'])
+                response['sent'] = True
+            if data:
+                emit({'type': 'http.response.body', 'body': data, 'more_body': True})
+
+        result = self.wsgi_application(environ, start_response)
+        try:
+            for chunk in result:
+                send_body(chunk)
+            send_body(b'')
+            emit({'type': 'http.response.body', 'body': b''})
+        finally:
+            close = getattr(result, 'close', None)
+            if close is not None:
+                close()
+
+
+__all__ = ['WsgiToAsgi', 'build_environ']
@@ -1,121 +1,106 @@
 import re
 from typing import Tuple, Dict, Any
 
+from apps.validations.schema import Schema, String
 
-def validate_register_data(data: Dict[str, Any]) -> Tuple[bool, str]:
-    if not data:
-        return False, "Dữ liệu không được để trống"
-    
-    required_fields = ['username', 'email', 'full_name', 'password']
-    for field in required_fields:
-        if field not in data or not data[field]:
-            return False, f"Thiếu field bắt buộc: {field}"
-    
-    username = data['username'].strip()
-    if len(username) < 3 or len(username) > 50:
-        return False, "Username phải có độ dài từ 3-50 ký tự"
-    if not re.match(r'^[a-zA-Z0-9_]+$', username):
-        return False, "Username chỉ được chứa chữ cái, số và dấu gạch dưới"
-    
-    email = data['email'].strip()
-    email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    if not re.match(email_pattern, email):
-        return False, "Email không hợp lệ"
-    
-    password = data['password']
-    if len(password) < 8:
-        return False, "Mật khẩu phải có ít nhất 8 ký tự"
-    if len(password) > 128:
-        return False, "Mật khẩu không được vượt quá 128 ký tự"
-    if not any(c.isupper() for c in password):
-        return False, "Mật khẩu phải chứa ít nhất 1 chữ hoa"
-    if not any(c.islower() for c in password):
-        return False, "Mật khẩu phải chứa ít nhất 1 chữ thường"
-    if not any(c.isdigit() for c in password):
-        return False, "Mật khẩu phải chứa ít nhất 1 chữ số"
-    
-    special_chars = "!@#$%^&*()_+-=[]{}|;:,.<>?"
-    if not any(c in special_chars for c in password):
-        return False, "Mật khẩu phải chứa ít nhất 1 ký tự đặc biệt"
-    
+USERNAME_PATTERN = r'^[a-zA-Z0-9_]+$'
+EMAIL_PATTERN = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
+SPECIAL_CHARS = "!@#$%^&*()_+-=[]{}|;:,.<>?"
+
+_PASSWORD_RULES = (
+    (lambda p: any(c.isupper() for c in p), "Mật khẩu phải chứa ít nhất 1 chữ hoa"),
+    (lambda p: any(c.islower() for c in p), "Mật khẩu phải chứa ít nhất 1 chữ thường"),
+    (lambda p: any(c.isdigit() for c in p), "Mật khẩu phải chứa ít nhất 1 chữ số"),
+    (lambda p: any(c in SPECIAL_CHARS for c in p), "Mật khẩu phải chứa ít nhất 1 ký tự đặc biệt"),
+)
+_PASSWORD_POLICY = "Mật khẩu phải có ít nhất 8 ký tự, bao gồm chữ hoa, chữ thường, số và ký tự đặc biệt"
+_EMPTY = "Dữ liệu không được để trống"
+
+
+def _required(field: str) -> dict:
+    message = f"Thiếu field bắt buộc: {field}"
+    return {'required': message, 'blank': message, 'null': message}
+
+
+REGISTER_SCHEMA = Schema({
+    'username': String(required=True, allow_blank=False, min_length=3, max_length=50,
+                       pattern=USERNAME_PATTERN, messages=dict(
+                           _required('username'),
+                           min_length="Username phải có độ dài từ 3-50 ký tự",
+                           max_length="Username phải có độ dài từ 3-50 ký tự",
+                           pattern="Username chỉ được chứa chữ cái, số và dấu gạch dưới")),
+    'email': String(required=True, allow_blank=False, pattern=EMAIL_PATTERN,
+                    messages=dict(_required('email'), pattern="Email không hợp lệ")),
+    'full_name': String(required=True, allow_blank=False, max_length=100,
+                        messages=dict(_required('full_name'),
+                                      max_length="Họ tên không được vượt quá 100 ký tự")),
+    'password': String(required=True, allow_blank=False, strip=False, min_length=8,
+                       max_length=128, validators=_PASSWORD_RULES, messages=dict(
+                           _required('password'),
+                           min_length="Mật khẩu phải có ít nhất 8 ký tự",
+                           max_length="Mật khẩu không được vượt quá 128 ký tự")),
+}, empty_message=_EMPTY).compile()
+
+LOGIN_SCHEMA = Schema({
+    'username': String(required=True, allow_blank=False, messages={
+        'required': "Username không được để trống", 'blank': "Username không được để trống"}),
+    'password': String(required=True, allow_blank=False, strip=False, messages={
+        'required': "Mật khẩu không được để trống", 'blank': "Mật khẩu không được để trống"}),
+}, empty_message=_EMPTY).compile()
+
+RESET_PASSWORD_SCHEMA = Schema({
+    'token': String(required=True, allow_blank=False, messages={
+        'required': "Token không được để trống", 'blank': "Token không được để trống"}),
+    'new_password': String(required=True, allow_blank=False, strip=False, min_length=8,
+                           max_length=128, validators=tuple(
+                               (rule, _PASSWORD_POLICY) for rule, _ in _PASSWORD_RULES), messages={
+        'required': "Mật khẩu mới không được để trống",
+        'blank': "Mật khẩu mới không được để trống",
+        'min_length': _PASSWORD_POLICY,
+        'max_length': _PASSWORD_POLICY}),
+}, empty_message=_EMPTY).compile()
+
+REQUEST_RESET_PASSWORD_SCHEMA = Schema({
+    'email': String(required=True, allow_blank=False, pattern=EMAIL_PATTERN, messages={
+        'required': "Email không được để trống",
+        'blank': "Email không được để trống",
+        'pattern': "Email không hợp lệ"}),
+}, empty_message=_EMPTY).compile()
+
+
+def _as_tuple(schema: Schema, data) -> Tuple[bool, str]:
+    result = schema.validate(data)
+    if result.errors:
+        return False, result.message
     return True, "Hợp lệ"
 
 
+def validate_register_data(data: Dict[str, Any]) -> Tuple[bool, str]:
+    return _as_tuple(REGISTER_SCHEMA, data)
+
+
 def validate_login_data(data: Dict[str, Any]) -> Tuple[bool, str]:
-    if not data:
-        return False, "Dữ liệu không được để trống"
-    
-    username = data.get('username', '').strip()
-    password = data.get('password', '')
-    
-    if not username:
-        return False, "Username không được để trống"
-    
-    if not password:
-        return False, "Mật khẩu không được để trống"
-    
-    return True, "Hợp lệ"
+    return _as_tuple(LOGIN_SCHEMA, data)
 
 
 def validate_email(email: str) -> bool:
-    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    return re.match(pattern, email) is not None
+    return re.match(EMAIL_PATTERN, email) is not None
 
 def validate_username(username: str) -> bool:
     if len(username) < 3 or len(username) > 50:
         return False
-    return re.match(r'^[a-zA-Z0-9_]+$', username) is not None
+    return re.match(USERNAME_PATTERN, username) is not None
 
 
 def validate_password(password: str) -> bool:
     if len(password) < 8 or len(password) > 128:
         return False
-    
-    if not any(c.isupper() for c in password):
-        return False
-    
-    if not any(c.islower() for c in password):
-        return False
-    
-    if not any(c.isdigit() for c in password):
-        return False
-    
-    special_chars = "!@#$%^&*()_+-=[]{}|;:,.<>?"
-    if not any(c in special_chars for c in password):
-        return False
-    
-    return True
+    return all(rule(password) for rule, _ in _PASSWORD_RULES)
 
 
 def validate_reset_password_data(data: Dict[str, Any]) -> Tuple[bool, str]:
-    if not data:
-        return False, "Dữ liệu không được để trống"
-    
-    token = data.get('token', '').strip()
-    new_password = data.get('new_password', '')
-    
-    if not token:
-        return False, "Token không được để trống"
-    
-    if not new_password:
-        return False, "Mật khẩu mới không được để trống"
-    
-    if not validate_password(new_password):
-        return False, "Mật khẩu phải có ít nhất 8 ký tự, bao gồm chữ hoa, chữ thường, số và ký tự đặc biệt"
-    
-    return True, "Hợp lệ"
+    return _as_tuple(RESET_PASSWORD_SCHEMA, data)
 
 
 def validate_request_reset_password(data: Dict[str, Any]) -> Tuple[bool, str]:
-    if not data:
-        return False, "Dữ liệu không được để trống"
-    
-    email = data.get('email', '').strip()
-    
-    if not email:
-        return False, "Email không được để trống"
-    
-    if not validate_email(email):
-        return False, "Email không hợp lệ"
-    
-    return True, "Hợp lệ"
+    return _as_tuple(REQUEST_RESET_PASSWORD_SCHEMA, data)
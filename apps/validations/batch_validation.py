@@ -0,0 +1,21 @@
+import os
+
+from apps.validations.schema import Schema, String, Boolean, Object
+
+BATCH_MAX_REQUESTS = int(os.getenv('BATCH_MAX_REQUESTS', 20))
+
+BATCH_SCHEMA = Schema({
+    'atomic': Boolean(default=False, messages={'type': "atomic must be a boolean"}),
+}, empty_message="Dữ liệu không được để trống").compile()
+
+BATCH_REQUEST_SCHEMA = Schema({
+    'method': String(required=True, pattern=r'(?i)^(GET|POST|PUT|PATCH|DELETE)$', messages={
+        'required': "Method is required",
+        'type': "Method must be a string",
+        'pattern': "Unsupported method"}),
+    'path': String(required=True, pattern=r'^/api/', messages={
+        'required': "Path is required",
+        'type': "Path must be a string",
+        'pattern': "Path must start with /api/"}),
+    'body': Object(nullable=True, messages={'type': "Body must be an object"}),
+}, empty_message="Yêu cầu con không hợp lệ").compile()
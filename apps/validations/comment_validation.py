@@ -1,55 +1,45 @@
 from flask import request, jsonify
 
+from apps.validations.schema import Schema, String
 
-def validate_create_comment():
+_CONTENT_MESSAGES = {
+    'required': "Content is required",
+    'null': "Content is required",
+    'type': "Content must be a string",
+    'blank': "Content cannot be empty",
+    'max_length': "Content is too long (max 5000 characters)",
+}
+
+COMMENT_CREATE_SCHEMA = Schema({
+    'content': String(required=True, allow_blank=False, max_length=5000,
+                      messages=dict(_CONTENT_MESSAGES, blank="Content is required")),
+    'task_id': String(required=True, allow_blank=False, messages={
+        'required': "Task ID is required",
+        'null': "Task ID is required",
+        'blank': "Task ID is required"}),
+}).compile()
+
+COMMENT_UPDATE_SCHEMA = Schema({
+    'content': String(required=True, allow_blank=False, max_length=5000,
+                      messages=_CONTENT_MESSAGES),
+}).compile()
+
+
+def validation_error(result):
+    """400 response in this blueprint's ``{"error": ...}`` format."""
+    return jsonify({"error": result.message, "errors": result.errors}), 400
+
+
+def validate_create_comment(data=None):
     """Validate comment creation data."""
-    data = request.get_json()
-    
-    if not data:
-        return jsonify({"error": "No data provided"}), 400
-    
-    content = data.get('content', '').strip()
-    task_id = data.get('task_id', '').strip()
-    
-    if not content:
-        return jsonify({"error": "Content is required"}), 400
-    
-    if len(content) < 1:
-        return jsonify({"error": "Content cannot be empty"}), 400
-    
-    if len(content) > 5000:
-        return jsonify({"error": "Content is too long (max 5000 characters)"}), 400
-    
-    if not task_id:
-        return jsonify({"error": "Task ID is required"}), 400
-    
-    return None
+    result = COMMENT_CREATE_SCHEMA.validate(request.get_json(silent=True) if data is None else data)
+    return validation_error(result) if result.errors else None
 
 
-def validate_update_comment():
+def validate_update_comment(data=None):
     """Validate comment update data."""
-    data = request.get_json()
-    
-    if not data:
-        return jsonify({"error": "No data provided"}), 400
-    
-    content = data.get('content')
-    
-    if content is None:
-        return jsonify({"error": "Content is required"}), 400
-    
-    content = content.strip()
-    
-    if not content:
-        return jsonify({"error": "Content cannot be empty"}), 400
-    
-    if len(content) < 1:
-        return jsonify({"error": "Content must have at least 1 character"}), 400
-    
-    if len(content) > 5000:
-        return jsonify({"error": "Content is too long (max 5000 characters)"}), 400
-    
-    return None
+    result = COMMENT_UPDATE_SCHEMA.validate(request.get_json(silent=True) if data is None else data)
+    return validation_error(result) if result.errors else None
 
 
 def validate_comment_id(comment_id):
@@ -66,4 +56,11 @@ def validate_comment_id(comment_id):
     return None
 
 
-__all__ = ['validate_create_comment', 'validate_update_comment', 'validate_comment_id']
+__all__ = [
+    'COMMENT_CREATE_SCHEMA',
+    'COMMENT_UPDATE_SCHEMA',
+    'validation_error',
+    'validate_create_comment',
+    'validate_update_comment',
+    'validate_comment_id'
+]
@@ -1,35 +1,59 @@
 from typing import Tuple
 
+from apps.models.project import ProjectStatus
+from apps.models.project_member import ProjectRole
+from apps.validations.schema import Schema, String, Choice, DateTime, UUIDString
+
+_NAME_MESSAGES = {
+    'required': "Project name is required",
+    'blank': "Project name is required",
+    'type': "Project name must be a string",
+    'min_length': "Project name must be at least 3 characters",
+    'max_length': "Project name must not exceed 100 characters",
+}
+_DESCRIPTION_MESSAGES = {
+    'type': "Project description must be a string",
+    'max_length': "Project description must not exceed 500 characters",
+}
+
+PROJECT_CREATE_SCHEMA = Schema({
+    'name': String(required=True, allow_blank=False, min_length=3, max_length=100,
+                   messages=_NAME_MESSAGES),
+    'description': String(max_length=500, nullable=True, default='',
+                          messages=_DESCRIPTION_MESSAGES),
+    'status': Choice(ProjectStatus, messages={'choice': "Invalid project status"}),
+    'start_date': DateTime(nullable=True, messages={'type': 'Format ngày bắt đầu không hợp lệ'}),
+    'end_date': DateTime(nullable=True, messages={'type': 'Format ngày kết thúc không hợp lệ'}),
+}, empty_message="Dữ liệu không được để trống").compile()
+
+PROJECT_UPDATE_SCHEMA = Schema({
+    'name': String(allow_blank=False, min_length=3, max_length=100, messages=_NAME_MESSAGES),
+    'description': String(max_length=500, messages=_DESCRIPTION_MESSAGES),
+    'status': Choice(ProjectStatus, messages={'choice': "Invalid project status"}),
+}, empty_message="Dữ liệu không được để trống").compile()
+
+PROJECT_MEMBER_CREATE_SCHEMA = Schema({
+    'user_id': UUIDString(required=True, messages={'required': "User ID is required",
+                                                   'type': "Invalid user ID"}),
+    'role': Choice(ProjectRole, default=ProjectRole.MEMBER,
+                   messages={'choice': "Invalid member role"}),
+}, empty_message="Dữ liệu không được để trống").compile()
+
+PROJECT_MEMBER_UPDATE_SCHEMA = Schema({
+    'role': Choice(ProjectRole, required=True,
+                   messages={'required': "Member role is required",
+                             'choice': "Invalid member role"}),
+}, empty_message="Dữ liệu không được để trống").compile()
+
+
 def validate_project_creation(data: dict) -> Tuple[bool, str]:
-    if not data.get('name'):
-        return False, "Project name is required"
-    
-    if len(data['name'].strip()) < 3:
-        return False, "Project name must be at least 3 characters"
-    
-    if len(data['name']) > 100:
-        return False, "Project name must not exceed 100 characters"
-    
-    if data.get('description') and len(data['description']) > 500:
-        return False, "Project description must not exceed 500 characters"
-    
-    if data.get('status') and data['status'] not in ['PLANNING', 'IN_PROGRESS', 'ON_HOLD', 'COMPLETED', 'CANCELLED']:
-        return False, "Invalid project status"
-    
+    result = PROJECT_CREATE_SCHEMA.validate(data)
+    if result.errors:
+        return False, result.message
     return True, "Valid"
 
 def validate_project_update(data: dict) -> Tuple[bool, str]:
-    if data.get('name'):
-        if len(data['name'].strip()) < 3:
-            return False, "Project name must be at least 3 characters"
-        
-        if len(data['name']) > 100:
-            return False, "Project name must not exceed 100 characters"
-    
-    if data.get('description') and len(data['description']) > 500:
-        return False, "Project description must not exceed 500 characters"
-    
-    if data.get('status') and data['status'] not in ['PLANNING', 'IN_PROGRESS', 'ON_HOLD', 'COMPLETED', 'CANCELLED']:
-        return False, "Invalid project status"
-    
+    result = PROJECT_UPDATE_SCHEMA.validate(data)
+    if result.errors:
+        return False, result.message
     return True, "Valid"
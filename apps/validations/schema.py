@@ -0,0 +1,287 @@
+"""
+Declarative request schemas.
+
+A ``Schema`` is a mapping of field name to field spec. ``compile()`` turns
+every spec into a closure with its limits and messages bound once, so
+validating a payload is a loop over prebuilt checks with no per-request
+branching on configuration. ``validate`` returns the cleaned data (strings
+stripped, enums and dates converted) together with every error found.
+"""
+import math
+import re
+import uuid
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from flask import request
+
+_MISSING = object()
+
+Check = Callable[[Any], Tuple[Any, Optional[str]]]
+
+
+class Field:
+    """Base spec. ``messages`` overrides the default text per error kind."""
+
+    default_messages = {
+        'required': 'This field is required',
+        'type': 'Invalid value',
+        'null': 'This field may not be null',
+    }
+
+    def __init__(self, required: bool = False, nullable: bool = False, default=_MISSING,
+                 messages: Optional[Dict[str, str]] = None):
+        self.required = required
+        self.nullable = nullable
+        self.default = default
+        self.messages = dict(self.default_messages, **(messages or {}))
+
+    def build(self) -> Check:
+        """Return ``value -> (cleaned, error)`` for non-null values."""
+        raise NotImplementedError
+
+    def compile(self) -> Check:
+        check = self.build()
+        nullable = self.nullable
+        null_error = (None, self.messages['null'])
+
+        def run(value):
+            if value is None:
+                return (None, None) if nullable else null_error
+            return check(value)
+        return run
+
+
+class String(Field):
+
+    default_messages = dict(
+        Field.default_messages,
+        type='Must be a string',
+        blank='This field may not be blank',
+        min_length='Too short',
+        max_length='Too long',
+        pattern='Invalid format',
+    )
+
+    def __init__(self, strip: bool = True, allow_blank: bool = True,
+                 min_length: Optional[int] = None, max_length: Optional[int] = None,
+                 pattern: Optional[str] = None, validators: Tuple[Tuple[Callable, str], ...] = (),
+                 **kwargs):
+        super().__init__(**kwargs)
+        self.strip = strip
+        self.allow_blank = allow_blank
+        self.min_length = min_length
+        self.max_length = max_length
+        self.pattern = re.compile(pattern) if pattern else None
+        self.validators = validators
+
+    def build(self) -> Check:
+        strip, allow_blank = self.strip, self.allow_blank
+        min_length, max_length = self.min_length, self.max_length
+        match = self.pattern.match if self.pattern else None
+        validators = self.validators
+        m = self.messages
+
+        def check(value):
+            if not isinstance(value, str):
+                return None, m['type']
+            if strip:
+                value = value.strip()
+            if not value and not allow_blank:
+                return None, m['blank']
+            if min_length is not None and len(value) < min_length:
+                return None, m['min_length']
+            if max_length is not None and len(value) > max_length:
+                return None, m['max_length']
+            if match is not None and not match(value):
+                return None, m['pattern']
+            for validator, message in validators:
+                if not validator(value):
+                    return None, message
+            return value, None
+        return check
+
+
+class Choice(Field):
+    """One of an Enum's values; the cleaned value is the member."""
+
+    default_messages = dict(Field.default_messages, choice='Invalid choice')
+
+    def __init__(self, enum_class, **kwargs):
+        super().__init__(**kwargs)
+        self.enum_class = enum_class
+
+    def build(self) -> Check:
+        members = {member.value: member for member in self.enum_class}
+        error = (None, self.messages['choice'])
+
+        def check(value):
+            member = members.get(value) if isinstance(value, str) else None
+            return (member, None) if member is not None else error
+        return check
+
+
+class Number(Field):
+    """int or float (not bool); the cleaned value is a float."""
+
+    default_messages = dict(Field.default_messages, type='Must be a number')
+
+    def build(self) -> Check:
+        error = (None, self.messages['type'])
+
+        def check(value):
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                return error
+            value = float(value)
+            return (value, None) if math.isfinite(value) else error
+        return check
+
+
+class Boolean(Field):
+
+    default_messages = dict(Field.default_messages, type='Must be a boolean')
+
+    def build(self) -> Check:
+        error = (None, self.messages['type'])
+
+        def check(value):
+            return (value, None) if isinstance(value, bool) else error
+        return check
+
+
+class Object(Field):
+    """A JSON object, passed through as is."""
+
+    default_messages = dict(Field.default_messages, type='Must be an object')
+
+    def build(self) -> Check:
+        error = (None, self.messages['type'])
+
+        def check(value):
+            return (value, None) if isinstance(value, dict) else error
+        return check
+
+
+class UUIDString(Field):
+
+    default_messages = dict(Field.default_messages, type='Invalid ID format')
+
+    def build(self) -> Check:
+        error = (None, self.messages['type'])
+
+        def check(value):
+            try:
+                return str(uuid.UUID(str(value))), None
+            except ValueError:
+                return error
+        return check
+
+
+class DateTime(Field):
+    """ISO 8601 string, parsed with ``datetime.fromisoformat``; "" means unset."""
+
+    default_messages = dict(Field.default_messages, type='Invalid date format')
+
+    def build(self) -> Check:
+        error = (None, self.messages['type'])
+
+        def check(value):
+            if not isinstance(value, str):
+                return error
+            if not value:
+                return None, None
+            try:
+                return datetime.fromisoformat(value), None
+            except ValueError:
+                return error
+        return check
+
+
+class ValidationResult(tuple):
+    """``(data, errors)``; ``message`` is the first error, for the
+    ``{'success': False, 'message': ...}`` responses."""
+
+    __slots__ = ()
+
+    def __new__(cls, data, errors):
+        return super().__new__(cls, (data, errors))
+
+    @property
+    def data(self) -> dict:
+        return self[0]
+
+    @property
+    def errors(self) -> Dict[str, str]:
+        return self[1]
+
+    @property
+    def message(self) -> Optional[str]:
+        return next(iter(self[1].values()), None)
+
+
+class Schema:
+
+    def __init__(self, fields: Dict[str, Field], empty_message: str = 'No data provided'):
+        self.fields = fields
+        self.empty_message = empty_message
+        self._checks = None
+
+    def compile(self) -> 'Schema':
+        self._checks = tuple(
+            (name, spec.required, spec.default, spec.messages['required'], spec.compile())
+            for name, spec in self.fields.items()
+        )
+        return self
+
+    def validate(self, data) -> ValidationResult:
+        if not data or not isinstance(data, dict):
+            return ValidationResult({}, {'_schema': self.empty_message})
+
+        cleaned, errors = {}, {}
+        get = data.get
+        for name, required, default, required_message, check in self._checks:
+            value = get(name, _MISSING)
+            if value is _MISSING:
+                if required:
+                    errors[name] = required_message
+                elif default is not _MISSING:
+                    cleaned[name] = default
+                continue
+            value, error = check(value)
+            if error is not None:
+                errors[name] = error
+            else:
+                cleaned[name] = value
+        return ValidationResult(cleaned, errors)
+
+    def validate_many(self, items) -> Tuple[List[dict], Dict[int, Dict[str, str]]]:
+        """Validate a bulk array; errors are keyed by item index."""
+        if not isinstance(items, list):
+            return [], {-1: {'_schema': 'Expected a list'}}
+        validate = self.validate
+        cleaned, errors = [], {}
+        for index, item in enumerate(items):
+            data, item_errors = validate(item)
+            if item_errors:
+                errors[index] = item_errors
+            else:
+                cleaned.append(data)
+        return cleaned, errors
+
+    def load(self) -> ValidationResult:
+        """Parse the current request body once and validate it."""
+        return self.validate(request.get_json(silent=True))
+
+
+__all__ = [
+    'Field',
+    'String',
+    'Choice',
+    'Number',
+    'Boolean',
+    'Object',
+    'UUIDString',
+    'DateTime',
+    'Schema',
+    'ValidationResult',
+]
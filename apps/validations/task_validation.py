@@ -1,44 +1,53 @@
 from typing import Tuple
 
+from apps.models.task import TaskStatus, TaskPriority
+from apps.validations.schema import Schema, String, Choice, DateTime, Number
+
+_TITLE_MESSAGES = {
+    'required': "Task title is required",
+    'blank': "Task title is required",
+    'type': "Task title must be a string",
+    'min_length': "Task title must be at least 3 characters",
+    'max_length': "Task title must not exceed 200 characters",
+}
+_DESCRIPTION_MESSAGES = {
+    'type': "Task description must be a string",
+    'max_length': "Task description must not exceed 1000 characters",
+}
+
+TASK_CREATE_SCHEMA = Schema({
+    'title': String(required=True, allow_blank=False, min_length=3, max_length=200,
+                    messages=_TITLE_MESSAGES),
+    'description': String(max_length=1000, nullable=True, default='',
+                          messages=_DESCRIPTION_MESSAGES),
+    'project_id': String(required=True, allow_blank=False,
+                         messages={'required': "Project ID is required",
+                                   'blank': "Project ID is required"}),
+    'assignee_id': String(nullable=True, messages={'type': "Invalid assignee ID"}),
+    'status': Choice(TaskStatus, messages={'choice': "Invalid task status"}),
+    'priority': Choice(TaskPriority, default=TaskPriority.MEDIUM,
+                       messages={'choice': "Invalid task priority"}),
+    'due_date': DateTime(nullable=True, messages={'type': "Format ngày không hợp lệ"}),
+}, empty_message="Dữ liệu không được để trống").compile()
+
+TASK_UPDATE_SCHEMA = Schema({
+    'title': String(allow_blank=False, min_length=3, max_length=200, messages=_TITLE_MESSAGES),
+    'description': String(max_length=1000, messages=_DESCRIPTION_MESSAGES),
+    'status': Choice(TaskStatus, messages={'choice': "Invalid task status"}),
+    'priority': Choice(TaskPriority, messages={'choice': "Invalid task priority"}),
+    'assignee_id': String(nullable=True, messages={'type': "Invalid assignee ID"}),
+    'position': Number(messages={'type': "Task position must be a number"}),
+}, empty_message="Dữ liệu không được để trống").compile()
+
+
 def validate_task_creation(data: dict) -> Tuple[bool, str]:
-    if not data.get('title'):
-        return False, "Task title is required"
-    
-    if len(data['title'].strip()) < 3:
-        return False, "Task title must be at least 3 characters"
-    
-    if len(data['title']) > 200:
-        return False, "Task title must not exceed 200 characters"
-    
-    if not data.get('project_id'):
-        return False, "Project ID is required"
-    
-    if data.get('description') and len(data['description']) > 1000:
-        return False, "Task description must not exceed 1000 characters"
-    
-    if data.get('status') and data['status'] not in ['TODO', 'IN_PROGRESS', 'IN_REVIEW', 'DONE']:
-        return False, "Invalid task status"
-    
-    if data.get('priority') and data['priority'] not in ['LOW', 'MEDIUM', 'HIGH', 'URGENT']:
-        return False, "Invalid task priority"
-    
+    result = TASK_CREATE_SCHEMA.validate(data)
+    if result.errors:
+        return False, result.message
     return True, "Valid"
 
 def validate_task_update(data: dict) -> Tuple[bool, str]:
-    if data.get('title'):
-        if len(data['title'].strip()) < 3:
-            return False, "Task title must be at least 3 characters"
-        
-        if len(data['title']) > 200:
-            return False, "Task title must not exceed 200 characters"
-    
-    if data.get('description') and len(data['description']) > 1000:
-        return False, "Task description must not exceed 1000 characters"
-    
-    if data.get('status') and data['status'] not in ['TODO', 'IN_PROGRESS', 'IN_REVIEW', 'DONE']:
-        return False, "Invalid task status"
-    
-    if data.get('priority') and data['priority'] not in ['LOW', 'MEDIUM', 'HIGH', 'URGENT']:
-        return False, "Invalid task priority"
-    
+    result = TASK_UPDATE_SCHEMA.validate(data)
+    if result.errors:
+        return False, result.message
     return True, "Valid"
@@ -0,0 +1,15 @@
+"""
+ASGI entry point:
+
+    uvicorn asgi:app --workers 4
+
+GET /api/tasks/<id>, /api/tasks/my-tasks, /api/tasks/project/<id> and
+/api/comments/task/<id> are served on the asyncio engine, so a slow client
+or a slow query does not hold a thread. Every other route runs the regular
+Flask app on a thread pool (ASGI_SYNC_THREADS).
+"""
+from app import create_app
+from apps.routers.async_router import create_asgi_app
+
+flask_app = create_app()
+app = create_asgi_app(flask_app)
@@ -0,0 +1,80 @@
+"""
+Compare two load test results and fail on regressions.
+
+    python -m benchmarks.compare baseline.json candidate.json --threshold 10
+
+A route regresses when its p95 latency grows, or its throughput drops, by
+more than ``--threshold`` percent. Routes with fewer than ``--min-requests``
+samples in either run are reported but never fail the comparison.
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+
+def _change(old, new):
+    if not old or new is None:
+        return None
+    return (new - old) / old * 100
+
+
+def compare(baseline: dict, candidate: dict, threshold: float, min_requests: int) -> list:
+    rows = []
+    routes = sorted(set(baseline['routes']) | set(candidate['routes']))
+    for route in routes + ['TOTAL']:
+        if route == 'TOTAL':
+            old, new = baseline['total'], candidate['total']
+        else:
+            old, new = baseline['routes'].get(route), candidate['routes'].get(route)
+        if old is None or new is None:
+            rows.append((route, None, None, None, 'only in ' + ('candidate' if old is None else 'baseline')))
+            continue
+
+        p95 = _change(old['p95_ms'], new['p95_ms'])
+        p99 = _change(old['p99_ms'], new['p99_ms'])
+        rps = _change(old['throughput_rps'], new['throughput_rps'])
+        verdict = ''
+        if min(old['requests'], new['requests']) < min_requests:
+            verdict = 'too few samples'
+        elif (p95 is not None and p95 > threshold) or (rps is not None and rps < -threshold):
+            verdict = 'REGRESSION'
+        elif (p95 is not None and p95 < -threshold) or (rps is not None and rps > threshold):
+            verdict = 'improved'
+        rows.append((route, p95, p99, rps, verdict))
+    return rows
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('baseline', type=Path)
+    parser.add_argument('candidate', type=Path)
+    parser.add_argument('--threshold', type=float, default=10, help='percent')
+    parser.add_argument('--min-requests', type=int, default=50)
+    args = parser.parse_args(argv)
+
+    baseline = json.loads(args.baseline.read_text())
+    candidate = json.loads(args.candidate.read_text())
+    print(f"baseline  {(baseline['git'].get('commit') or '?')[:10]}  {baseline['timestamp']}")
+    print(f"candidate {(candidate['git'].get('commit') or '?')[:10]}  {candidate['timestamp']}")
+    if baseline['dataset'] != candidate['dataset']:
+        print("warning: the runs used different datasets")
+
+    def fmt(value):
+        return f"{value:+7.1f}%" if value is not None else f"{'-':>8}"
+
+    rows = compare(baseline, candidate, args.threshold, args.min_requests)
+    print(f"{'route':<44} {'p95':>8} {'p99':>8} {'rps':>8}")
+    for route, p95, p99, rps, verdict in rows:
+        print(f"{route:<44} {fmt(p95)} {fmt(p99)} {fmt(rps)}  {verdict}")
+
+    regressions = [row for row in rows if row[4] == 'REGRESSION']
+    if regressions:
+        print(f"FAIL: {len(regressions)} route(s) regressed by more than {args.threshold:.0f}%")
+        return 1
+    print("OK: no regressions")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,68 @@
+"""
+Synthetic benchmark dataset: seed users, projects, tasks and comments with
+skewed, reproducible distributions and record a manifest for the load test.
+
+    python -m benchmarks.dataset --scale small
+    DATABASE_URL=sqlite:///bench.db python -m benchmarks.dataset --scale tiny --reset
+
+Rows are generated by apps.utils.seeder (also available as
+``flask --app app seed``), which streams them through COPY on Postgres.
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+from apps.utils.seeder import SCALES, DatasetSpec, seed
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+RESULTS_DIR = PROJECT_ROOT / 'benchmarks' / 'results'
+MANIFEST_PATH = RESULTS_DIR / 'dataset.json'
+
+
+def load_manifest(path: Path = MANIFEST_PATH) -> DatasetSpec:
+    return DatasetSpec.from_dict(json.loads(Path(path).read_text()))
+
+
+def save_manifest(spec: DatasetSpec, rates: dict = None, path: Path = MANIFEST_PATH) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = dict(spec.to_dict(), rows_per_second=rates or {})
+    path.write_text(json.dumps(data, indent=2) + '\n')
+
+
+def print_progress(table: str, done: int, total: int, elapsed: float) -> None:
+    end = '\n' if done >= total else ''
+    print(f"\r  {table}: {done}/{total} rows ({done / max(elapsed, 1e-9):,.0f}/s)",
+          end=end, flush=True)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--scale', choices=sorted(SCALES), default='small')
+    parser.add_argument('--users', type=int)
+    parser.add_argument('--projects', type=int)
+    parser.add_argument('--tasks', type=int)
+    parser.add_argument('--comments', type=int)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--reset', action='store_true',
+                        help='drop and recreate every table first')
+    parser.add_argument('--keep-indexes', action='store_true',
+                        help='maintain indexes during the load instead of rebuilding them')
+    args = parser.parse_args(argv)
+
+    spec = DatasetSpec.from_scale(
+        args.scale, args.seed,
+        users=args.users, projects=args.projects, tasks=args.tasks, comments=args.comments
+    )
+    print(f"Seeding {spec.to_dict()}")
+    start = time.perf_counter()
+    rates = seed(spec, reset=args.reset, defer_indexes=not args.keep_indexes,
+                 progress=print_progress)
+    save_manifest(spec, rates)
+    print(f"Done in {time.perf_counter() - start:.1f}s; manifest at {MANIFEST_PATH}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
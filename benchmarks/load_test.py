@@ -0,0 +1,328 @@
+"""
+Load test: replay scripted workloads against every blueprint and report
+throughput and p50/p95/p99 latency per route.
+
+    python -m benchmarks.dataset --scale small
+    python -m benchmarks.load_test --duration 60 --concurrency 32
+    python -m benchmarks.compare benchmarks/results/<old>.json benchmarks/results/<new>.json
+
+Without ``--url`` a local server is started with ``--server`` (gunicorn,
+flask or uvicorn) against the same DATABASE_URL / DB_* settings. Results
+are written as JSON to benchmarks/results/ and tagged with the git commit.
+"""
+import argparse
+import http.client
+import json
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from apps.utils.seeder import BENCH_PASSWORD, ACTIVE_USER_SKEW, DatasetSpec, skewed
+from benchmarks.dataset import PROJECT_ROOT, RESULTS_DIR, MANIFEST_PATH, load_manifest
+from benchmarks.workloads import WORKLOADS, DEFAULT_MIX, parse_mix, encode
+
+
+class Recorder:
+    """Latency samples per route, shared by all virtual users."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._samples = defaultdict(list)
+        self._statuses = defaultdict(lambda: defaultdict(int))
+        self.recording = False
+
+    def add(self, route: str, status: int, elapsed: float) -> None:
+        if not self.recording:
+            return
+        with self._lock:
+            self._samples[route].append(elapsed)
+            self._statuses[route][status] += 1
+
+    def summary(self, duration: float) -> dict:
+        routes = {}
+        all_samples = []
+        with self._lock:
+            for route, samples in sorted(self._samples.items()):
+                statuses = dict(self._statuses[route])
+                routes[route] = _stats(samples, statuses, duration)
+                all_samples.extend(samples)
+            totals = defaultdict(int)
+            for statuses in self._statuses.values():
+                for status, count in statuses.items():
+                    totals[status] += count
+        return {'routes': routes, 'total': _stats(all_samples, dict(totals), duration)}
+
+
+def _percentile(samples: list, p: float):
+    if not samples:
+        return None
+    return round(samples[min(len(samples) - 1, int(p * len(samples)))] * 1000, 3)
+
+
+def _stats(samples: list, statuses: dict, duration: float) -> dict:
+    samples = sorted(samples)
+    errors = sum(count for status, count in statuses.items() if not 200 <= status < 400)
+    return {
+        'requests': len(samples),
+        'errors': errors,
+        'statuses': {str(status): count for status, count in sorted(statuses.items())},
+        'throughput_rps': round(len(samples) / duration, 2) if duration else None,
+        'mean_ms': round(sum(samples) / len(samples) * 1000, 3) if samples else None,
+        'p50_ms': _percentile(samples, 0.50),
+        'p95_ms': _percentile(samples, 0.95),
+        'p99_ms': _percentile(samples, 0.99),
+        'max_ms': round(samples[-1] * 1000, 3) if samples else None,
+    }
+
+
+class BenchClient:
+    """One virtual user: a keep-alive connection and a bearer token."""
+
+    def __init__(self, base_url: str, recorder: Recorder, timeout: float = 30):
+        parts = urlsplit(base_url)
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.recorder = recorder
+        self.timeout = timeout
+        self.token = None
+        self.user_id = None
+        self._conn = None
+
+    def _connection(self) -> http.client.HTTPConnection:
+        if self._conn is None:
+            self._conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+        return self._conn
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def login(self, username: str, password: str) -> bool:
+        body = self.request('POST', '/api/auth/login', '/api/auth/login',
+                            {'username': username, 'password': password}, authenticated=False)
+        data = (body or {}).get('data') or {}
+        self.token = data.get('token')
+        self.user_id = (data.get('user') or {}).get('id')
+        return self.token is not None
+
+    def request(self, method: str, path: str, route: str, payload=None, authenticated: bool = True):
+        headers = {'Accept': 'application/json'}
+        body = None
+        if payload is not None:
+            body = encode(payload)
+            headers['Content-Type'] = 'application/json'
+        if authenticated and self.token:
+            headers['Authorization'] = f'Bearer {self.token}'
+
+        start = time.perf_counter()
+        try:
+            conn = self._connection()
+            conn.request(method, path, body=body, headers=headers)
+            response = conn.getresponse()
+            raw = response.read()
+            status = response.status
+            if response.will_close:
+                self.close()
+        except (OSError, http.client.HTTPException):
+            self.close()
+            self.recorder.add(f'{method} {route}', 599, time.perf_counter() - start)
+            return None
+        self.recorder.add(f'{method} {route}', status, time.perf_counter() - start)
+
+        try:
+            return json.loads(raw) if raw else None
+        except ValueError:
+            return None
+
+
+def _virtual_user(worker_id: int, args, dataset: DatasetSpec, weights: dict,
+                  recorder: Recorder, stop: threading.Event) -> None:
+    rng = random.Random(args.seed * 1000 + worker_id)
+    client = BenchClient(args.url, recorder)
+    index = skewed(rng, dataset.users, ACTIVE_USER_SKEW)
+    if not client.login(f'bench_user_{index}', BENCH_PASSWORD):
+        print(f"virtual user {worker_id}: login as bench_user_{index} failed", file=sys.stderr)
+        return
+
+    names = list(weights)
+    cumulative = [weights[name] for name in names]
+    try:
+        while not stop.is_set():
+            name = rng.choices(names, weights=cumulative)[0]
+            WORKLOADS[name](client, dataset, rng)
+    finally:
+        client.close()
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(kind: str, workers: int, threads: int):
+    port = _free_port()
+    env = dict(os.environ, BACKGROUND_WORKERS='False', LOG_QUEUE='True')
+    if kind == 'gunicorn':
+        env.update(GUNICORN_BIND=f'127.0.0.1:{port}', GUNICORN_WORKERS=str(workers),
+                   GUNICORN_THREADS=str(threads), GUNICORN_ACCESSLOG='/dev/null')
+        command = [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'wsgi:app']
+    elif kind == 'uvicorn':
+        command = [sys.executable, '-m', 'uvicorn', 'asgi:app', '--port', str(port),
+                   '--workers', str(workers), '--no-access-log']
+    else:
+        command = [sys.executable, '-m', 'flask', '--app', 'app', 'run', '--port', str(port),
+                   '--with-threads', '--no-reload']
+    process = subprocess.Popen(command, cwd=PROJECT_ROOT, env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    url = f'http://127.0.0.1:{port}'
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"{kind} exited with status {process.returncode}")
+        try:
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=1)
+            conn.request('GET', '/')
+            conn.getresponse().read()
+            conn.close()
+            return process, url
+        except OSError:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError(f"{kind} did not start within 30s")
+
+
+def git_info() -> dict:
+    def git(*args):
+        try:
+            return subprocess.run(['git', *args], cwd=PROJECT_ROOT, capture_output=True,
+                                  text=True, check=True).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+    status = git('status', '--porcelain', '--untracked-files=no')
+    return {
+        'commit': git('rev-parse', 'HEAD'),
+        'branch': git('rev-parse', '--abbrev-ref', 'HEAD'),
+        'dirty': bool(status) if status is not None else None,
+    }
+
+
+def _database_backend() -> str:
+    from sqlalchemy.engine import make_url
+    from apps.utils.db import DATABASE_URL
+    return make_url(DATABASE_URL).get_backend_name()
+
+
+def print_report(result: dict) -> None:
+    print(f"{'route':<44} {'req':>7} {'err':>5} {'rps':>8} {'p50':>8} {'p95':>8} {'p99':>8}")
+    for route, stats in list(result['routes'].items()) + [('TOTAL', result['total'])]:
+        print(f"{route:<44} {stats['requests']:>7} {stats['errors']:>5} "
+              f"{stats['throughput_rps'] or 0:>8.1f} {stats['p50_ms'] or 0:>8.1f} "
+              f"{stats['p95_ms'] or 0:>8.1f} {stats['p99_ms'] or 0:>8.1f}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--url', help='server to test; started locally when omitted')
+    parser.add_argument('--server', choices=('gunicorn', 'flask', 'uvicorn'), default='gunicorn')
+    parser.add_argument('--server-workers', type=int, default=2)
+    parser.add_argument('--server-threads', type=int, default=8)
+    parser.add_argument('--duration', type=float, default=30, help='measured seconds')
+    parser.add_argument('--warmup', type=float, default=5, help='unmeasured seconds first')
+    parser.add_argument('--concurrency', type=int, default=16, help='virtual users')
+    parser.add_argument('--mix', default=DEFAULT_MIX, help='workload=weight,...')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--dataset', type=Path, default=MANIFEST_PATH)
+    parser.add_argument('--output', type=Path, help='result file; default benchmarks/results/')
+    parser.add_argument('--label', default='', help='free-form note stored with the result')
+    args = parser.parse_args(argv)
+
+    weights = parse_mix(args.mix)
+    if not args.dataset.exists():
+        print(f"No dataset manifest at {args.dataset}; run python -m benchmarks.dataset first",
+              file=sys.stderr)
+        return 2
+    dataset = load_manifest(args.dataset)
+
+    process = None
+    if not args.url:
+        process, args.url = start_server(args.server, args.server_workers, args.server_threads)
+        print(f"Started {args.server} at {args.url}")
+
+    recorder = Recorder()
+    stop = threading.Event()
+    threads = [
+        threading.Thread(target=_virtual_user, args=(i, args, dataset, weights, recorder, stop),
+                         daemon=True)
+        for i in range(args.concurrency)
+    ]
+    try:
+        for thread in threads:
+            thread.start()
+        time.sleep(args.warmup)
+        recorder.recording = True
+        started = time.perf_counter()
+        time.sleep(args.duration)
+        recorder.recording = False
+        measured = time.perf_counter() - started
+        stop.set()
+        for thread in threads:
+            thread.join(timeout=30)
+    finally:
+        stop.set()
+        if process is not None:
+            process.terminate()
+            process.wait(timeout=60)
+
+    result = {
+        'benchmark': 'load_test',
+        'label': args.label,
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'git': git_info(),
+        'environment': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'database': _database_backend(),
+            'server': 'external' if process is None else args.server,
+        },
+        'dataset': dataset.to_dict(),
+        'config': {
+            'duration': args.duration,
+            'warmup': args.warmup,
+            'concurrency': args.concurrency,
+            'mix': weights,
+            'seed': args.seed,
+            'server_workers': args.server_workers,
+            'server_threads': args.server_threads,
+        },
+        **recorder.summary(measured),
+    }
+
+    output = args.output
+    if output is None:
+        commit = (result['git']['commit'] or 'nogit')[:10]
+        stamp = datetime.now().strftime('%Y%m%d-%H%M%S')
+        output = RESULTS_DIR / f'load-{stamp}-{commit}.json'
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(result, indent=2) + '\n')
+
+    print_report(result)
+    print(f"Results written to {output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
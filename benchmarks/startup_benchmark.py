@@ -0,0 +1,79 @@
+"""
+Cold-start benchmark: time ``from app import create_app; create_app()`` in
+fresh interpreters and fail when the median exceeds the budget.
+
+    python -m benchmarks.startup_benchmark --runs 7 --budget-ms 1000
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+STARTUP_BUDGET_MS = float(os.getenv('STARTUP_BUDGET_MS', 1000))
+
+_SNIPPET = (
+    "import time; t = time.perf_counter(); "
+    "from app import create_app; "
+    "create_app({'START_BACKGROUND_WORKERS': False}); "
+    "print((time.perf_counter() - t) * 1000)"
+)
+_IMPORTTIME = re.compile(r'import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)')
+
+
+def _run(env: dict, importtime: bool = False) -> subprocess.CompletedProcess:
+    flags = ['-X', 'importtime'] if importtime else []
+    return subprocess.run(
+        [sys.executable, *flags, '-c', _SNIPPET],
+        cwd=PROJECT_ROOT, env=env, capture_output=True, text=True, check=True
+    )
+
+
+def measure(env: dict) -> float:
+    return float(_run(env).stdout.strip().splitlines()[-1])
+
+
+def slowest_imports(env: dict) -> dict:
+    """Cumulative ms per top-level import; -X importtime inflates these."""
+    modules = {}
+    for match in _IMPORTTIME.finditer(_run(env, importtime=True).stderr):
+        # Only top-level imports so cumulative times are not double counted.
+        if len(match.group(3)) == 1:
+            modules[match.group(4)] = int(match.group(2)) / 1000
+    return modules
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=7)
+    parser.add_argument('--budget-ms', type=float, default=STARTUP_BUDGET_MS)
+    parser.add_argument('--top', type=int, default=10)
+    args = parser.parse_args(argv)
+
+    env = dict(os.environ)
+    for key, value in (('DB_USER', 'bench'), ('DB_PASSWORD', 'bench'), ('DB_HOST', 'localhost'),
+                       ('DB_PORT', '5432'), ('DB_NAME', 'bench'), ('LOG_QUEUE', 'False')):
+        env.setdefault(key, value)
+
+    timings = [measure(env) for _ in range(args.runs)]
+    modules = slowest_imports(env)
+
+    median = statistics.median(timings)
+    print(f"create_app cold start: median {median:.1f} ms, "
+          f"min {min(timings):.1f} ms, max {max(timings):.1f} ms over {args.runs} runs")
+    print("Slowest top-level imports (-X importtime):")
+    for name, ms in sorted(modules.items(), key=lambda item: item[1], reverse=True)[:args.top]:
+        print(f"  {ms:8.1f} ms  {name}")
+
+    if median > args.budget_ms:
+        print(f"FAIL: median {median:.1f} ms exceeds budget {args.budget_ms:.0f} ms")
+        return 1
+    print(f"OK: within budget {args.budget_ms:.0f} ms")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
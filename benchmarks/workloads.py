@@ -0,0 +1,122 @@
+"""
+Scripted workloads for the load test. Each workload is one user action:
+a function ``(client, dataset, rng)`` issuing a few requests.
+"""
+import json
+import random
+
+from apps.utils.seeder import (
+    BENCH_PASSWORD, DatasetSpec, dataset_id, skewed,
+    ACTIVE_USER_SKEW, COMMENT_TASK_SKEW, TASK_PROJECT_SKEW,
+)
+
+
+def hot_project(dataset: DatasetSpec, rng: random.Random) -> str:
+    return str(dataset_id('project', skewed(rng, dataset.projects, TASK_PROJECT_SKEW)))
+
+
+def hot_task(dataset: DatasetSpec, rng: random.Random) -> str:
+    return str(dataset_id('task', skewed(rng, dataset.tasks, COMMENT_TASK_SKEW)))
+
+
+def board_polling(client, dataset, rng):
+    """Open a project board and one of its cards."""
+    project_id = hot_project(dataset, rng)
+    client.request('GET', f'/api/projects/{project_id}', '/api/projects/<project_id>')
+    body = client.request('GET', f'/api/projects/{project_id}/board?limit=25',
+                          '/api/projects/<project_id>/board')
+    columns = ((body or {}).get('data') or {}).get('columns') or []
+    tasks = [task for column in columns for task in column['tasks']]
+    if tasks:
+        task_id = rng.choice(tasks)['id']
+        client.request('GET', f'/api/tasks/{task_id}', '/api/tasks/<task_id>')
+
+
+def comment_thread(client, dataset, rng):
+    """Read a task's comment thread and sometimes reply."""
+    task_id = hot_task(dataset, rng)
+    client.request('GET', f'/api/comments/task/{task_id}?page=1&limit=20',
+                   '/api/comments/task/<task_id>')
+    if rng.random() < 0.3:
+        body = client.request('POST', '/api/comments', '/api/comments', {
+            'content': f'bench reply {rng.random():.6f}',
+            'task_id': task_id,
+        })
+        comment_id = ((body or {}).get('data') or {}).get('id')
+        if comment_id:
+            client.request('GET', f'/api/comments/{comment_id}', '/api/comments/<comment_id>')
+
+
+def login_burst(client, dataset, rng):
+    """Several users logging in at once, e.g. at the start of a work day."""
+    for _ in range(5):
+        index = skewed(rng, dataset.users, ACTIVE_USER_SKEW)
+        client.request('POST', '/api/auth/login', '/api/auth/login', {
+            'username': f'bench_user_{index}',
+            'password': BENCH_PASSWORD,
+        }, authenticated=False)
+
+
+def bulk_writes(client, dataset, rng):
+    """Create a batch of tasks, edit them, then delete one."""
+    project_id = hot_project(dataset, rng)
+    created = []
+    for n in range(5):
+        body = client.request('POST', '/api/tasks', '/api/tasks', {
+            'title': f'bench task {n} {rng.random():.6f}',
+            'description': 'created by the load test',
+            'project_id': project_id,
+            'assignee_id': client.user_id,
+        })
+        task_id = ((body or {}).get('data') or {}).get('id')
+        if task_id:
+            created.append(task_id)
+    for task_id in created:
+        client.request('PUT', f'/api/tasks/{task_id}', '/api/tasks/<task_id>', {
+            'title': f'bench task edited {rng.random():.6f}',
+        })
+    if created:
+        client.request('DELETE', f'/api/tasks/{created[0]}', '/api/tasks/<task_id>')
+    if rng.random() < 0.1:
+        client.request('POST', '/api/projects', '/api/projects', {
+            'name': f'bench project {rng.random():.6f}',
+            'description': 'created by the load test',
+        })
+
+
+def personal_views(client, dataset, rng):
+    """The pages a user opens after logging in."""
+    client.request('GET', '/api/tasks/my-tasks', '/api/tasks/my-tasks')
+    client.request('GET', '/api/projects/my-projects', '/api/projects/my-projects')
+    client.request('GET', '/api/comments/my', '/api/comments/my')
+    client.request('GET', f'/api/auth/user/{client.user_id}', '/api/auth/user/<user_id>')
+    client.request('GET', '/api/projects?page=1&limit=20', '/api/projects')
+
+
+WORKLOADS = {
+    'board': board_polling,
+    'comments': comment_thread,
+    'login': login_burst,
+    'writes': bulk_writes,
+    'views': personal_views,
+}
+
+DEFAULT_MIX = 'board=40,comments=25,views=20,writes=10,login=5'
+
+
+def parse_mix(mix: str) -> dict:
+    weights = {}
+    for item in mix.split(','):
+        name, _, weight = item.partition('=')
+        name = name.strip()
+        if name not in WORKLOADS:
+            raise ValueError(f"Unknown workload {name!r}; choose from {', '.join(WORKLOADS)}")
+        weights[name] = float(weight or 1)
+    return weights
+
+
+def encode(payload) -> bytes:
+    return json.dumps(payload).encode()
+
+
+__all__ = ['WORKLOADS', 'DEFAULT_MIX', 'parse_mix', 'encode']
@@ -0,0 +1,51 @@
+"""
+Gunicorn settings for the Project Management API.
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+Every setting can be overridden from the environment (see .env.example).
+"""
+import multiprocessing
+import os
+
+bind = os.getenv('GUNICORN_BIND', '0.0.0.0:5000')
+workers = int(os.getenv('GUNICORN_WORKERS', multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.getenv('GUNICORN_THREADS', 4))
+worker_class = 'gthread'
+# Import the app once in the master so workers fork with modules loaded.
+preload_app = True
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 30))
+# On SIGTERM workers stop accepting and get this long to finish in-flight requests.
+graceful_timeout = int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT', 30))
+keepalive = int(os.getenv('GUNICORN_KEEPALIVE', 5))
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', 0))
+max_requests_jitter = int(os.getenv('GUNICORN_MAX_REQUESTS_JITTER', 0))
+accesslog = os.getenv('GUNICORN_ACCESSLOG', '-')
+
+
+def post_fork(server, worker):
+    from wsgi import app
+    from app import start_background_workers
+    from apps.utils.db import engine, warm_up
+
+    # Connections inherited from the master must never be used by two
+    # processes; close=False leaves the parent's sockets alone.
+    engine.dispose(close=False)
+    try:
+        warm_up(min(threads, engine.pool.size()))
+    except Exception as e:
+        server.log.warning("Worker %s warm-up failed: %s", worker.pid, e)
+
+    if os.getenv('BACKGROUND_WORKERS', 'True') == 'True':
+        start_background_workers(app)
+    server.log.info("Worker %s ready", worker.pid)
+
+
+def worker_exit(server, worker):
+    from app import stop_background_workers
+    from apps.utils.db import engine
+    from apps.utils.logger import shutdown_logging
+
+    stop_background_workers(timeout=graceful_timeout)
+    engine.dispose()
+    shutdown_logging()
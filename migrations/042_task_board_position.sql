@@ -0,0 +1,17 @@
+-- Board ordering for tasks (apps/models/task.py: Task.position).
+-- Fresh databases get this from `flask --app app init-db`; run this once on
+-- databases created before it, outside a transaction (psql -f).
+
+ALTER TABLE tasks ADD COLUMN IF NOT EXISTS position double precision NOT NULL DEFAULT 0;
+
+-- Existing cards keep their creation order within each column.
+UPDATE tasks AS t
+SET position = ranked.position
+FROM (
+    SELECT id, row_number() OVER (PARTITION BY project_id, status ORDER BY created_at, id) AS position
+    FROM tasks
+) AS ranked
+WHERE t.id = ranked.id;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_tasks_project_status_position
+    ON tasks (project_id, status, position);
@@ -0,0 +1,26 @@
+-- Delta sync (apps/services/sync_service.py): change_seq on synced tables
+-- and the tombstones table. Needs Postgres 13+ (pg_current_xact_id).
+-- Fresh databases get this from `flask --app app init-db`; run this once on
+-- databases created before it, outside a transaction (psql -f).
+
+-- Existing rows keep 0 and come back on a client's first sync (since=0).
+ALTER TABLE projects ADD COLUMN IF NOT EXISTS change_seq bigint NOT NULL DEFAULT 0;
+ALTER TABLE tasks ADD COLUMN IF NOT EXISTS change_seq bigint NOT NULL DEFAULT 0;
+ALTER TABLE comments ADD COLUMN IF NOT EXISTS change_seq bigint NOT NULL DEFAULT 0;
+
+CREATE TABLE IF NOT EXISTS tombstones (
+    id uuid PRIMARY KEY,
+    entity_type varchar(20) NOT NULL,
+    entity_id uuid NOT NULL,
+    project_id uuid NOT NULL,
+    user_id uuid,
+    change_seq bigint NOT NULL,
+    deleted_at timestamp without time zone NOT NULL
+);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_projects_change_seq ON projects (change_seq);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_tasks_project_change_seq ON tasks (project_id, change_seq);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_comments_change_seq ON comments (change_seq);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_tombstones_change_seq ON tombstones (change_seq);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_tombstones_project_change_seq ON tombstones (project_id, change_seq);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_tombstones_user_id ON tombstones (user_id);
@@ -0,0 +1,26 @@
+-- Soft delete for projects and DB-side cascades (apps/models/project.py,
+-- task.py, comment.py). Fresh databases get this from
+-- `flask --app app init-db`; run this once on databases created before it,
+-- outside a transaction (psql -f).
+
+ALTER TABLE projects ADD COLUMN IF NOT EXISTS deleted_at timestamp without time zone;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_projects_deleted_at
+    ON projects (deleted_at) WHERE deleted_at IS NOT NULL;
+
+-- Swap the foreign keys for ON DELETE CASCADE ones. NOT VALID skips the
+-- full-table check while holding the lock; VALIDATE then runs without
+-- blocking writes.
+ALTER TABLE tasks DROP CONSTRAINT IF EXISTS tasks_project_id_fkey,
+    ADD CONSTRAINT tasks_project_id_fkey FOREIGN KEY (project_id)
+        REFERENCES projects (id) ON DELETE CASCADE NOT VALID;
+ALTER TABLE tasks VALIDATE CONSTRAINT tasks_project_id_fkey;
+
+ALTER TABLE comments DROP CONSTRAINT IF EXISTS comments_task_id_fkey,
+    ADD CONSTRAINT comments_task_id_fkey FOREIGN KEY (task_id)
+        REFERENCES tasks (id) ON DELETE CASCADE NOT VALID;
+ALTER TABLE comments VALIDATE CONSTRAINT comments_task_id_fkey;
+
+-- The cascades look children up by parent id.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_comments_task_id ON comments (task_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_notifications_task_id ON notifications (task_id);
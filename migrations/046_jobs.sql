@@ -0,0 +1,32 @@
+-- Background job queue (apps/models/job.py, apps/services/job_service.py).
+-- Fresh databases get this from `flask --app app init-db`; run this once on
+-- databases created before it (psql -f).
+
+DO $$ BEGIN
+    CREATE TYPE jobstatus AS ENUM ('QUEUED', 'RUNNING', 'SUCCEEDED', 'FAILED');
+EXCEPTION WHEN duplicate_object THEN NULL;
+END $$;
+
+CREATE TABLE IF NOT EXISTS jobs (
+    id uuid PRIMARY KEY,
+    type varchar(100) NOT NULL,
+    payload json NOT NULL,
+    status jobstatus NOT NULL,
+    priority integer NOT NULL,
+    attempts integer NOT NULL,
+    max_attempts integer NOT NULL,
+    run_at timestamp without time zone NOT NULL,
+    locked_at timestamp without time zone,
+    locked_by varchar(100),
+    last_error text,
+    result json,
+    created_by uuid REFERENCES users (id) ON DELETE SET NULL,
+    created_at timestamp without time zone NOT NULL,
+    finished_at timestamp without time zone
+);
+
+CREATE INDEX IF NOT EXISTS ix_jobs_claim
+    ON jobs (priority, run_at) WHERE status IN ('QUEUED', 'RUNNING');
+
+-- Projects soft-deleted before this ran have no purge job yet:
+--   flask --app app jobs enqueue project.purge
@@ -0,0 +1,31 @@
+-- Project membership with roles (apps/models/project_member.py).
+-- Fresh databases get this from `flask --app app init-db`; run this once on
+-- databases created before it (psql -f).
+
+DO $$ BEGIN
+    CREATE TYPE projectrole AS ENUM ('OWNER', 'ADMIN', 'MEMBER', 'VIEWER');
+EXCEPTION WHEN duplicate_object THEN NULL;
+END $$;
+
+CREATE TABLE IF NOT EXISTS project_members (
+    project_id uuid NOT NULL REFERENCES projects (id) ON DELETE CASCADE,
+    user_id uuid NOT NULL REFERENCES users (id) ON DELETE CASCADE,
+    role projectrole NOT NULL,
+    created_at timestamp without time zone,
+    PRIMARY KEY (project_id, user_id)
+);
+
+CREATE INDEX IF NOT EXISTS ix_project_members_user_id ON project_members (user_id);
+
+-- Keep existing access: owners own their projects, and everyone assigned
+-- to or creating a task in a project becomes a member of it.
+INSERT INTO project_members (project_id, user_id, role, created_at)
+SELECT id, owner_id, 'OWNER'::projectrole, now() FROM projects
+ON CONFLICT DO NOTHING;
+
+INSERT INTO project_members (project_id, user_id, role, created_at)
+SELECT DISTINCT t.project_id, u.user_id, 'MEMBER'::projectrole, now()
+FROM tasks t
+CROSS JOIN LATERAL (VALUES (t.assignee_id), (t.creator_id)) AS u (user_id)
+WHERE u.user_id IS NOT NULL
+ON CONFLICT DO NOTHING;
@@ -0,0 +1,77 @@
+"""
+Atomic batches and the per-process permission index.
+
+Runs on a throwaway SQLite file through the app's own engine:
+
+    python -m pytest -q tests
+"""
+import os
+import tempfile
+import uuid
+
+_db_dir = tempfile.mkdtemp()
+# Set before apps.utils.db is imported; .env never overrides these.
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(_db_dir, 'test.db')}"
+os.environ['DB_HOST'] = ''
+os.environ.setdefault('LOG_QUEUE', 'False')
+
+import pytest
+
+from app import create_app
+from apps.utils.db import Base, engine
+from apps.utils.permissions import permission_index
+
+PASSWORD = 'Passw0rd!'
+
+
+@pytest.fixture
+def client():
+    Base.metadata.create_all(engine)
+    permission_index.invalidate()
+    app = create_app('apps.config.TestingConfig')
+    try:
+        yield app.test_client()
+    finally:
+        permission_index.invalidate()
+        Base.metadata.drop_all(engine)
+
+
+def login(client, username):
+    client.post('/api/auth/register', json={
+        'username': username,
+        'email': f'{username}@example.com',
+        'full_name': username,
+        'password': PASSWORD
+    })
+    data = client.post('/api/auth/login', json={
+        'username': username,
+        'password': PASSWORD
+    }).get_json()['data']
+    return {'Authorization': f"Bearer {data['token']}"}, data['user']['id']
+
+
+def test_rolled_back_batch_leaves_no_cached_membership(client):
+    alice, _ = login(client, 'alice')
+    bob, bob_id = login(client, 'bobby')
+    project_id = client.post('/api/projects', json={'name': 'Proj'}, headers=alice)\
+        .get_json()['data']['id']
+
+    response = client.post('/api/batch', headers=alice, json={
+        'atomic': True,
+        'requests': [
+            {'method': 'POST', 'path': f'/api/projects/{project_id}/members',
+             'body': {'user_id': bob_id}},
+            # Loads bob's permissions inside the uncommitted transaction.
+            {'method': 'POST', 'path': '/api/tasks',
+             'body': {'title': 'Task', 'project_id': project_id, 'assignee_id': bob_id}},
+            {'method': 'GET', 'path': f'/api/tasks/{uuid.uuid4()}'},
+        ]
+    })
+    data = response.get_json()['data']
+    assert [r['status'] for r in data['responses']] == [201, 201, 404]
+    assert data['committed'] is False
+
+    assert permission_index.mask(bob_id, project_id) == 0
+    response = client.post('/api/tasks', headers=bob,
+                           json={'title': 'Task', 'project_id': project_id})
+    assert response.status_code == 403
@@ -0,0 +1,11 @@
+"""
+WSGI entry point for production:
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+The app is built once in the gunicorn master (preload_app); background
+workers are started per worker process after fork, see gunicorn.conf.py.
+"""
+from app import create_app
+
+app = create_app({'START_BACKGROUND_WORKERS': False})